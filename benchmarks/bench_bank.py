@@ -0,0 +1,72 @@
+"""Cost of one minute of updates: per-symbol indicators versus indicator banks.
+
+Usage:
+    python benchmarks/bench_bank.py [--symbols N] [--minutes M]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from modular_trader.indicator.bank import RSIBank, SMABank, STOCHBank
+from modular_trader.indicator.technical import RSI, SMA, STOCH
+
+INDICATORS = {
+    "SMA": (lambda: SMA(14), lambda: SMABank(14)),
+    "RSI": (lambda: RSI(14), lambda: RSIBank(14)),
+    "STOCH": (lambda: STOCH(14, 3), lambda: STOCHBank(14, 3)),
+}
+
+
+def make_prices(symbols: int, minutes: int, seed: int = 0) -> tuple[np.ndarray, ...]:
+    """Random-walk high, low and close prices, one row per minute."""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal((minutes, symbols)).cumsum(axis=0)
+    high = close + rng.random((minutes, symbols))
+    low = close - rng.random((minutes, symbols))
+    return high, low, close
+
+
+def time_per_minute_objects(make_indicator, symbols, high, low, close) -> float:
+    """Mean seconds per minute updating one indicator object per symbol."""
+    indicators = [make_indicator() for _ in symbols]
+    start = time.perf_counter()
+    for h, lo, c in zip(high.tolist(), low.tolist(), close.tolist()):
+        for i, indicator in enumerate(indicators):
+            indicator.ingest_scalar(high=h[i], low=lo[i], close=c[i])
+    return (time.perf_counter() - start) / len(close)
+
+
+def time_per_minute_bank(make_bank, symbols, high, low, close) -> float:
+    """Mean seconds per minute updating all symbols of a bank at once."""
+    bank = make_bank()
+    bank.add(symbols)
+    start = time.perf_counter()
+    for h, lo, c in zip(high, low, close):
+        bank.update(symbols, high=h, low=lo, close=c)
+    return (time.perf_counter() - start) / len(close)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--minutes", type=int, default=200)
+    args = parser.parse_args()
+
+    symbols = [f"S{i}" for i in range(args.symbols)]
+    high, low, close = make_prices(args.symbols, args.minutes)
+    print(f"{'indicator':<10}{'objects':>12}{'bank':>12}{'speedup':>10}")
+    for name, (make_indicator, make_bank) in INDICATORS.items():
+        objects = time_per_minute_objects(make_indicator, symbols, high, low, close)
+        bank = time_per_minute_bank(make_bank, symbols, high, low, close)
+        print(
+            f"{name:<10}{objects * 1e3:>10.2f}ms{bank * 1e3:>10.2f}ms"
+            f"{objects / bank:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
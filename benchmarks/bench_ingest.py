@@ -0,0 +1,106 @@
+"""Per-tick cost of `BaseIndicator.ingest`, `ingest_scalar` and `ingest_ohlcv`.
+
+`ingest_ohlcv` is timed with the OHLCV object built once per bar and shared by
+a SMA, a RSI and a STOCH, as `AlpacaIndicatorHandler.update` does, against
+`ingest_scalar` on the same indicators. Both avoid the type dispatch and build
+one OHLCV per multi-input indicator at most, so they cost about the same; the
+best of `--repeats` runs is reported to keep the noise out of the ratio.
+
+Usage:
+    python benchmarks/bench_ingest.py [--ticks N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from talipp.ohlcv import OHLCV
+
+from modular_trader.indicator.technical import RSI, SMA, STOCH
+
+INDICATORS = {
+    "SMA": lambda: SMA(14),
+    "RSI": lambda: RSI(14),
+    "STOCH": lambda: STOCH(14, 3),
+}
+
+
+def make_bars(n: int, seed: int = 0) -> list[tuple]:
+    """Random-walk OHLCV bars with minute timestamps."""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    high = close + rng.random(n)
+    low = close - rng.random(n)
+    volume = rng.integers(100, 10_000, n).astype(float)
+    start = datetime(2024, 1, 2, 14, 30)
+    return [
+        (c, h, lo, c, v, start + timedelta(minutes=i))
+        for i, (c, h, lo, v) in enumerate(
+            zip(close.tolist(), high.tolist(), low.tolist(), volume.tolist())
+        )
+    ]
+
+
+def time_per_tick(make_indicator, method: str, bars: list[tuple]) -> float:
+    """Mean seconds per tick for the given ingest method."""
+    indicator = make_indicator()
+    ingest = getattr(indicator, method)
+    start = time.perf_counter()
+    for o, h, lo, c, v, t in bars:
+        ingest(open=o, high=h, low=lo, close=c, volume=v, timestamp=t)
+    return (time.perf_counter() - start) / len(bars)
+
+
+def time_per_bar_shared(bars: list[tuple], repeats: int) -> tuple[float, float]:
+    """Best mean seconds per bar for all indicators, without and with a shared
+    OHLCV."""
+    runs = [_time_per_bar_shared(bars) for _ in range(repeats)]
+    return min(x[0] for x in runs), min(x[1] for x in runs)
+
+
+def _time_per_bar_shared(bars: list[tuple]) -> tuple[float, float]:
+    """Mean seconds per bar for all indicators, without and with a shared OHLCV."""
+    scalar = [make_indicator() for make_indicator in INDICATORS.values()]
+    start = time.perf_counter()
+    for o, h, lo, c, v, t in bars:
+        for indicator in scalar:
+            indicator.ingest_scalar(o, h, lo, c, v, t)
+    scalar_time = (time.perf_counter() - start) / len(bars)
+
+    shared = [make_indicator() for make_indicator in INDICATORS.values()]
+    start = time.perf_counter()
+    for bar in bars:
+        ohlcv = OHLCV(*bar)
+        for indicator in shared:
+            indicator.ingest_ohlcv(ohlcv)
+    return scalar_time, (time.perf_counter() - start) / len(bars)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=20_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    bars = make_bars(args.ticks)
+    print(f"{'indicator':<10}{'ingest':>12}{'ingest_scalar':>16}{'speedup':>10}")
+    for name, make_indicator in INDICATORS.items():
+        dispatch = time_per_tick(make_indicator, "ingest", bars)
+        scalar = time_per_tick(make_indicator, "ingest_scalar", bars)
+        print(
+            f"{name:<10}{dispatch * 1e6:>10.2f}us{scalar * 1e6:>14.2f}us"
+            f"{dispatch / scalar:>9.1f}x"
+        )
+    scalar, shared = time_per_bar_shared(bars, args.repeats)
+    print(
+        f"all three per bar: ingest_scalar {scalar * 1e6:.2f}us, "
+        f"shared ingest_ohlcv {shared * 1e6:.2f}us ({scalar / shared:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
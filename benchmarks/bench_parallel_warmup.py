@@ -0,0 +1,101 @@
+"""Warmup time of a large universe versus the number of worker processes.
+
+Warms up the same indicators of every symbol with
+`AlpacaIndicatorHandler(warmup_workers=N)` and checks that the warm indicators
+are identical to those warmed up in a single process.
+
+Usage:
+    python benchmarks/bench_parallel_warmup.py [--symbols N] [--bars N]
+                                               [--workers 1 2 4 ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from check_batch import state
+
+from modular_trader.indicator.handler.alpaca import AlpacaIndicatorHandler
+from modular_trader.indicator.technical import ADX, ATR, BB, MACD, RSI, SMA, STOCH
+
+START = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def make_data(symbols: list[str], bars: int) -> pd.DataFrame:
+    """Random-walk minute bars of every symbol."""
+    rng = np.random.default_rng(0)
+    n = len(symbols) * bars
+    close = 100 + rng.standard_normal((len(symbols), bars)).cumsum(axis=1).ravel()
+    timestamps = pd.date_range(START, periods=bars, freq="min")
+    index = pd.MultiIndex.from_product(
+        [symbols, timestamps], names=["symbol", "timestamp"]
+    )
+    return pd.DataFrame(
+        {
+            "open": close + rng.standard_normal(n) * 0.1,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": rng.integers(100, 10_000, n).astype(float),
+        },
+        index=index,
+    )
+
+
+def make_handler(symbols: list[str], workers: int) -> AlpacaIndicatorHandler:
+    """A handler with a mix of indicators on every symbol."""
+    handler = AlpacaIndicatorHandler(
+        indicators=[
+            SMA(50),
+            RSI(14, cache_size=200),
+            STOCH(14, 3),
+            MACD(12, 26, 9),
+            BB(20),
+            ATR(14),
+            ADX(14, 14),
+        ],
+        warmup_workers=workers,
+    )
+    handler.init_indicator(SimpleNamespace(added=set(symbols), removed=set()))
+    return handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=2_000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()]
+    )
+    args = parser.parse_args()
+
+    symbols = [f"S{i}" for i in range(args.symbols)]
+    data = make_data(symbols, args.bars)
+    print(f"{len(symbols)} symbols x {args.bars} bars, {os.cpu_count()} CPUs")
+    print(f"{'workers':<10}{'warmup':>10}{'speedup':>10}{'identical':>12}")
+    reference = None
+    for workers in dict.fromkeys(args.workers):
+        handler = make_handler(symbols, workers)
+        start = time.perf_counter()
+        handler.warmup(data)
+        elapsed = time.perf_counter() - start
+        states = {
+            symbol: [state(x) for x in indicators.values()]
+            for symbol, indicators in handler.attached_indicators.items()
+        }
+        if reference is None:
+            reference = (elapsed, states)
+        print(
+            f"{workers:<10}{elapsed:>9.2f}s{reference[0] / elapsed:>9.1f}x"
+            f"{str(states == reference[1]):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
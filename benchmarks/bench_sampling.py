@@ -0,0 +1,84 @@
+"""Cost of sampled indicators on a year of minute bars.
+
+Compares `BaseIndicator.is_same_period` with cached period bounds against
+normalizing both timestamps with talipp's `Sampler` on every bar.
+
+Usage:
+    python benchmarks/bench_sampling.py [--days N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from talipp.input import SamplingPeriodType
+
+from modular_trader.indicator.technical import SMA
+
+PERIODS = {
+    "HOUR_1": SamplingPeriodType.HOUR_1,
+    "DAY_1": SamplingPeriodType.DAY_1,
+}
+
+
+def make_timestamps(days: int) -> list[datetime]:
+    """Minute timestamps of the regular US equity session, weekdays only."""
+    timestamps = []
+    day = datetime(2024, 1, 1, 14, 30, tzinfo=timezone.utc)
+    for _ in range(days):
+        if day.weekday() < 5:
+            timestamps.extend(day + timedelta(minutes=i) for i in range(390))
+        day += timedelta(days=1)
+    return timestamps
+
+
+def normalize_both(indicator, timestamp: datetime) -> bool:
+    """The previous implementation: normalize both timestamps on every bar."""
+    sampler = indicator.sampler
+    return sampler._normalize(indicator.previous_time) == sampler._normalize(timestamp)
+
+
+def time_checks(check, indicator, timestamps: list[datetime]) -> float:
+    """Seconds spent checking and advancing the period over all timestamps."""
+    start = time.perf_counter()
+    for timestamp in timestamps:
+        check(indicator, timestamp)
+        indicator.previous_time = timestamp
+    return time.perf_counter() - start
+
+
+def time_ingest(period: SamplingPeriodType, timestamps: list[datetime]) -> float:
+    """Seconds spent ingesting one bar per timestamp into a sampled SMA."""
+    indicator = SMA(14, sampling_period=period)
+    start = time.perf_counter()
+    for i, timestamp in enumerate(timestamps):
+        indicator.ingest_scalar(close=100.0 + i % 7, timestamp=timestamp)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    timestamps = make_timestamps(args.days)
+    print(f"{len(timestamps)} minute bars")
+    print(f"{'period':<10}{'normalize':>12}{'cached':>12}{'speedup':>10}{'ingest':>12}")
+    for name, period in PERIODS.items():
+        normalize = time_checks(
+            normalize_both, SMA(14, sampling_period=period), timestamps
+        )
+        cached = time_checks(
+            SMA.is_same_period, SMA(14, sampling_period=period), timestamps
+        )
+        ingest = time_ingest(period, timestamps)
+        print(
+            f"{name:<10}{normalize:>11.3f}s{cached:>11.3f}s"
+            f"{normalize / cached:>9.1f}x{ingest:>11.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
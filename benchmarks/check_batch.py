@@ -0,0 +1,143 @@
+"""Check that batch ingestion leaves every indicator in its streaming state.
+
+Each indicator is fed the same random bars twice: bar by bar, and as one
+batch computed by its vectorized kernel. The input, output and internal
+values (sub-indicators and managed sequences) must be identical, and must
+stay identical while more bars are streamed into both. Cache sizes down to
+the smallest allowed one are checked, since they change what talipp sees.
+
+Usage:
+    python benchmarks/check_batch.py [--bars N] [--seeds S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+import numpy as np
+from talipp.indicators.Indicator import Indicator
+from talipp.ohlcv import OHLCV
+
+from modular_trader.indicator.technical import (
+    ADX,
+    ATR,
+    BB,
+    EMA,
+    MACD,
+    OBV,
+    RSI,
+    SMA,
+    STOCH,
+)
+
+INDICATORS = {
+    "SMA": (lambda cache_size=None: SMA(14, cache_size=cache_size), [14, 15, 40]),
+    "EMA": (lambda cache_size=None: EMA(14, cache_size=cache_size), [14, 15, 40]),
+    "RSI": (lambda cache_size=None: RSI(14, cache_size=cache_size), [14, 15, 40]),
+    "STOCH": (
+        lambda cache_size=None: STOCH(14, 3, cache_size=cache_size),
+        [14, 16, 40],
+    ),
+    "MACD": (
+        lambda cache_size=None: MACD(12, 26, 9, cache_size=cache_size),
+        [26, 30, 34, 60],
+    ),
+    "BB": (lambda cache_size=None: BB(20, 2.0, cache_size=cache_size), [20, 21, 50]),
+    "ATR": (lambda cache_size=None: ATR(14, cache_size=cache_size), [14, 15, 40]),
+    "ADX": (
+        lambda cache_size=None: ADX(14, 14, cache_size=cache_size),
+        [27, 28, 29, 60],
+    ),
+    "OBV": (lambda cache_size=None: OBV(cache_size=cache_size), [1, 2, 10]),
+}
+
+
+def make_bars(n: int, seed: int) -> dict[str, np.ndarray]:
+    """Random-walk bars with flat stretches, so that ties and zero ranges occur."""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    flat = rng.random(n) < 0.1
+    close[flat] = np.roll(close, 1)[flat]
+    spread = np.where(flat, 0.0, rng.random(n))
+    return {
+        "open": close + rng.standard_normal(n) * 0.1,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.integers(1, 1000, n).astype(float),
+    }
+
+
+def state(indicator: Indicator) -> dict:
+    """Every value held by an indicator, its sub-indicators and sequences."""
+    return {
+        "input_values": list(indicator.input_values),
+        "output_values": list(indicator.output_values),
+        "sub_indicators": [state(x) for x in indicator.sub_indicators],
+        "managed_sequences": [
+            state(x) if isinstance(x, Indicator) else list(x)
+            for x in indicator.managed_sequences
+        ],
+    }
+
+
+def stream(indicator, bars: dict[str, np.ndarray], start: int, stop: int) -> None:
+    """Ingest the bars in [start, stop) one at a time."""
+    for i in range(start, stop):
+        indicator.ingest_ohlcv(
+            OHLCV(
+                bars["open"][i].item(),
+                bars["high"][i].item(),
+                bars["low"][i].item(),
+                bars["close"][i].item(),
+                bars["volume"][i].item(),
+            )
+        )
+
+
+def check(make_indicator, cache_size, bars, n: int) -> str | None:
+    """Compare batch and streaming ingestion of the first n bars, then the rest."""
+    streamed = make_indicator(cache_size)
+    batched = make_indicator(cache_size)
+    stream(streamed, bars, 0, n)
+    batched.ingest_batch(**{k: v[:n] for k, v in bars.items()})
+    if state(batched) != state(streamed):
+        return f"batch of {n} bars"
+    total = len(bars["close"])
+    stream(streamed, bars, n, total)
+    stream(batched, bars, n, total)
+    if state(batched) != state(streamed):
+        return f"bars streamed after a batch of {n} bars"
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=200)
+    parser.add_argument("--seeds", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = 0
+    for name, (make_indicator, cache_sizes) in INDICATORS.items():
+        checked = 0
+        for seed in range(args.seeds):
+            bars = make_bars(args.bars, seed)
+            for cache_size in [None, *cache_sizes]:
+                # short, partially warm and long batches
+                for n in (0, 1, 5, 30, args.bars // 2, args.bars - 10):
+                    error = check(make_indicator, cache_size, bars, n)
+                    checked += 1
+                    if error:
+                        failures += 1
+                        print(f"{name} cache_size={cache_size} seed={seed}: {error}")
+        print(f"{name:<8}{checked} cases")
+
+    if failures:
+        print(f"{failures} mismatches")
+        sys.exit(1)
+    print("batch and streaming states are identical")
+
+
+if __name__ == "__main__":
+    main()
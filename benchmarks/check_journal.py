@@ -0,0 +1,97 @@
+"""Check that a record journal rebuilds every saved state from its checkpoints.
+
+Random updates, of plain sections and of the entries of a mapping section, are
+saved through a recorder journal with frequent checkpoints. Every line must be
+read as the kind it was written as, the state at the time of each save must
+equal the record as it was saved, a save changing one entry of the mapping
+must write that entry only, and `state_at` must start from the last
+checkpoint: the lines before it are made unparsable, and the latest state must
+still be rebuilt.
+
+Usage:
+    python benchmarks/check_journal.py [--saves N] [--interval K] [--symbols S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from modular_trader.common.enums import RecordFormat
+from modular_trader.journal import _KIND
+from modular_trader.record import Recorder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--saves", type=int, default=200)
+    parser.add_argument("--interval", type=int, default=10)
+    parser.add_argument("--symbols", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "record.jsonl")
+        recorder = Recorder(
+            save_path=path,
+            save_format=RecordFormat.JOURNAL,
+            journal_checkpoint_interval=args.interval,
+        )
+        journal = recorder.journal
+        record: dict[str, object] = {}
+        symbols = {f"S{i}": 0 for i in range(args.symbols)}
+        saved = []
+        for i in range(args.saves):
+            for _ in range(rng.randint(1, 3)):
+                key = f"key{rng.randrange(20)}"
+                recorder[key] = record[key] = i
+            symbol = f"S{rng.randrange(args.symbols + 2)}"
+            if symbol in symbols and rng.random() < 0.1:
+                del symbols[symbol]
+            else:
+                symbols[symbol] = i
+            recorder["symbols"] = record["symbols"] = dict(symbols)
+            recorder.flush()
+            saved.append(json.loads(json.dumps(record)))
+            # distinct fixed-width times
+            time.sleep(1e-5)
+
+        for entry in journal.entries():
+            written = len(entry.patches.get("symbols", {})) + len(
+                entry.removed.get("symbols", [])
+            )
+            if not entry.full and ("symbols" in entry.sections or written > 1):
+                failures.append(f"save at {entry.time.isoformat()}: all symbols")
+        with open(path) as f:
+            lines = f.readlines()
+        for i, line in enumerate(lines):
+            if (line[_KIND] == "full") != ("full" in json.loads(line)):
+                failures.append(f"line {i}: kind read as {line[_KIND]!r}")
+        for entry, expected in zip(journal.entries(), saved):
+            if journal.state_at(entry.time) != expected:
+                failures.append(f"state at {entry.time.isoformat()}")
+
+        last = max(i for i, x in enumerate(lines) if "full" in json.loads(x))
+        with open(path, "w") as f:
+            f.writelines(["{\n"] * last + lines[last:])
+        try:
+            if journal.state_at() != saved[-1]:
+                failures.append("latest state after the last checkpoint")
+        except json.JSONDecodeError:
+            failures.append("state_at parsed lines before the last checkpoint")
+
+    for failure in failures:
+        print(failure)
+    if failures:
+        sys.exit(1)
+    print(f"{args.saves} saves rebuilt from {len(lines)} lines")
+
+
+if __name__ == "__main__":
+    main()
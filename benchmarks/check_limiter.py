@@ -0,0 +1,163 @@
+"""Check the rate limiter on a client with a fake `_one_request`.
+
+The requests of a fake REST client, which makes them through `_one_request`
+like the alpaca-py clients, are routed through a `RateLimiter`. Under
+contention, the queued orders must be served before the queued history
+downloads; a 429 must empty the bucket, so the retry waits for a new token; a
+POST must not be retried on a 5xx, while a GET is. The clients of the
+installed alpaca-py must be accepted by `RateLimiter.limit`, and a client that
+does not make its requests through `_one_request` must be rejected.
+
+Usage:
+    python benchmarks/check_limiter.py
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+from alpaca.common.exceptions import APIError
+from alpaca.data.historical import StockHistoricalDataClient
+from alpaca.trading.client import TradingClient
+
+from modular_trader.engine.limiter import RateLimiter
+
+TRADING_URL = "https://paper-api.alpaca.markets/v2"
+DATA_URL = "https://data.alpaca.markets/v2"
+
+
+class FakeClient:
+    """REST client answering with the given statuses, recording the requests."""
+
+    def __init__(self, statuses: list[int] | None = None, log: list | None = None):
+        self.statuses = list(statuses or [])
+        self.requests: list[tuple[str, str, int]] = []
+        # shared by clients, in the order the requests are served
+        self.log = log if log is not None else []
+        self._lock = threading.Lock()
+
+    def _request(self, method: str, url: str) -> str:
+        return self._one_request(method, url, {}, 3)
+
+    def _one_request(self, method: str, url: str, opts: dict, retry: int) -> str:
+        with self._lock:
+            self.requests.append((method, url, retry))
+            self.log.append(url)
+            status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            raise APIError(
+                str(status),
+                SimpleNamespace(response=SimpleNamespace(status_code=status)),
+            )
+        return url
+
+
+def check_priority(failures: list[str]) -> None:
+    limiter = RateLimiter(rate=20, burst=1)
+    served: list[str] = []
+    orders, history = FakeClient(log=served), FakeClient(log=served)
+    limiter.limit(orders)
+    limiter.limit(history, data=True)
+    downloads = [
+        threading.Thread(target=history._request, args=("GET", f"{DATA_URL}/bars"))
+        for _ in range(6)
+    ]
+    for thread in downloads:
+        thread.start()
+    while limiter.queue_depth["DATA"] < 5:
+        time.sleep(0.001)
+    submissions = [
+        threading.Thread(target=orders._request, args=("POST", f"{TRADING_URL}/orders"))
+        for _ in range(2)
+    ]
+    for thread in submissions:
+        thread.start()
+    while limiter.queue_depth["ORDER"] + len(orders.requests) < 2:
+        time.sleep(0.001)
+    queued = limiter.queue_depth["DATA"]
+    for thread in downloads + submissions:
+        thread.join()
+    # the downloads still queued when the orders arrived are served last
+    if queued < 1 or served[len(served) - queued :] != [f"{DATA_URL}/bars"] * queued:
+        failures.append(f"priority: served {served}")
+
+
+def check_429(failures: list[str]) -> None:
+    limiter = RateLimiter(rate=5, burst=5, base_delay=0.001)
+    client = FakeClient([429])
+    limiter.limit(client)
+    start = time.monotonic()
+    client._request("GET", f"{TRADING_URL}/positions")
+    elapsed = time.monotonic() - start
+    metrics = limiter.metrics()
+    if len(client.requests) != 2 or metrics["retries"] != 1:
+        failures.append(f"429: {len(client.requests)} attempts")
+    # the retry waits for a token although 4 were left before the 429
+    if metrics["throttled"] != 1 or elapsed < 0.15:
+        failures.append(f"429: bucket not emptied, retried after {elapsed:.3f}s")
+    if any(retry != 0 for _, _, retry in client.requests):
+        failures.append("429: the retries of the client are not disabled")
+
+
+def check_5xx(failures: list[str]) -> None:
+    limiter = RateLimiter(base_delay=0.001)
+    client = FakeClient([503])
+    limiter.limit(client)
+    try:
+        client._request("POST", f"{TRADING_URL}/orders")
+        failures.append("5xx: POST succeeded")
+    except APIError:
+        pass
+    if len(client.requests) != 1:
+        failures.append(f"5xx: POST sent {len(client.requests)} times")
+
+    client = FakeClient([503])
+    limiter.limit(client)
+    client._request("GET", f"{TRADING_URL}/orders")
+    if len(client.requests) != 2:
+        failures.append(f"5xx: GET sent {len(client.requests)} times")
+
+
+def check_clients(failures: list[str]) -> None:
+    limiter = RateLimiter()
+    for client in (
+        TradingClient("key", "secret", paper=True),
+        StockHistoricalDataClient("key", "secret"),
+    ):
+        try:
+            limiter.limit(client)
+        except TypeError as e:
+            failures.append(f"clients: {e}")
+
+    class Bypassing(FakeClient):
+        def _request(self, method: str, url: str) -> str:
+            return url
+
+    class Renamed(FakeClient):
+        def _one_request(self, method: str, url: str, options: dict) -> str:
+            return url
+
+    for client in (Bypassing(), Renamed()):
+        try:
+            limiter.limit(client)
+            failures.append(f"clients: {type(client).__name__} accepted")
+        except TypeError:
+            pass
+
+
+def main() -> None:
+    failures: list[str] = []
+    for check in (check_priority, check_429, check_5xx, check_clients):
+        check(failures)
+    for failure in failures:
+        print(failure)
+    if failures:
+        sys.exit(1)
+    print("priority, 429, 5xx and client checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""Indicator micro-benchmark suite with regression tracking.
+
+Measures, for the indicators of `indicator.technical`:
+
+- ingest: per-tick latency of `ingest_ohlcv` on a warm indicator
+- warmup: `ingest_batch` throughput versus history length
+- update: `AlpacaIndicatorHandler.update` cost per bar versus universe size
+- memory: bytes held per attached, warm indicator, and their growth per bar
+  streamed, measured at two history lengths
+
+The results are written as JSON. Given a baseline from a previous run, every
+metric that is worse than the baseline by more than the threshold is reported
+as a regression and the exit status is 1. An indicator whose memory grows with
+the bars ingested, instead of being bounded by its cache size, is reported as
+unbounded, with the same exit status.
+
+Usage:
+    python benchmarks/suite.py [--output FILE] [--baseline FILE]
+                               [--threshold RATIO] [--quick]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import talipp
+from talipp.ohlcv import OHLCV
+
+from modular_trader.indicator.handler.alpaca import AlpacaIndicatorHandler
+from modular_trader.indicator.technical import (
+    ADX,
+    ATR,
+    BB,
+    EMA,
+    MACD,
+    OBV,
+    RSI,
+    SMA,
+    STOCH,
+)
+
+INDICATORS = {
+    "SMA": lambda: SMA(14),
+    "EMA": lambda: EMA(14),
+    "RSI": lambda: RSI(14),
+    "STOCH": lambda: STOCH(14, 3),
+    "MACD": lambda: MACD(12, 26, 9),
+    "BB": lambda: BB(20, 2.0),
+    "ATR": lambda: ATR(14),
+    "ADX": lambda: ADX(14, 14),
+    "OBV": lambda: OBV(),
+}
+# the indicators attached to every symbol by the handler benchmark
+HANDLER_INDICATORS = ["SMA", "RSI", "STOCH", "MACD", "BB", "ATR"]
+COLUMNS = ["open", "high", "low", "close", "volume"]
+START = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+# bytes per bar above which the memory of an indicator is taken as unbounded
+GROWTH_TOLERANCE = 1.0
+
+FULL = {
+    "ticks": 20_000,
+    "lengths": [100, 1_000, 10_000, 100_000],
+    "universes": [10, 100, 500],
+    "minutes": 50,
+    "memory_symbols": 50,
+    "memory_lengths": [200, 1_200],
+    "repeat": 5,
+}
+QUICK = {
+    "ticks": 2_000,
+    "lengths": [100, 1_000, 10_000],
+    "universes": [10, 100],
+    "minutes": 10,
+    "memory_symbols": 20,
+    "memory_lengths": [100, 600],
+    "repeat": 3,
+}
+
+
+def make_columns(n: int, seed: int = 0) -> dict[str, np.ndarray]:
+    """Random-walk OHLCV columns."""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    return {
+        "open": close + rng.standard_normal(n) * 0.1,
+        "high": close + rng.random(n),
+        "low": close - rng.random(n),
+        "close": close,
+        "volume": rng.integers(100, 10_000, n).astype(float),
+    }
+
+
+def best_of(repeat: int, func) -> float:
+    """Smallest wall time of repeated calls, the least disturbed by noise."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def metric(value: float, unit: str, better: str = "lower") -> dict:
+    return {"value": value, "unit": unit, "better": better}
+
+
+def bench_ingest(config: dict) -> dict[str, dict]:
+    """Per-tick latency of `ingest_ohlcv` on a warm indicator."""
+    columns = make_columns(config["ticks"] + 500)
+    bars = [OHLCV(*row) for row in zip(*(columns[c].tolist() for c in COLUMNS))]
+    warm, ticks = bars[:500], bars[500:]
+    results = {}
+    for name, make_indicator in INDICATORS.items():
+
+        def run():
+            indicator = make_indicator()
+            for bar in warm:
+                indicator.ingest_ohlcv(bar)
+            start = time.perf_counter()
+            for bar in ticks:
+                indicator.ingest_ohlcv(bar)
+            return time.perf_counter() - start
+
+        elapsed = min(run() for _ in range(config["repeat"]))
+        results[f"ingest.{name}"] = metric(elapsed / len(ticks), "s/tick")
+    return results
+
+
+def bench_warmup(config: dict) -> dict[str, dict]:
+    """Throughput of `ingest_batch` versus history length."""
+    columns = make_columns(max(config["lengths"]))
+    results = {}
+    for name, make_indicator in INDICATORS.items():
+        for length in config["lengths"]:
+            batch = {k: v[:length] for k, v in columns.items()}
+            elapsed = best_of(
+                config["repeat"], lambda: make_indicator().ingest_batch(**batch)
+            )
+            results[f"warmup.{name}.{length}"] = metric(
+                length / elapsed, "bars/s", better="higher"
+            )
+    return results
+
+
+def make_handler(symbols: list[str], history: int) -> AlpacaIndicatorHandler:
+    """A warm handler with the handler benchmark indicators on every symbol."""
+    handler = AlpacaIndicatorHandler(
+        indicators=[INDICATORS[name]() for name in HANDLER_INDICATORS]
+    )
+    handler.init_indicator(SimpleNamespace(added=set(symbols), removed=set()))
+    frames = []
+    for i, symbol in enumerate(symbols):
+        frame = pd.DataFrame(make_columns(history, seed=i))
+        frame["symbol"] = symbol
+        frame["timestamp"] = [START + timedelta(minutes=m) for m in range(history)]
+        frames.append(frame)
+    handler.warmup(pd.concat(frames).set_index(["symbol", "timestamp"]))
+    return handler
+
+
+def bench_update(config: dict) -> dict[str, dict]:
+    """Cost of `AlpacaIndicatorHandler.update` per bar versus universe size."""
+    history = 200
+    results = {}
+    for universe in config["universes"]:
+        symbols = [f"S{i}" for i in range(universe)]
+        columns = make_columns(config["minutes"] * universe, seed=1)
+        rows = zip(*(columns[c].tolist() for c in COLUMNS))
+        bars = [
+            SimpleNamespace(
+                symbol=symbols[i % universe],
+                open=o,
+                high=h,
+                low=lo,
+                close=c,
+                volume=v,
+                timestamp=START + timedelta(minutes=history + i // universe),
+            )
+            for i, (o, h, lo, c, v) in enumerate(rows)
+        ]
+
+        def run():
+            handler = make_handler(symbols, history)
+            start = time.perf_counter()
+            for bar in bars:
+                handler.update(bar)
+            return time.perf_counter() - start
+
+        elapsed = min(run() for _ in range(config["repeat"]))
+        results[f"update.{universe}"] = metric(elapsed / len(bars), "s/bar")
+        results[f"update.{universe}.minute"] = metric(
+            elapsed / config["minutes"], "s/minute"
+        )
+    return results
+
+
+def bench_memory(config: dict) -> dict[str, dict]:
+    """Bytes held per warm indicator, cache included, and their growth per bar.
+
+    The indicators are warmed with a batch and then stream bars, up to two
+    history lengths. Once warm, the cache of an indicator is full, so its
+    memory must not grow with the bars streamed.
+    """
+    n = config["memory_symbols"]
+    short, long = config["memory_lengths"]
+    batch = make_columns(500)
+    columns = make_columns(long, seed=1)
+    bars = [OHLCV(*row) for row in zip(*(columns[c].tolist() for c in COLUMNS))]
+
+    def footprint(make_indicator, length: int) -> float:
+        prototype = make_indicator()
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        indicators = [prototype.spawn() for _ in range(n)]
+        for indicator in indicators:
+            indicator.ingest_batch(**batch)
+            for bar in bars[:length]:
+                indicator.ingest_ohlcv(bar)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del indicators
+        return (after - before) / n
+
+    results = {}
+    for name, make_indicator in INDICATORS.items():
+        small = footprint(make_indicator, short)
+        large = footprint(make_indicator, long)
+        results[f"memory.{name}"] = metric(large, "B")
+        results[f"memory_growth.{name}"] = metric(
+            max(0.0, (large - small) / (long - short)), "B/bar"
+        )
+    return results
+
+
+def unbounded(results: dict) -> list[str]:
+    """
+    Find the indicators whose memory grows with the bars ingested.
+
+    Args:
+        results (dict): The results of a run.
+
+    Returns:
+        list[str]: A description of each unbounded indicator.
+    """
+    return [
+        f"{key.removeprefix('memory_growth.')}: {result['value']:.4g} {result['unit']}"
+        for key, result in results.items()
+        if key.startswith("memory_growth.") and result["value"] > GROWTH_TOLERANCE
+    ]
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Find the metrics that are worse than the baseline by more than the threshold.
+
+    Args:
+        results (dict): The results of this run.
+        baseline (dict): The results of a previous run.
+        threshold (float): The tolerated relative change, e.g. 0.2 for 20%.
+
+    Returns:
+        list[str]: A description of each regression.
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None or not previous["value"]:
+            continue
+        change = current["value"] / previous["value"] - 1
+        if current["better"] == "higher":
+            change = -change
+        if change > threshold:
+            regressions.append(
+                f"{key}: {previous['value']:.4g} -> {current['value']:.4g} "
+                f"{current['unit']} ({change:+.0%} worse)"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--quick", action="store_true")
+    args = parser.parse_args()
+
+    config = QUICK if args.quick else FULL
+    results = {}
+    for bench in (bench_ingest, bench_warmup, bench_update, bench_memory):
+        results.update(bench(config))
+    for key, result in results.items():
+        print(f"{key:<28}{result['value']:>14.4g} {result['unit']}")
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "talipp": getattr(talipp, "__version__", None),
+            "config": config,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    failed = False
+    for indicator in unbounded(results):
+        print(f"UNBOUNDED memory of {indicator}")
+        failed = True
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            failed = True
+        else:
+            print(f"No regression above {args.threshold:.0%}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
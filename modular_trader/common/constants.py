@@ -7,7 +7,13 @@ DEFAULT_DIR_PATH: os.PathLike = HOME.joinpath(DEFAULT_DIR_NAME)
 DEFAULT_CONFIG_FILE: str = "config.json"
 DEFAULT_LOG_FILE: str = "trader.log"
 DEFAULT_RECORD_FILE: str = "record.json"
+DEFAULT_RECORD_JOURNAL_FILE: str = "record.jsonl"
+DEFAULT_SNAPSHOT_FILE: str = "indicators.snapshot"
 DEFAULT_FILE_ROTATION_SIZE_MB: int = 100
 DEFAULT_CONFIG_PATH: os.PathLike = DEFAULT_DIR_PATH.joinpath(DEFAULT_CONFIG_FILE)
 DEFAULT_LOG_PATH: os.PathLike = DEFAULT_DIR_PATH.joinpath(DEFAULT_LOG_FILE)
 DEFAULT_RECORD_PATH: os.PathLike = DEFAULT_DIR_PATH.joinpath(DEFAULT_RECORD_FILE)
+DEFAULT_RECORD_JOURNAL_PATH: os.PathLike = DEFAULT_DIR_PATH.joinpath(
+    DEFAULT_RECORD_JOURNAL_FILE
+)
+DEFAULT_SNAPSHOT_PATH: os.PathLike = DEFAULT_DIR_PATH.joinpath(DEFAULT_SNAPSHOT_FILE)
@@ -55,3 +55,33 @@ class AssetClass(CaseInsensitiveEnum):
     STOCK = enum.auto()
     CRYPTO = enum.auto()
     OPTION = enum.auto()
+
+
+class LateBarPolicy(CaseInsensitiveEnum):
+    """
+    What to do with a bar that arrives after the bars of its timestamp were
+    released by a `BarBarrier`.
+
+    Attributes:
+        DROP: The bar is ignored.
+        INDICATOR: The bar only updates the indicators.
+        RERUN: The bar updates the indicators and the pipeline runs again with
+            the late bars only.
+    """
+
+    DROP = enum.auto()
+    INDICATOR = enum.auto()
+    RERUN = enum.auto()
+
+
+class RecordFormat(CaseInsensitiveEnum):
+    """
+    The file format of a `Recorder`.
+
+    Attributes:
+        JSON: One JSON document of the latest record, rewritten on each save.
+        JOURNAL: An append-only JSON Lines journal of the changes of each save.
+    """
+
+    JSON = enum.auto()
+    JOURNAL = enum.auto()
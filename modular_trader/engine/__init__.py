@@ -1,4 +1,5 @@
 from .alpaca import AlpacaEngine
 from .base import BaseEngine
+from .limiter import RateLimiter, RequestPriority
 
-__all__ = ["BaseEngine", "AlpacaEngine"]
+__all__ = ["BaseEngine", "AlpacaEngine", "RateLimiter", "RequestPriority"]
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import gc
 import os
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from alpaca.common.exceptions import APIError
@@ -48,6 +49,8 @@ from modular_trader.common.enums import TradingMode
 from modular_trader.logging import BaseLogger, TradingLogger
 
 from .base import BaseEngine
+from .limiter import RateLimiter
+from .state import AccountState
 
 if TYPE_CHECKING:
     from datetime import datetime
@@ -92,6 +95,10 @@ class AlpacaEngine(BaseEngine, BaseModel):
     asset_class: AssetClass = Field(default=AssetClass.US_EQUITY)
     feed: DataFeed | CryptoFeed | OptionsFeed | None = Field(default=None)
     logger: BaseLogger = Field(default_factory=TradingLogger)
+    local_state: bool = Field(default=True)
+    reconcile_interval: float | None = Field(default=60.0)
+    max_workers: int = Field(default=4)
+    rate_limiter: RateLimiter | None = Field(default_factory=RateLimiter)
     # api_key: SecretStr = Field(default_factory=get_api_key)
     # secret_key: SecretStr = Field(default_factory=get_secret_key)
     # _trading_client: TradingClient = PrivateAttr(default_factory=lambda: None)
@@ -107,6 +114,19 @@ class AlpacaEngine(BaseEngine, BaseModel):
 
     # is_paper: bool = property(fget=lambda self: self.mode == TradingMode.PAPER)
 
+    @property
+    def state(self) -> AccountState:
+        """
+        The local copy of the active orders, positions and cash, seeded from
+        REST on first use and kept current from the trade updates.
+
+        Returns:
+            AccountState: The account state.
+        """
+        if not self._state.is_seeded:
+            self.reconcile_state()
+        return self._state
+
     @property
     def is_paper(self) -> bool:
         """
@@ -142,10 +162,21 @@ class AlpacaEngine(BaseEngine, BaseModel):
         It sets up the Alpaca trading and data clients and streams using the
         API key and secret key stored in the environment variables.
         """
+        self._state = AccountState()
+        self._trade_update_handler = None
+        # bounded, so a burst of REST calls queues instead of opening
+        # a connection each
+        self._executor = ThreadPoolExecutor(
+            self.max_workers, thread_name_prefix="alpaca-rest"
+        )
         _api_key = get_api_key()
         _secret_key = get_secret_key()
         self._init_trading(_api_key, _secret_key)
         self._init_data(_api_key, _secret_key)
+        if self.rate_limiter is not None:
+            # one budget for the trading and data requests
+            self.rate_limiter.limit(self._trading_client)
+            self.rate_limiter.limit(self._data_client, data=True)
         self._init_assets()
 
     # def __post_init__(self):
@@ -174,6 +205,7 @@ class AlpacaEngine(BaseEngine, BaseModel):
         """
         self.logger.debug(f"{self.__class__.__name__} | Destructor Called")
         asyncio.run(self._close_websocket)
+        self._executor.shutdown(wait=False)
         del (
             self._data_client,
             self._data_stream,
@@ -203,6 +235,8 @@ class AlpacaEngine(BaseEngine, BaseModel):
         self._trading_stream = TradingStream(
             api_key=_api_key, secret_key=_secret_key, paper=self.is_paper
         )
+        if self.local_state:
+            self._trading_stream.subscribe_trade_updates(self._handle_trade_update)
 
     def _init_assets(self) -> dict[str, Asset]:
         """Initialize the assets dictionary.
@@ -475,33 +509,42 @@ class AlpacaEngine(BaseEngine, BaseModel):
     @override
     def get_cash(self) -> float:
         """
-        Gets the current cash balance in the Alpaca account.
+        Gets the current cash balance in the Alpaca account, from the local
+        state if `local_state` is True.
 
         Returns:
             float: The current cash balance.
         """
+        if self.local_state:
+            return self.state.cash
         account = self.get_account()
         return float(account.cash)
 
     @override
     def get_equity(self) -> float:
         """
-        Gets the current equity in the Alpaca account.
+        Gets the current equity in the Alpaca account, from the local state if
+        `local_state` is True.
 
         Returns:
             float: The current equity.
         """
+        if self.local_state:
+            return self.state.equity
         account = self.get_account()
         return float(account.equity)
 
     @override
     def get_positions(self) -> list[Position]:
         """
-        Gets all positions held by the Alpaca account.
+        Gets all positions held by the Alpaca account, from the local state if
+        `local_state` is True.
 
         Returns:
             list[Position]: The list of positions.
         """
+        if self.local_state:
+            return self.state.get_positions()
         return self._trading_client.get_all_positions()
 
     def get_positions_serialize(self) -> list[dict[str, Any]]:
@@ -524,6 +567,8 @@ class AlpacaEngine(BaseEngine, BaseModel):
         Returns:
             Position | None: The open position if it exists, otherwise None.
         """
+        if self.local_state:
+            return self.state.get_position(symbol)
         try:
             return self._trading_client.get_open_position(symbol)
         except APIError:  # no position for the symbol
@@ -571,6 +616,7 @@ class AlpacaEngine(BaseEngine, BaseModel):
         try:
             order_response = self._trading_client.submit_order(order_request)
             if order_response:
+                self._add_order(order_response)
                 self.logger.info(
                     f"{order_response.status} | {order_response.side.upper()} {order_response.symbol} x {order_response.qty}"
                 )
@@ -578,6 +624,11 @@ class AlpacaEngine(BaseEngine, BaseModel):
         except Exception as e:
             self.logger.error(f"{symbol} | Error sending order: {e}")
 
+    def _add_order(self, order: Order) -> None:
+        """Add a submitted order to the local state before its trade update."""
+        if self.local_state and self._state.is_seeded:
+            self._state.add_order(order)
+
     @override
     def order_value(
         self,
@@ -618,6 +669,7 @@ class AlpacaEngine(BaseEngine, BaseModel):
             )
             try:
                 order_response = self._trading_client.submit_order(order_request)
+                self._add_order(order_response)
                 self.logger.info(
                     f"{order_response.status} | {order_response.side.upper()} {order_response.symbol} x ${order_response.notional}"
                 )
@@ -760,13 +812,99 @@ class AlpacaEngine(BaseEngine, BaseModel):
     @override
     def get_orders(self) -> list[Order]:
         """
-        Get all active orders.
+        Get all active orders, from the local state if `local_state` is True.
 
         Returns:
             list[Order]: A list of Order objects for all active orders.
         """
+        if self.local_state:
+            return self.state.get_orders()
         return self._trading_client.get_orders()
 
+    @override
+    def get_executor(self) -> Executor:
+        """
+        Get the thread pool running the blocking REST calls of the `_async`
+        methods, with at most `max_workers` threads.
+
+        Returns:
+            Executor: The thread pool.
+        """
+        return self._executor
+
+    @override
+    async def get_positions_async(self) -> list[Position]:
+        if self.local_state and self._state.is_seeded:
+            return self.get_positions()
+        return await super().get_positions_async()
+
+    @override
+    async def get_cash_async(self) -> float:
+        if self.local_state and self._state.is_seeded:
+            return self.get_cash()
+        return await super().get_cash_async()
+
+    @override
+    async def get_equity_async(self) -> float:
+        if self.local_state and self._state.is_seeded:
+            return self.get_equity()
+        return await super().get_equity_async()
+
+    @override
+    async def get_orders_async(self) -> list[Order]:
+        if self.local_state and self._state.is_seeded:
+            return self.get_orders()
+        return await super().get_orders_async()
+
+    def mark_price(self, symbol: str, price: float) -> None:
+        """
+        Update the market value and unrealized P/L of the local position of a
+        symbol with its latest price.
+
+        Args:
+            symbol (str): The symbol of the asset.
+            price (float): The latest price.
+        """
+        if self.local_state and self._state.is_seeded:
+            self._state.mark(symbol, price)
+
+    def _fetch_state(self) -> tuple[list[Order], list[Position], float]:
+        """Get the active orders, positions and cash over REST."""
+        orders = self._trading_client.get_orders()
+        positions = self._trading_client.get_all_positions()
+        cash = float(self._trading_client.get_account().cash)
+        return orders, positions, cash
+
+    def reconcile_state(self) -> None:
+        """
+        Replace the local state with the active orders, positions and cash
+        from REST.
+        """
+        self._state.begin_reconcile()
+        self._state.reset(*self._fetch_state())
+
+    async def _reconcile_state(self) -> None:
+        """Reconcile the local state, with the REST calls off the event loop."""
+        self._state.begin_reconcile()
+        try:
+            state = await self.run_async(self._fetch_state)
+        except Exception as e:
+            self._state.abort_reconcile()
+            self.logger.error(f"Error reconciling account state: {e}")
+            return
+        self._state.reset(*state)
+
+    async def reconcile_state_forever(self) -> None:
+        """
+        Reconcile the local state every `reconcile_interval` seconds.
+
+        Notes:
+            This will block the current task, so you should run this in an asyncio task.
+        """
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            await self._reconcile_state()
+
     @override
     def cancel_all_orders(self) -> list[CancelOrderResponse]:
         """
@@ -841,6 +979,7 @@ class AlpacaEngine(BaseEngine, BaseModel):
         try:
             order_response = self._trading_client.close_position(symbol)
             if order_response:
+                self._add_order(order_response)
                 self.logger.info(
                     f"{order_response.status} | {order_response.side.upper()} {order_response.symbol} x {order_response.qty}"
                 )
@@ -860,9 +999,20 @@ class AlpacaEngine(BaseEngine, BaseModel):
             None: This function does not return a value.
 
         Notes:
-            The callback will be passed the Bar object as an argument.
+            The callback will be passed the Bar object as an argument. With
+            `local_state`, the local state is updated before the callback.
         """
-        self._trading_stream.subscribe_trade_updates(handler)
+        if self.local_state:
+            self._trade_update_handler = handler
+        else:
+            self._trading_stream.subscribe_trade_updates(handler)
+
+    async def _handle_trade_update(self, data) -> None:
+        """Apply a trade update to the local state and pass it on."""
+        if self._state.is_seeded:
+            self._state.apply(data)
+        if self._trade_update_handler is not None:
+            await self._trade_update_handler(data)
 
     def subscribe_minute_bars(
         self, handler: Callable[[Bar], Awaitable[None]], symbols: list[str]
@@ -980,6 +1130,10 @@ class AlpacaEngine(BaseEngine, BaseModel):
             This will block the current task, so you should run this in an asyncio task.
         """
         self.logger.debug(f"{self.__class__.__name__} | Setting up streaming")
+        if self.local_state and not self._state.is_seeded:
+            await self._reconcile_state()
         async with asyncio.TaskGroup() as tg:
             tg.create_task(self.stream_trade())
             tg.create_task(self.stream_data())
+            if self.local_state and self.reconcile_interval is not None:
+                tg.create_task(self.reconcile_state_forever())
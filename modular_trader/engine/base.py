@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 from abc import ABC, abstractmethod
-from typing import Any
+from concurrent.futures import Executor
+from typing import Any, Callable
 
 
 class BaseEngine(ABC):
+    """
+    Base class for engines.
+
+    The blocking methods have awaitable counterparts, suffixed with `_async`,
+    that run them on `get_executor()` so that the event loop running the
+    streams is not blocked by REST calls.
+    """
+
     @abstractmethod
     def get_name(self) -> str:
         """Get the name of the engine"""
@@ -77,3 +88,77 @@ class BaseEngine(ABC):
     @abstractmethod
     def streaming(self) -> None:
         """Streaming data from the engine"""
+
+    def get_executor(self) -> Executor | None:
+        """Get the executor running the blocking calls, None for the default
+        executor of the event loop."""
+        return None
+
+    async def run_async(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking function on the executor of the engine."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.get_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+    async def get_historical_data_async(self, *args, **kwargs) -> Any:
+        """Get the historical data, off the event loop"""
+        return await self.run_async(self.get_historical_data, *args, **kwargs)
+
+    async def get_positions_async(self) -> Any:
+        """Get all positions held by the account, off the event loop"""
+        return await self.run_async(self.get_positions)
+
+    async def get_cash_async(self) -> int | float:
+        """Get remaining cash in the account, off the event loop"""
+        return await self.run_async(self.get_cash)
+
+    async def get_equity_async(self) -> int | float:
+        """Get the current equity in the account, off the event loop"""
+        return await self.run_async(self.get_equity)
+
+    async def get_orders_async(self) -> Any:
+        """Get all active orders, off the event loop."""
+        return await self.run_async(self.get_orders)
+
+    async def order_share_async(self, *args, **kwargs) -> Any:
+        """Place an order for a fixed number of shares, off the event loop."""
+        return await self.run_async(self.order_share, *args, **kwargs)
+
+    async def order_value_async(self, *args, **kwargs) -> Any:
+        """Place an order for a fixed amount of money, off the event loop."""
+        return await self.run_async(self.order_value, *args, **kwargs)
+
+    async def order_percent_async(self, *args, **kwargs) -> Any:
+        """Place an order for a percent of the portfolio value, off the event
+        loop."""
+        return await self.run_async(self.order_percent, *args, **kwargs)
+
+    async def order_target_share_async(self, *args, **kwargs) -> Any:
+        """Adjust a position to a target number of shares, off the event loop."""
+        return await self.run_async(self.order_target_share, *args, **kwargs)
+
+    async def order_target_value_async(self, *args, **kwargs) -> Any:
+        """Adjust a position to a target amount of money, off the event loop."""
+        return await self.run_async(self.order_target_value, *args, **kwargs)
+
+    async def order_target_percent_async(self, *args, **kwargs) -> Any:
+        """Adjust a position to a target percent of the portfolio value, off the
+        event loop."""
+        return await self.run_async(self.order_target_percent, *args, **kwargs)
+
+    async def cancel_all_orders_async(self) -> Any:
+        """Cancel all active orders, off the event loop."""
+        return await self.run_async(self.cancel_all_orders)
+
+    async def cancel_orders_async(self, symbol: str) -> Any:
+        """Cancel all active orders for a given symbol, off the event loop."""
+        return await self.run_async(self.cancel_orders, symbol)
+
+    async def close_all_positions_async(self, *args, **kwargs) -> Any:
+        """Close all positions, off the event loop"""
+        return await self.run_async(self.close_all_positions, *args, **kwargs)
+
+    async def close_position_async(self, symbol: str) -> Any:
+        """Close a position for a given symbol, off the event loop."""
+        return await self.run_async(self.close_position, symbol)
@@ -0,0 +1,291 @@
+"""Rate limiting of the REST requests of an engine.
+
+All clients of an engine share one token bucket. Requests waiting for a token
+are served by priority, so orders go ahead of queued history downloads, and
+requests rejected with 429 or a 5xx status are retried with exponential
+backoff and jitter.
+"""
+
+from __future__ import annotations
+
+import enum
+import heapq
+import inspect
+import itertools
+import random
+import threading
+import time
+from typing import Any, Callable
+
+from alpaca.common.exceptions import APIError
+
+
+class RequestPriority(enum.IntEnum):
+    """
+    The priority of a request, lower first.
+
+    Attributes:
+        ORDER: Order submissions and cancellations, and the requests they
+            depend on.
+        ACCOUNT: Account, position, order and asset queries.
+        DATA: Historical market data.
+    """
+
+    ORDER = 0
+    ACCOUNT = 1
+    DATA = 2
+
+
+class RateLimiter:
+    """Token bucket rate limiter with priority scheduling and retries.
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens per
+    second; each request attempt takes one. Waiting requests are granted
+    tokens by priority, then in arrival order. The limiter is thread-safe, as
+    the requests are made from the threads of the engine executor.
+
+    A request rejected with 429 empties the bucket, since the server-side
+    limit is already reached. Requests rejected with 429, or with a 5xx status
+    if they are idempotent (GET and DELETE), are retried up to `max_retries`
+    times after a random delay of up to `base_delay * 2 ** attempt` seconds,
+    capped at `max_delay` ("full jitter").
+
+    Attributes:
+        rate (float): The tokens added per second.
+        burst (int): The capacity of the bucket.
+        max_retries (int): The retries of a rejected request.
+        base_delay (float): The maximum delay before the first retry.
+        max_delay (float): The maximum delay before a retry.
+    """
+
+    def __init__(
+        self,
+        rate: float = 200 / 60,
+        burst: int = 10,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+    ):
+        """
+        Initialize the limiter with a full bucket.
+
+        Args:
+            rate (float): The tokens added per second.
+            burst (int): The capacity of the bucket.
+            max_retries (int): The retries of a rejected request.
+            base_delay (float): The maximum delay before the first retry.
+            max_delay (float): The maximum delay before a retry.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        self._waiting: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._depths = {x: 0 for x in RequestPriority}
+        self._max_depths = {x: 0 for x in RequestPriority}
+        self._requests = {x: 0 for x in RequestPriority}
+        self._throttled = 0
+        self._retries = 0
+        self._wait_time = 0.0
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: RequestPriority = RequestPriority.ACCOUNT) -> None:
+        """
+        Take a token, waiting for one and for the waiting requests of a higher
+        priority.
+
+        Args:
+            priority (RequestPriority): The priority of the request.
+        """
+        with self._condition:
+            self._refill()
+            self._requests[priority] += 1
+            if self._tokens >= 1 and not self._waiting:
+                self._tokens -= 1
+                return
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            self._depths[priority] += 1
+            self._max_depths[priority] = max(
+                self._max_depths[priority], self._depths[priority]
+            )
+            self._throttled += 1
+            start = time.monotonic()
+            while True:
+                self._refill()
+                if self._waiting[0] == ticket and self._tokens >= 1:
+                    break
+                if self._waiting[0] == ticket:
+                    self._condition.wait((1 - self._tokens) / self.rate)
+                else:
+                    self._condition.wait()
+            heapq.heappop(self._waiting)
+            self._depths[priority] -= 1
+            self._tokens -= 1
+            self._wait_time += time.monotonic() - start
+            self._condition.notify_all()
+
+    def call(
+        self,
+        func: Callable[..., Any],
+        *args,
+        priority: RequestPriority = RequestPriority.ACCOUNT,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> Any:
+        """
+        Call a request function within the rate limit, retrying rejections.
+
+        Args:
+            func (Callable[..., Any]): Makes one request, raising `APIError`
+                if it is rejected.
+            priority (RequestPriority): The priority of the request.
+            idempotent (bool): Whether the request may be retried on a 5xx
+                status.
+
+        Returns:
+            Any: The result of `func`.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(priority)
+            try:
+                return func(*args, **kwargs)
+            except APIError as e:
+                status = _status_code(e)
+                retry = status == 429 or (idempotent and 500 <= status < 600)
+                if not retry or attempt == self.max_retries:
+                    raise
+                if status == 429:
+                    with self._condition:
+                        self._tokens = min(self._tokens, 0.0)
+            with self._condition:
+                self._retries += 1
+            time.sleep(
+                random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+            )
+
+    @property
+    def queue_depth(self) -> dict[str, int]:
+        """
+        The number of requests waiting for a token, by priority.
+
+        Returns:
+            dict[str, int]: The depths by priority name.
+        """
+        with self._condition:
+            return {x.name: self._depths[x] for x in RequestPriority}
+
+    def metrics(self) -> dict[str, Any]:
+        """
+        Get the counters of the limiter.
+
+        Returns:
+            dict[str, Any]: The current and maximum queue depth and the number
+                of requests by priority, the number of requests that waited for
+                a token, the total seconds waited, the number of retries and
+                the tokens left.
+        """
+        with self._condition:
+            self._refill()
+            return {
+                "queue_depth": {x.name: self._depths[x] for x in RequestPriority},
+                "max_queue_depth": {
+                    x.name: self._max_depths[x] for x in RequestPriority
+                },
+                "requests": {x.name: self._requests[x] for x in RequestPriority},
+                "throttled": self._throttled,
+                "wait_time": self._wait_time,
+                "retries": self._retries,
+                "tokens": self._tokens,
+            }
+
+    def limit(self, client: Any, data: bool = False) -> None:
+        """
+        Route the requests of an Alpaca REST client through the limiter.
+
+        Each request attempt of the client takes a token; the retries of the
+        client itself are replaced by the ones of the limiter.
+
+        The requests are intercepted at `RESTClient._one_request`, a private
+        method of alpaca-py, so the client is checked to still make its
+        requests through it first.
+
+        Args:
+            client (Any): The trading or historical data client.
+            data (bool): Whether the client is a market data client.
+
+        Raises:
+            TypeError: If the client does not make its requests through
+                `_one_request(method, url, opts, retry)`, e.g. after a change
+                of alpaca-py.
+        """
+        _check_client(client)
+        one_request = client._one_request
+
+        def _one_request(method: str, url: str, opts: dict, retry: int) -> Any:
+            return self.call(
+                one_request,
+                method,
+                url,
+                opts,
+                0,
+                priority=request_priority(method, url, data),
+                idempotent=method.upper() in ("GET", "DELETE"),
+            )
+
+        client._one_request = _one_request
+
+
+def request_priority(method: str, url: str, data: bool = False) -> RequestPriority:
+    """
+    Get the priority of an Alpaca REST request.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The URL.
+        data (bool): Whether it is a market data request.
+
+    Returns:
+        RequestPriority: The priority. The latest bars are requested to size
+            orders, so they have the priority of orders.
+    """
+    if data:
+        return RequestPriority.ORDER if "/latest" in url else RequestPriority.DATA
+    if method.upper() != "GET" and ("/orders" in url or "/positions" in url):
+        return RequestPriority.ORDER
+    return RequestPriority.ACCOUNT
+
+
+def _check_client(client: Any) -> None:
+    """Check that a REST client makes its requests through `_one_request`."""
+    request = getattr(type(client), "_request", None)
+    one_request = getattr(client, "_one_request", None)
+    calls = getattr(getattr(request, "__code__", None), "co_names", ())
+    if (
+        one_request is None
+        or "_one_request" not in calls
+        or list(inspect.signature(one_request).parameters)
+        != ["method", "url", "opts", "retry"]
+    ):
+        raise TypeError(
+            f"Cannot limit the requests of {type(client).__name__}: "
+            "unsupported version of alpaca-py"
+        )
+
+
+def _status_code(error: APIError) -> int:
+    """Get the HTTP status of an API error, 0 if it has none."""
+    try:
+        return int(error.status_code or 0)
+    except (AttributeError, TypeError, ValueError):
+        return 0
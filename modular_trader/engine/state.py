@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Iterable
+
+from alpaca.trading.enums import OrderSide, OrderStatus, PositionSide, TradeEvent
+from alpaca.trading.models import Position
+
+if TYPE_CHECKING:
+    from alpaca.trading.models import Order, TradeUpdate
+
+# events after which an order is no longer active
+TERMINAL_EVENTS: frozenset[TradeEvent] = frozenset(
+    {
+        TradeEvent.FILL,
+        TradeEvent.CANCELED,
+        TradeEvent.EXPIRED,
+        TradeEvent.REJECTED,
+        TradeEvent.REPLACED,
+    }
+)
+# statuses of the orders that are no longer active
+TERMINAL_STATUSES: frozenset[OrderStatus] = frozenset(
+    {
+        OrderStatus.FILLED,
+        OrderStatus.CANCELED,
+        OrderStatus.EXPIRED,
+        OrderStatus.REJECTED,
+        OrderStatus.REPLACED,
+        OrderStatus.DONE_FOR_DAY,
+    }
+)
+
+
+class AccountState:
+    """Local copy of the active orders, positions and cash of an account.
+
+    The state is seeded from REST (`reset`) and kept current from the trade
+    update events of the trading stream (`apply`): orders are added or replaced
+    on every event and dropped once filled, canceled, expired, rejected or
+    replaced; fills update the position quantity, average entry price and cash.
+    Market values and unrealized P/L are recomputed from the fill prices and the
+    prices given to `mark`. Reads are served from memory.
+
+    The state is updated on the event loop but read from the threads of the
+    engine executor, so every method holds a lock; other threads read it through
+    `get_orders`, `get_positions`, `get_position` and `equity`, which return
+    copies, rather than iterating over `orders` or `positions`.
+
+    Events applied between `begin_reconcile` and `reset` are applied again on
+    top of the new REST state, except for their cash, which the REST state may
+    already include.
+
+    Attributes:
+        orders (dict[str, Order]): The active orders, by order id.
+        positions (dict[str, Position]): The open positions, by symbol.
+        cash (float): The cash balance.
+        is_seeded (bool): Whether the state was seeded from REST.
+    """
+
+    def __init__(self):
+        self.orders: dict[str, Order] = {}
+        self.positions: dict[str, Position] = {}
+        self.cash: float = 0.0
+        self.is_seeded: bool = False
+        self._replay: list[TradeUpdate] | None = None
+        self._lock = threading.RLock()
+
+    @property
+    def equity(self) -> float:
+        """
+        The cash plus the market value of the positions.
+
+        Returns:
+            float: The equity.
+        """
+        with self._lock:
+            return self.cash + sum(
+                float(p.market_value or 0) for p in self.positions.values()
+            )
+
+    def get_orders(self) -> list[Order]:
+        """
+        Get the active orders.
+
+        Returns:
+            list[Order]: A copy of the active orders.
+        """
+        with self._lock:
+            return list(self.orders.values())
+
+    def get_positions(self) -> list[Position]:
+        """
+        Get the open positions.
+
+        Returns:
+            list[Position]: A copy of the open positions.
+        """
+        with self._lock:
+            return list(self.positions.values())
+
+    def get_position(self, symbol: str) -> Position | None:
+        """
+        Get the open position of a symbol.
+
+        Args:
+            symbol (str): The symbol.
+
+        Returns:
+            Position | None: The position, None if there is none.
+        """
+        with self._lock:
+            return self.positions.get(symbol, None)
+
+    def begin_reconcile(self) -> None:
+        """
+        Start recording the events to apply again after the next `reset`.
+        """
+        with self._lock:
+            self._replay = []
+
+    def abort_reconcile(self) -> None:
+        """
+        Stop recording the events, e.g. after the REST calls failed.
+        """
+        with self._lock:
+            self._replay = None
+
+    def reset(
+        self, orders: Iterable[Order], positions: Iterable[Position], cash: float
+    ) -> None:
+        """
+        Replace the state with the one from REST.
+
+        Args:
+            orders (Iterable[Order]): The active orders.
+            positions (Iterable[Position]): The open positions.
+            cash (float): The cash balance.
+        """
+        orders = {str(x.id): x for x in orders}
+        positions = {x.symbol: x for x in positions}
+        with self._lock:
+            self.orders = orders
+            self.positions = positions
+            self.cash = cash
+            self.is_seeded = True
+            replay, self._replay = self._replay or [], None
+            for data in replay:
+                self.apply(data, cash=False)
+
+    def add_order(self, order: Order) -> None:
+        """
+        Add or update an order, e.g. from the response of its submission.
+
+        Args:
+            order (Order): The order.
+        """
+        with self._lock:
+            if order.status in TERMINAL_STATUSES:
+                self.orders.pop(str(order.id), None)
+            else:
+                self.orders[str(order.id)] = order
+
+    def apply(self, data: TradeUpdate, cash: bool = True) -> None:
+        """
+        Apply a trade update event.
+
+        Args:
+            data (TradeUpdate): The trade update.
+            cash (bool): Whether a fill updates the cash.
+        """
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(data)
+            order = data.order
+            if data.event in TERMINAL_EVENTS:
+                self.orders.pop(str(order.id), None)
+            else:
+                self.orders[str(order.id)] = order
+
+            if data.event not in (TradeEvent.FILL, TradeEvent.PARTIAL_FILL):
+                return
+            if data.qty is None or data.price is None:
+                return
+            sign = 1 if order.side == OrderSide.BUY else -1
+            qty = sign * float(data.qty)
+            price = float(data.price)
+            if cash:
+                self.cash -= qty * price
+            self._fill(order, qty, price, data.position_qty)
+
+    def _fill(
+        self, order: Order, qty: float, price: float, position_qty: float | None
+    ) -> None:
+        """Update the position of a symbol with a fill of a signed quantity."""
+        position = self.positions.get(order.symbol, None)
+        old_qty = float(position.qty) if position is not None else 0.0
+        new_qty = old_qty + qty if position_qty is None else float(position_qty)
+        if new_qty == 0:
+            self.positions.pop(order.symbol, None)
+            return
+        avg = float(position.avg_entry_price) if position is not None else price
+        if old_qty == 0 or (new_qty > 0) != (old_qty > 0):
+            # opened or flipped at the fill price
+            avg = price
+        elif abs(new_qty) > abs(old_qty):
+            avg = (old_qty * avg + (new_qty - old_qty) * price) / new_qty
+        if position is None:
+            position = Position.model_construct(
+                asset_id=order.asset_id,
+                symbol=order.symbol,
+                asset_class=order.asset_class,
+                exchange=None,
+            )
+        self.positions[order.symbol] = _priced(
+            position.model_copy(
+                update={
+                    "qty": str(new_qty),
+                    "qty_available": str(new_qty),
+                    "side": PositionSide.LONG if new_qty > 0 else PositionSide.SHORT,
+                    "avg_entry_price": str(avg),
+                    "cost_basis": str(new_qty * avg),
+                }
+            ),
+            price,
+        )
+
+    def mark(self, symbol: str, price: float) -> None:
+        """
+        Update the market value and unrealized P/L of a position with a price.
+
+        Args:
+            symbol (str): The symbol.
+            price (float): The latest price.
+        """
+        with self._lock:
+            position = self.positions.get(symbol, None)
+            if position is not None:
+                self.positions[symbol] = _priced(position, price)
+
+
+def _priced(position: Position, price: float) -> Position:
+    """Get a position with the values that depend on the price recomputed."""
+    qty = float(position.qty)
+    cost_basis = float(position.cost_basis)
+    market_value = qty * price
+    unrealized_pl = market_value - cost_basis
+    return position.model_copy(
+        update={
+            "current_price": str(price),
+            "market_value": str(market_value),
+            "unrealized_pl": str(unrealized_pl),
+            "unrealized_plpc": str(unrealized_pl / abs(cost_basis) if cost_basis else 0),
+        }
+    )
@@ -20,6 +20,22 @@ class BaseAssetSelection(ABC):
         symbols: Iterable[str] = self.run(context) or []
         context.universe.update(symbols)
 
+    async def call_async(self, context: Context):
+        """
+        Awaitable counterpart of __call__(), awaiting run_async().
+        """
+        symbols: Iterable[str] = await self.run_async(context) or []
+        context.universe.update(symbols)
+
+    async def run_async(self, context: Context) -> Iterable[str]:
+        """
+        Awaitable counterpart of run(), called by call_async().
+
+        Calls run() by default. Override to await the `_async` methods of the
+        engine instead of blocking the event loop.
+        """
+        return self.run(context)
+
     @abstractmethod
     def run(self, context: Context) -> Iterable[str]:
         """
@@ -1,4 +1,5 @@
 from .base import BaseOrderExecution
+from .concurrent import ConcurrentOrderExecution, OrderReport
 from .instant import InstantOrderExecution
 from .threshold import ThresholdDeviationOrderExecution
 
@@ -6,4 +7,6 @@ __all__ = [
     "BaseOrderExecution",
     "InstantOrderExecution",
     "ThresholdDeviationOrderExecution",
+    "ConcurrentOrderExecution",
+    "OrderReport",
 ]
@@ -15,6 +15,25 @@ class BaseOrderExecution(ABC):
         # context.signals.clear()
         # context.allocations.clear()
 
+    async def call_async(
+        self, context: Context, allocations: AllocationCollection
+    ) -> None:
+        """
+        Awaitable counterpart of __call__(), awaiting run_async().
+        """
+        await self.run_async(context, allocations)
+
+    async def run_async(
+        self, context: Context, allocations: AllocationCollection
+    ) -> None:
+        """
+        Awaitable counterpart of run(), called by call_async().
+
+        Orders are placed over REST, so run() is called on the executor of the
+        engine by default, off the event loop.
+        """
+        await context.engine.run_async(self.run, context, allocations)
+
     @abstractmethod
     def run(self, context: Context, allocations: AllocationCollection) -> None: 
         """
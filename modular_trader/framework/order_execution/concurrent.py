@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+from typing import TYPE_CHECKING, Any
+
+from pydantic import Field
+from pydantic.dataclasses import dataclass
+from typing_extensions import override
+
+from modular_trader.allocation import (
+    AllocationAdjustment,
+    AllocationCollection,
+    AllocationTarget,
+)
+
+from .instant import InstantOrderExecution
+
+if TYPE_CHECKING:
+    from modular_trader.allocation import Allocation
+    from modular_trader.context import Context
+    from modular_trader.engine.base import BaseEngine
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class OrderReport:
+    """The submission of the order of one allocation.
+
+    Attributes:
+        symbol (str): The symbol.
+        is_sell (bool): Whether the order reduces the position.
+        latency (float): The seconds from the submission to the response.
+        order (Any): The order response, None if no order was placed.
+        error (str | None): The error raised by the submission, if any.
+    """
+
+    symbol: str
+    is_sell: bool
+    latency: float
+    order: Any = None
+    error: str | None = None
+
+
+@dataclass
+class ConcurrentOrderExecution(InstantOrderExecution):
+    """Execute orders from allocations concurrently.
+
+    Like InstantOrderExecution, but the orders are submitted through the
+    `_async` methods of the engine, at most `max_concurrency` at a time. The
+    orders reducing a position (sells) are submitted before the ones increasing
+    a position (buys), so the cash they free is available to the buys; with
+    `sell_fill_timeout`, the buys also wait for the sells to be filled, up to
+    that many seconds. Allocations that leave the weight unchanged, such as
+    adjustments of 0, are skipped.
+
+    The submission of each order is reported in `reports`, with its latency.
+
+    Args:
+        max_concurrency (int, optional): The maximum number of orders in flight.
+            The executor of the engine also bounds it, e.g. to `max_workers` of
+            AlpacaEngine. Defaults to 4.
+        sell_fill_timeout (float | None, optional): The seconds to wait for the
+            sells to leave the active orders before submitting the buys. If
+            None, the buys are submitted once the sells are. Defaults to None.
+    """
+
+    max_concurrency: int = Field(default=4)
+    sell_fill_timeout: float | None = Field(default=None)
+    _reports: list[OrderReport] = Field(default_factory=list)
+
+    reports = property(fget=lambda self: self._reports)
+
+    @override
+    def run(self, context: Context, allocations: AllocationCollection) -> None:
+        asyncio.run(self.run_async(context, allocations))
+
+    @override
+    async def run_async(
+        self, context: Context, allocations: AllocationCollection
+    ) -> None:
+        self._reports = []
+        if allocations is None or len(allocations) == 0:
+            return
+        engine = context.engine
+        symbols_in_orders = {x.symbol for x in await engine.get_orders_async()}
+        # skip if order is pending
+        pending = [x for x in allocations if x.symbol not in symbols_in_orders]
+        weights = await self._current_weights(engine, pending)
+        sells, buys = [], []
+        for allocation in pending:
+            if not isinstance(allocation, (AllocationTarget, AllocationAdjustment)):
+                raise TypeError(f"Unknown allocation type: {type(allocation)}")
+            if isinstance(allocation, AllocationTarget):
+                delta = allocation.weight - weights.get(allocation.symbol, 0.0)
+            else:
+                delta = allocation.weight
+            # nothing to trade
+            if delta == 0:
+                continue
+            (sells if delta < 0 else buys).append(allocation)
+
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        sell_reports = await asyncio.gather(
+            *(self._submit(engine, semaphore, x, True) for x in sells)
+        )
+        if self.sell_fill_timeout is not None:
+            await self._wait_for_fills(engine, sell_reports)
+        buy_reports = await asyncio.gather(
+            *(self._submit(engine, semaphore, x, False) for x in buys)
+        )
+        self._reports = [*sell_reports, *buy_reports]
+
+        if self._reports:
+            latencies = sorted(x.latency for x in self._reports)
+            context.logger.debug(
+                f"{len(sells)} sells, {len(buys)} buys submitted in "
+                f"{time.perf_counter() - start:.3f}s | latency median "
+                f"{latencies[len(latencies) // 2]:.3f}s, max {latencies[-1]:.3f}s"
+            )
+
+    async def _current_weights(
+        self, engine: BaseEngine, allocations: list[Allocation]
+    ) -> dict[str, float]:
+        """Get the current portfolio weight of each position."""
+        if not any(isinstance(x, AllocationTarget) for x in allocations):
+            return {}
+        positions, equity = await asyncio.gather(
+            engine.get_positions_async(), engine.get_equity_async()
+        )
+        if not equity:
+            return {}
+        return {p.symbol: float(p.market_value) / equity for p in positions}
+
+    async def _submit(
+        self,
+        engine: BaseEngine,
+        semaphore: asyncio.Semaphore,
+        allocation: Allocation,
+        is_sell: bool,
+    ) -> OrderReport:
+        """Submit the order of an allocation and report its latency."""
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if isinstance(allocation, AllocationAdjustment):
+                    order = await engine.order_percent_async(
+                        allocation.symbol, allocation.weight
+                    )
+                elif allocation.weight == 0:
+                    order = await engine.close_position_async(allocation.symbol)
+                else:
+                    order = await engine.order_target_percent_async(
+                        allocation.symbol, allocation.weight
+                    )
+            except Exception as e:
+                return OrderReport(
+                    allocation.symbol,
+                    is_sell,
+                    time.perf_counter() - start,
+                    error=repr(e),
+                )
+            return OrderReport(
+                allocation.symbol, is_sell, time.perf_counter() - start, order
+            )
+
+    async def _wait_for_fills(
+        self, engine: BaseEngine, reports: list[OrderReport]
+    ) -> None:
+        """Wait for the given orders to leave the active orders, or timeout."""
+        ids = {str(x.order.id) for x in reports if getattr(x.order, "id", None)}
+        deadline = time.perf_counter() + self.sell_fill_timeout
+        while ids and time.perf_counter() < deadline:
+            active = {str(x.id) for x in await engine.get_orders_async()}
+            ids &= active
+            if ids:
+                await asyncio.sleep(0.1)
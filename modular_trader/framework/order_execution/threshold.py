@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+from typing import TYPE_CHECKING, Any, Iterable
 
 from pydantic import Field
 from pydantic.dataclasses import dataclass
@@ -31,14 +32,31 @@ class ThresholdDeviationOrderExecution(InstantOrderExecution):
             return
         positions = context.engine.get_positions()
         equity = context.engine.get_equity()
+        if self._deviates(allocations, positions, equity):
+            return super().run(context, allocations)
+
+    @override
+    async def run_async(
+        self, context: Context, allocations: AllocationCollection
+    ) -> None:
+        if allocations is None or len(allocations) == 0:
+            return
+        positions, equity = await asyncio.gather(
+            context.engine.get_positions_async(), context.engine.get_equity_async()
+        )
+        if self._deviates(allocations, positions, equity):
+            await context.engine.run_async(super().run, context, allocations)
+
+    def _deviates(
+        self, allocations: AllocationCollection, positions: Iterable[Any], equity: float
+    ) -> bool:
+        """Check if any allocation deviates from its current weight by the
+        threshold."""
         # Mapping[symbol, currentWeight]
         current_weights: dict[str, float] = {
             p.symbol: float(p.market_value) / equity for p in positions
         }
-
-        for alloc in allocations:
-            if (
-                abs(alloc.weight - current_weights.get(alloc.symbol, 0))
-                >= self.threshold
-            ):
-                return super().run(context, allocations)
+        return any(
+            abs(alloc.weight - current_weights.get(alloc.symbol, 0)) >= self.threshold
+            for alloc in allocations
+        )
@@ -27,6 +27,23 @@ class BasePortfolioBuilder(ABC):
         context.allocations.clear()  # clearing old before adding new
         context.allocations.add(allocations)
 
+    async def call_async(self, context: Context, signals: SignalCollection) -> Any:
+        """Awaitable counterpart of `__call__`, awaiting `run_async`."""
+        allocations: Iterable[Allocation] = await self.run_async(context, signals) or []
+        context.allocations.clear()  # clearing old before adding new
+        context.allocations.add(allocations)
+
+    async def run_async(
+        self, context: Context, signals: SignalCollection
+    ) -> Iterable[Allocation]:
+        """
+        Awaitable counterpart of `run`, called by `call_async`.
+
+        Calls `run` by default. Override to await the `_async` methods of the
+        engine instead of blocking the event loop.
+        """
+        return self.run(context, signals)
+
     @abstractmethod
     def run(
         self, context: Context, signals: SignalCollection
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Iterable
+from typing import TYPE_CHECKING, Any, Iterable
 
 from typing_extensions import override
 
@@ -21,6 +21,18 @@ class EqualWeightPortfolioBuilder(BasePortfolioBuilder):
     """
     @override
     def run(self, context: Context, signals: SignalCollection) -> Iterable[Allocation]:
+        return self._allocations(signals, context.engine.get_positions())
+
+    @override
+    async def run_async(
+        self, context: Context, signals: SignalCollection
+    ) -> Iterable[Allocation]:
+        return self._allocations(signals, await context.engine.get_positions_async())
+
+    def _allocations(
+        self, signals: SignalCollection, positions: Iterable[Any]
+    ) -> list[Allocation]:
+        """Build the allocations from the signals and the current positions."""
         filtered_signals = [s for s in signals if s.direction == SignalDirection.UP]
         if len(filtered_signals) == 0:
             return []
@@ -29,7 +41,7 @@ class EqualWeightPortfolioBuilder(BasePortfolioBuilder):
 
         # Liquidate holding symbols, no longer in targets
         signal_symbols = [s.symbol for s in filtered_signals]
-        pos_symbols: list[str] = [p.symbol for p in context.engine.get_positions()]
+        pos_symbols: list[str] = [p.symbol for p in positions]
         liqudate_symbols = set(pos_symbols).difference(signal_symbols)
         liquidates = [AllocationTarget(s, 0) for s in liqudate_symbols]
 
@@ -24,6 +24,21 @@ class BaseRiskManagement(ABC):
     def __call__(self, context: Context, allocations: AllocationCollection):
         allocations = self.run(context, allocations)
 
+    async def call_async(self, context: Context, allocations: AllocationCollection):
+        """Awaitable counterpart of `__call__`, awaiting `run_async`."""
+        allocations = await self.run_async(context, allocations)
+
+    async def run_async(
+        self, context: Context, allocations: AllocationCollection
+    ) -> AllocationCollection:
+        """
+        Awaitable counterpart of `run`, called by `call_async`.
+
+        Calls `run` by default. Override to await the `_async` methods of the
+        engine instead of blocking the event loop.
+        """
+        return self.run(context, allocations)
+
     @abstractmethod
     def run(
         self, context: Context, allocations: AllocationCollection
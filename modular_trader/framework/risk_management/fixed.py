@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterable
 
 from pydantic import Field
 from pydantic.dataclasses import dataclass
@@ -40,11 +40,24 @@ class FixedStopLossRiskManagement(BaseRiskManagement):
         Returns:
             The modified allocations.
         """
-        unreal_pnl_pcts = {
-            p.symbol: float(p.unrealized_plpc) for p in context.engine.get_positions()
-        }
+        return self._liquidate_losses(allocations, context.engine.get_positions())
+
+    @override
+    async def run_async(
+        self, context: Context, allocations: AllocationCollection
+    ) -> AllocationCollection:
+        return self._liquidate_losses(
+            allocations, await context.engine.get_positions_async()
+        )
+
+    def _liquidate_losses(
+        self, allocations: AllocationCollection, positions: Iterable[Any]
+    ) -> AllocationCollection:
+        """Liquidate the given positions whose loss reaches `percent_loss`."""
+        unreal_pnl_pcts = {p.symbol: float(p.unrealized_plpc) for p in positions}
         for symbol, pct_loss in unreal_pnl_pcts.items():
             # liquidate if loss greather than percent_loss
             if pct_loss <= -self.percent_loss:
                 allocations.remove_symbol(symbol)
                 allocations.add(AllocationTarget(symbol, 0))
+        return allocations
@@ -41,6 +41,22 @@ class BaseSignalGeneration(ABC):
         context.signals.clear()  # clearing old before adding new
         context.signals.add(signals)
 
+    async def call_async(self, context: Context, universe: AssetUniverse):
+        """Awaitable counterpart of __call__(), awaiting run_async()."""
+        signals: Iterable[Signal] = await self.run_async(context, universe) or []
+        context.signals.clear()  # clearing old before adding new
+        context.signals.add(signals)
+
+    async def run_async(
+        self, context: Context, universe: AssetUniverse
+    ) -> Iterable[Signal]:
+        """Awaitable counterpart of run(), called by call_async().
+
+        Calls run() by default. Override to await the `_async` methods of the
+        engine instead of blocking the event loop.
+        """
+        return self.run(context, universe)
+
     @abstractmethod
     def run(self, context: Context, universe: AssetUniverse) -> Iterable[Signal]:
         """Must be implemented by subclasses.
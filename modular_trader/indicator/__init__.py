@@ -1,3 +1,11 @@
-from . import handler, technical
+from . import bank, graph, handler, registry, resample, snapshot, technical
 
-__all__ = ["handler", "technical"]
+__all__ = [
+    "bank",
+    "graph",
+    "handler",
+    "registry",
+    "resample",
+    "snapshot",
+    "technical",
+]
@@ -0,0 +1,643 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Iterable, Mapping, Sequence
+
+import numpy as np
+from talipp.indicators.Stoch import StochVal
+
+from modular_trader.common.type_aliases import RealNumber
+from modular_trader.indicator.technical import kernels
+
+
+class IndicatorBank(ABC):
+    """Base class for indicator banks.
+
+    An indicator bank computes one indicator for many symbols at once. The
+    state of every symbol is stored in NumPy arrays indexed by symbol, so the
+    symbols that printed a bar are updated in one vectorized step instead of
+    one indicator object per symbol.
+
+    Attributes:
+        name (str): The name of the indicator.
+        symbols (list[str]): The symbols in the bank.
+        warmup_length (int): The number of bars needed to calculate a value.
+    """
+
+    def __init__(self, name: str, capacity: int = 64):
+        """
+        Initialize the bank.
+
+        Args:
+            name (str): The name of the indicator.
+            capacity (int): The initial number of symbols the bank can hold.
+                The bank grows as symbols are added. Defaults to 64.
+        """
+        self._name = name
+        self._index: dict[str, int] = {}
+        self._free: list[int] = []
+        self._capacity = 0
+        self._count = np.zeros(0, dtype=np.int64)
+        self._value = np.zeros(0)
+        self._resize(max(capacity, 1))
+
+    name = property(fget=lambda self: self._name)
+    symbols = property(fget=lambda self: list(self._index.keys()))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name}, symbols={len(self._index)})"
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    @abstractmethod
+    def warmup_length(self) -> int:
+        """The number of bars needed to calculate a value."""
+
+    @property
+    def params(self) -> dict:
+        """The parameters of the indicator."""
+        return {}
+
+    def add(self, symbols: Iterable[str]) -> None:
+        """
+        Add symbols to the bank. Symbols already in the bank are kept.
+
+        Args:
+            symbols (Iterable[str]): The symbols to add.
+        """
+        for symbol in symbols:
+            if symbol in self._index:
+                continue
+            if not self._free:
+                self._resize(2 * self._capacity)
+            row = self._free.pop()
+            self._reset(np.array([row]))
+            self._index[symbol] = row
+
+    def remove(self, symbols: Iterable[str]) -> None:
+        """
+        Remove symbols from the bank.
+
+        Args:
+            symbols (Iterable[str]): The symbols to remove.
+        """
+        for symbol in symbols:
+            row = self._index.pop(symbol, None)
+            if row is not None:
+                self._free.append(row)
+
+    def rows(self, symbols: Sequence[str]) -> np.ndarray:
+        """
+        Get the rows of the given symbols.
+
+        Args:
+            symbols (Sequence[str]): The symbols.
+
+        Returns:
+            np.ndarray: The row of each symbol.
+
+        Raises:
+            KeyError: If a symbol is not in the bank.
+        """
+        return np.fromiter(
+            (self._index[s] for s in symbols), dtype=np.int64, count=len(symbols)
+        )
+
+    def is_ready(self, symbol: str) -> bool:
+        """
+        Check if the indicator of the given symbol has calculated a value.
+
+        Args:
+            symbol (str): The symbol.
+
+        Returns:
+            bool: True if a value is calculated, False otherwise.
+        """
+        row = self._index.get(symbol, None)
+        return row is not None and bool(self._count[row] >= self.warmup_length)
+
+    def get(self, symbol: str) -> BankIndicator | None:
+        """
+        Get a view on the indicator of the given symbol.
+
+        Args:
+            symbol (str): The symbol.
+
+        Returns:
+            BankIndicator | None: The view, or None if the symbol is not in the bank.
+        """
+        if symbol not in self._index:
+            return None
+        return BankIndicator(self, symbol)
+
+    def value(self, symbol: str) -> RealNumber | None:
+        """
+        Get the current value of the indicator of the given symbol.
+
+        Args:
+            symbol (str): The symbol.
+
+        Returns:
+            RealNumber | None: The current value, or None if not ready.
+        """
+        if not self.is_ready(symbol):
+            return None
+        return float(self._value[self._index[symbol]])
+
+    def update(
+        self,
+        symbols: Sequence[str],
+        open: Sequence[RealNumber] | None = None,
+        high: Sequence[RealNumber] | None = None,
+        low: Sequence[RealNumber] | None = None,
+        close: Sequence[RealNumber] | None = None,
+        volume: Sequence[RealNumber] | None = None,
+    ) -> None:
+        """
+        Update the given symbols with one bar each, in one vectorized step.
+
+        Args:
+            symbols (Sequence[str]): The symbols that printed a bar. Each symbol
+                must appear at most once.
+            open (Sequence[RealNumber] | None): The open prices.
+            high (Sequence[RealNumber] | None): The high prices.
+            low (Sequence[RealNumber] | None): The low prices.
+            close (Sequence[RealNumber] | None): The close prices.
+            volume (Sequence[RealNumber] | None): The volumes.
+        """
+        if len(symbols) == 0:
+            return
+        rows = self.rows(symbols)
+        self._update(
+            rows,
+            kernels.as_float_array(high),
+            kernels.as_float_array(low),
+            kernels.as_float_array(close),
+        )
+
+    def warmup(
+        self,
+        symbol: str,
+        open: Sequence[RealNumber] | None = None,
+        high: Sequence[RealNumber] | None = None,
+        low: Sequence[RealNumber] | None = None,
+        close: Sequence[RealNumber] | None = None,
+        volume: Sequence[RealNumber] | None = None,
+    ) -> None:
+        """
+        Seed the state of a symbol from its history.
+
+        Args:
+            symbol (str): The symbol.
+            open (Sequence[RealNumber] | None): The open prices.
+            high (Sequence[RealNumber] | None): The high prices.
+            low (Sequence[RealNumber] | None): The low prices.
+            close (Sequence[RealNumber] | None): The close prices.
+            volume (Sequence[RealNumber] | None): The volumes.
+        """
+        self.add([symbol])
+        row = self._index[symbol]
+        self._reset(np.array([row]))
+        self._warmup(
+            row,
+            kernels.as_float_array(high),
+            kernels.as_float_array(low),
+            kernels.as_float_array(close),
+        )
+
+    def state(self) -> tuple[dict[str, int], dict[str, np.ndarray]]:
+        """
+        Get the state of the bank, compacted to the symbols in the bank.
+
+        Returns:
+            tuple[dict[str, int], dict[str, np.ndarray]]: The position of each
+                symbol in the state arrays, and the state arrays by name.
+        """
+        rows = self.rows(self.symbols)
+        positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+        return positions, {k: v[rows] for k, v in self._state_arrays().items()}
+
+    def restore(
+        self, positions: Mapping[str, int], arrays: Mapping[str, np.ndarray]
+    ) -> None:
+        """
+        Restore the state of symbols from the output of `state`.
+
+        Args:
+            positions (Mapping[str, int]): The position of each symbol in the
+                state arrays.
+            arrays (Mapping[str, np.ndarray]): The state arrays by name.
+        """
+        symbols = list(positions.keys())
+        self.add(symbols)
+        rows = self.rows(symbols)
+        source = np.fromiter(positions.values(), dtype=np.int64, count=len(symbols))
+        for key, array in self._state_arrays().items():
+            array[rows] = arrays[key][source]
+
+    def _state_arrays(self) -> dict[str, np.ndarray]:
+        """The arrays holding the state of the bank, one row per symbol."""
+        return {"count": self._count, "value": self._value}
+
+    def _resize(self, capacity: int) -> None:
+        """Grow the state arrays to hold the given number of symbols."""
+        self._free.extend(range(capacity - 1, self._capacity - 1, -1))
+        self._count = self._grow(self._count, capacity)
+        self._value = self._grow(self._value, capacity)
+        self._capacity = capacity
+
+    @staticmethod
+    def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+        """Return a copy of the array with capacity rows, zero-filled."""
+        grown = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+        grown[: len(array)] = array
+        return grown
+
+    def _reset(self, rows: np.ndarray) -> None:
+        """Reset the state of the given rows."""
+        self._count[rows] = 0
+        self._value[rows] = np.nan
+
+    @abstractmethod
+    def _update(
+        self, rows: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray
+    ) -> None:
+        """Update the given rows with one bar each."""
+
+    @abstractmethod
+    def _warmup(
+        self, row: int, high: np.ndarray, low: np.ndarray, close: np.ndarray
+    ) -> None:
+        """Seed the state of a row from its history."""
+
+
+class BankIndicator:
+    """View on the indicator of one symbol in an indicator bank.
+
+    Exposes the same read interface as `BaseIndicator`, so that it can be
+    returned by the indicator handler in place of a per-symbol indicator.
+
+    Attributes:
+        bank (IndicatorBank): The bank.
+        symbol (str): The symbol.
+    """
+
+    __slots__ = ("bank", "symbol")
+
+    def __init__(self, bank: IndicatorBank, symbol: str):
+        self.bank = bank
+        self.symbol = symbol
+
+    name = property(fget=lambda self: self.bank.name)
+    is_ready = property(fget=lambda self: self.bank.is_ready(self.symbol))
+    value = property(fget=lambda self: self.bank.value(self.symbol))
+
+    def __repr__(self) -> str:
+        return f"{self.bank.__class__.__name__}(name={self.name}, value={self.value})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class _WindowBank(IndicatorBank):
+    """Bank keeping the last `window` values of a series for every symbol."""
+
+    def __init__(self, window: int, name: str, capacity: int = 64):
+        self._window = window
+        self._windows: dict[str, np.ndarray] = {}
+        super().__init__(name, capacity)
+
+    def _resize(self, capacity: int) -> None:
+        for key, array in self._windows.items():
+            self._windows[key] = self._grow(array, capacity)
+        super()._resize(capacity)
+
+    def _state_arrays(self) -> dict[str, np.ndarray]:
+        arrays = super()._state_arrays()
+        arrays.update({f"window.{k}": v for k, v in self._windows.items()})
+        return arrays
+
+    def _push(self, key: str, rows: np.ndarray, values: np.ndarray) -> None:
+        """Push one value per row into the window of the given series."""
+        window = self._windows[key]
+        position = self._count[rows] % window.shape[1]
+        window[rows, position] = values
+
+    @staticmethod
+    def _sum(windows: np.ndarray) -> np.ndarray:
+        """Sum each window left to right, as the streaming indicators do."""
+        return np.array([sum(window) for window in windows.tolist()])
+
+    def _seed_window(self, key: str, row: int, values: np.ndarray) -> None:
+        """Fill the window of a row from the last values of a history."""
+        window = self._windows[key]
+        size = window.shape[1]
+        last = values[-size:]
+        # place the values where `_push` would have put them
+        position = np.arange(len(values) - len(last), len(values)) % size
+        window[row, position] = last
+
+
+class SMABank(_WindowBank):
+    """Simple Moving Average (SMA) for many symbols.
+
+    The average is updated recursively in the same way as `SMA`.
+
+    Args:
+        period (int): The number of periods to calculate the average over.
+        name (str | None): The name of the indicator.
+        capacity (int): The initial number of symbols. Defaults to 64.
+    """
+
+    def __init__(self, period: int, name: str | None = None, capacity: int = 64):
+        self.period = period
+        name = name or f"SMA_{period}"
+        super().__init__(period, name, capacity)
+
+    @property
+    def warmup_length(self) -> int:
+        return self.period
+
+    params = property(fget=lambda self: {"period": self.period})
+
+    def _resize(self, capacity: int) -> None:
+        self._windows.setdefault("close", np.zeros((0, self.period)))
+        super()._resize(capacity)
+
+    def _update(self, rows, high, low, close) -> None:
+        window = self._windows["close"]
+        position = self._count[rows] % self.period
+        oldest = window[rows, position]
+        self._push("close", rows, close)
+        self._count[rows] += 1
+        count = self._count[rows]
+
+        value = self._value[rows] - (oldest - close) / float(self.period)
+        first = count == self.period
+        if first.any():
+            value[first] = self._sum(window[rows[first]]) / self.period
+        self._value[rows] = np.where(count >= self.period, value, np.nan)
+
+    def _warmup(self, row, high, low, close) -> None:
+        output = kernels.sma(close, self.period)
+        self._seed_window("close", row, close)
+        self._count[row] = len(close)
+        self._value[row] = output[-1] if len(output) else np.nan
+
+
+class RSIBank(_WindowBank):
+    """Relative Strength Index (RSI) for many symbols.
+
+    Reproduces `RSI` with the same cache size. With the default cache size of
+    `period`, `RSI` sees only the last `period + 1` values, and initializes the
+    average gain and loss again from them on every bar; the bank keeps the same
+    window of closes per symbol. With a larger cache size, the averages are
+    initialized once and smoothed recursively.
+
+    Args:
+        period (int): The period of the RSI.
+        cache_size (int | None): The cache size of the `RSI` to reproduce.
+            Defaults to `period`.
+        name (str | None): The name of the indicator.
+        capacity (int): The initial number of symbols. Defaults to 64.
+    """
+
+    def __init__(
+        self,
+        period: int,
+        cache_size: int | None = None,
+        name: str | None = None,
+        capacity: int = 64,
+    ):
+        cache_size = cache_size or period
+        assert cache_size >= period, f"Cache size must be at least {period}"
+        self.period = period
+        self.cache_size = cache_size
+        self._previous = np.zeros(0)
+        self._avg_gain = np.zeros(0)
+        self._avg_loss = np.zeros(0)
+        name = name or f"RSI_{period}"
+        super().__init__(period + 1, name, capacity)
+
+    @property
+    def warmup_length(self) -> int:
+        return self.period + 1
+
+    params = property(fget=lambda self: {"period": self.period})
+    # the averages are initialized again on every bar
+    is_windowed = property(fget=lambda self: self.cache_size == self.period)
+
+    def _state_arrays(self) -> dict[str, np.ndarray]:
+        arrays = super()._state_arrays()
+        arrays.update(
+            previous=self._previous, avg_gain=self._avg_gain, avg_loss=self._avg_loss
+        )
+        return arrays
+
+    def _resize(self, capacity: int) -> None:
+        if self.is_windowed:
+            self._windows.setdefault("close", np.zeros((0, self.period + 1)))
+        self._previous = self._grow(self._previous, capacity)
+        self._avg_gain = self._grow(self._avg_gain, capacity)
+        self._avg_loss = self._grow(self._avg_loss, capacity)
+        super()._resize(capacity)
+
+    def _reset(self, rows: np.ndarray) -> None:
+        super()._reset(rows)
+        self._avg_gain[rows] = 0.0
+        self._avg_loss[rows] = 0.0
+
+    def _update(self, rows, high, low, close) -> None:
+        if self.is_windowed:
+            self._update_windowed(rows, close)
+            return
+        period = self.period
+        count = self._count[rows]
+        change = np.where(count > 0, close - self._previous[rows], 0.0)
+        gain = np.where(change > 0, change, 0.0)
+        loss = np.where(change < 0, -change, 0.0)
+        avg_gain = self._avg_gain[rows]
+        avg_loss = self._avg_loss[rows]
+
+        # first period - 1 changes are summed, then averaged at count == period
+        summing = (count > 0) & (count < period)
+        avg_gain = np.where(summing, avg_gain + gain, avg_gain)
+        avg_loss = np.where(summing, avg_loss + loss, avg_loss)
+        first = count == period
+        avg_gain = np.where(first, avg_gain / (period - 1), avg_gain)
+        avg_loss = np.where(first, avg_loss / (period - 1), avg_loss)
+        smoothing = count >= period
+        avg_gain = np.where(smoothing, (avg_gain * (period - 1) + gain) / period, avg_gain)
+        avg_loss = np.where(smoothing, (avg_loss * (period - 1) + loss) / period, avg_loss)
+
+        self._value[rows] = np.where(smoothing, self._rsi(avg_gain, avg_loss), np.nan)
+        self._avg_gain[rows] = avg_gain
+        self._avg_loss[rows] = avg_loss
+        self._previous[rows] = close
+        self._count[rows] = count + 1
+
+    def _update_windowed(self, rows: np.ndarray, close: np.ndarray) -> None:
+        """Update the given rows from their last `period + 1` closes."""
+        period = self.period
+        self._push("close", rows, close)
+        self._previous[rows] = close
+        self._count[rows] += 1
+        count = self._count[rows]
+        ready = count >= period + 1
+        self._value[rows[~ready]] = np.nan
+        if not ready.any():
+            return
+        rows, count = rows[ready], count[ready]
+        # the closes of each window, oldest first
+        order = (count[:, None] + np.arange(period + 1)) % (period + 1)
+        change = np.diff(self._windows["close"][rows[:, None], order], axis=1)
+        gain = np.where(change > 0, change, 0.0)
+        loss = np.where(change < 0, -change, 0.0)
+        # cumsum adds left to right, as the streaming indicator does
+        avg_gain = np.cumsum(gain[:, :-1], axis=1)[:, -1] / (period - 1)
+        avg_loss = np.cumsum(loss[:, :-1], axis=1)[:, -1] / (period - 1)
+        avg_gain = (avg_gain * (period - 1) + gain[:, -1]) / period
+        avg_loss = (avg_loss * (period - 1) + loss[:, -1]) / period
+        self._value[rows] = self._rsi(avg_gain, avg_loss)
+        self._avg_gain[rows] = avg_gain
+        self._avg_loss[rows] = avg_loss
+
+    @staticmethod
+    def _rsi(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+        """The RSI of the given average gains and losses."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            )
+
+    def _warmup(self, row, high, low, close) -> None:
+        n = len(close)
+        self._count[row] = n
+        if n == 0:
+            return
+        self._previous[row] = close[-1]
+        if self.is_windowed:
+            self._seed_window("close", row, close)
+            if n > self.period:
+                output, _, _ = kernels.rsi(close, self.period, self.period + 1)
+                self._value[row] = output[-1]
+            return
+        if n <= self.period:
+            # still summing the first changes
+            change = np.diff(close)
+            self._avg_gain[row] = sum(np.where(change > 0, change, 0.0).tolist())
+            self._avg_loss[row] = sum(np.where(change < 0, -change, 0.0).tolist())
+            return
+        output, avg_gain, avg_loss = kernels.rsi(close, self.period)
+        self._avg_gain[row] = avg_gain[-1]
+        self._avg_loss[row] = avg_loss[-1]
+        self._value[row] = output[-1]
+
+
+class STOCHBank(_WindowBank):
+    """Stochastic Oscillator (STOCH) for many symbols.
+
+    Args:
+        period (int): The period of the Stochastic Oscillator.
+        smoothing_period (int): The smoothing period of the Stochastic Oscillator.
+        name (str | None): The name of the indicator.
+        capacity (int): The initial number of symbols. Defaults to 64.
+    """
+
+    def __init__(
+        self,
+        period: int,
+        smoothing_period: int,
+        name: str | None = None,
+        capacity: int = 64,
+    ):
+        self.period = period
+        self.smoothing_period = smoothing_period
+        self._k = np.zeros(0)
+        name = name or f"STOCH_{period}_{smoothing_period}"
+        super().__init__(period, name, capacity)
+
+    @property
+    def warmup_length(self) -> int:
+        return self.period
+
+    params = property(
+        fget=lambda self: {
+            "period": self.period,
+            "smoothing_period": self.smoothing_period,
+        }
+    )
+
+    def _state_arrays(self) -> dict[str, np.ndarray]:
+        arrays = super()._state_arrays()
+        arrays.update(k=self._k)
+        return arrays
+
+    def _resize(self, capacity: int) -> None:
+        self._windows.setdefault("high", np.zeros((0, self.period)))
+        self._windows.setdefault("low", np.zeros((0, self.period)))
+        self._windows.setdefault("k", np.zeros((0, self.smoothing_period)))
+        self._k = self._grow(self._k, capacity)
+        super()._resize(capacity)
+
+    def _reset(self, rows: np.ndarray) -> None:
+        super()._reset(rows)
+        self._k[rows] = np.nan
+
+    def value(self, symbol: str) -> StochVal | None:
+        if not self.is_ready(symbol):
+            return None
+        row = self._index[symbol]
+        d = self._value[row]
+        return StochVal(float(self._k[row]), None if np.isnan(d) else float(d))
+
+    def _update(self, rows, high, low, close) -> None:
+        self._push("high", rows, high)
+        self._push("low", rows, low)
+        self._count[rows] += 1
+        count = self._count[rows]
+        ready = count >= self.period
+
+        window_high = self._windows["high"][rows]
+        window_low = self._windows["low"][rows]
+        max_high = window_high.max(axis=1)
+        min_low = window_low.min(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = np.where(
+                max_high == min_low, 100.0, 100.0 * (close - min_low) / (max_high - min_low)
+            )
+        self._k[rows] = np.where(ready, k, np.nan)
+
+        # %D is a recursive average of the last smoothing_period %K values
+        k_rows = rows[ready]
+        if len(k_rows) == 0:
+            return
+        smoothing = self.smoothing_period
+        k = k[ready]
+        n_k = count[ready] - self.period
+        window_k = self._windows["k"]
+        position = n_k % smoothing
+        oldest = window_k[k_rows, position]
+        window_k[k_rows, position] = k
+        d = self._value[k_rows] - (oldest - k) / float(smoothing)
+        first = n_k + 1 == smoothing
+        if first.any():
+            d[first] = self._sum(window_k[k_rows[first]]) / smoothing
+        self._value[k_rows] = np.where(n_k + 1 >= smoothing, d, np.nan)
+
+    def _warmup(self, row, high, low, close) -> None:
+        n = len(close)
+        self._count[row] = n
+        self._seed_window("high", row, high)
+        self._seed_window("low", row, low)
+        if n < self.period:
+            return
+        k, d = kernels.stoch(high, low, close, self.period, self.smoothing_period)
+        self._seed_window("k", row, k[self.period - 1 :])
+        self._k[row] = k[-1]
+        self._value[row] = d[-1]
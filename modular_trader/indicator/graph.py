@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from typing import Hashable, Iterable, Mapping
+
+from talipp.input import SamplingPeriodType
+from talipp.ohlcv import OHLCV
+
+from modular_trader.common.type_aliases import DateOrDatetime, RealNumber
+from modular_trader.indicator.technical.base import BaseIndicator
+
+
+def structure_key(indicator: BaseIndicator) -> Hashable:
+    """
+    Get the structural key of an indicator.
+
+    Two indicators with the same key compute the same values from the same
+    input: they have the same class, parameters, sampling period and cache
+    size, and structurally identical input indicators. The cache size is part
+    of the key because some indicators (e.g. RSI) compute from the values it
+    keeps visible. The name is not part of the key.
+
+    Args:
+        indicator (BaseIndicator): The indicator.
+
+    Returns:
+        Hashable: The structural key.
+    """
+    input_indicator = indicator.input_indicator
+    return (
+        type(indicator),
+        tuple(sorted(indicator.params.items())),
+        indicator.sampling_period,
+        indicator.cache_size,
+        structure_key(input_indicator) if input_indicator is not None else None,
+    )
+
+
+class _Node:
+    """Node of an indicator graph: one distinct indicator computation."""
+
+    __slots__ = ("prototype", "parent", "names")
+
+    def __init__(self, prototype: BaseIndicator, parent: Hashable | None):
+        self.prototype = prototype
+        self.parent = parent
+        self.names: list[str] = []
+
+
+class IndicatorGraph:
+    """Graph of indicators with shared subexpressions.
+
+    Indicators chained through `input_indicator` are merged into a graph in
+    which structurally identical nodes (see `structure_key`) appear once, so
+    that, for example, two SMAs of the same RSI(14) share a single RSI.
+    Indicators with different cache sizes are not merged: an RSI(14) used on
+    its own and one whose cache was grown by `calibrate_cache_size` as the
+    input of an SMA(20) compute different values.
+
+    The graph is built once from prototype indicators and instantiated for
+    every symbol with `instantiate`.
+
+    Attributes:
+        names (list[str]): The names of the indicators in the graph.
+        size (int): The number of distinct nodes.
+    """
+
+    def __init__(self, indicators: Iterable[BaseIndicator]):
+        """
+        Build the graph from prototype indicators.
+
+        Args:
+            indicators (Iterable[BaseIndicator]): The prototype indicators.
+                Their input indicators are included in the graph.
+        """
+        # insertion order is a topological order: inputs come before consumers
+        self._nodes: dict[Hashable, _Node] = {}
+        self._outputs: dict[str, Hashable] = {}
+        for indicator in indicators:
+            if indicator.name in self._outputs:
+                raise ValueError(f"Duplicate indicator name: {indicator.name}")
+            key = self._add(indicator)
+            self._nodes[key].names.append(indicator.name)
+            self._outputs[indicator.name] = key
+
+    names = property(fget=lambda self: list(self._outputs.keys()))
+    size = property(fget=lambda self: len(self._nodes))
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}"
+            f"(indicators={len(self._outputs)}, nodes={len(self._nodes)})"
+        )
+
+    def _add(self, indicator: BaseIndicator) -> Hashable:
+        """Add an indicator and its inputs, and return its key."""
+        parent = None
+        if indicator.input_indicator is not None:
+            parent = self._add(indicator.input_indicator)
+        key = structure_key(indicator)
+        if key not in self._nodes:
+            self._nodes[key] = _Node(indicator, parent)
+        return key
+
+    def instantiate(self) -> IndicatorGraphInstance:
+        """
+        Create fresh indicators for one symbol.
+
+        Nodes are created in topological order, so that every indicator is
+        constructed with its already created input indicator.
+
+        Returns:
+            IndicatorGraphInstance: The indicators of the symbol.
+        """
+        created: dict[Hashable, BaseIndicator] = {}
+        for key, node in self._nodes.items():
+            created[key] = node.prototype.spawn(
+                input_indicator=created.get(node.parent, None),
+                cache_size=node.prototype.cache_size,
+                name=node.names[0] if node.names else None,
+            )
+        roots = [created[k] for k, n in self._nodes.items() if n.parent is None]
+        indicators = {name: created[key] for name, key in self._outputs.items()}
+        return IndicatorGraphInstance(indicators, roots)
+
+
+class IndicatorGraphInstance:
+    """Indicators of one symbol, created from an `IndicatorGraph`.
+
+    Only the root indicators are fed; every other indicator receives its values
+    from its input indicator, so each node is computed once per bar.
+
+    Attributes:
+        indicators (dict[str, BaseIndicator]): The indicators by name. Merged
+            indicators share the same object under each of their names.
+        roots (list[BaseIndicator]): The indicators that ingest bars.
+    """
+
+    __slots__ = ("indicators", "roots")
+
+    def __init__(
+        self, indicators: Mapping[str, BaseIndicator], roots: list[BaseIndicator]
+    ):
+        self.indicators = dict(indicators)
+        self.roots = roots
+
+    @property
+    def is_ready(self) -> bool:
+        """Check if all indicators have calculated a value."""
+        return all(indicator.is_ready for indicator in self.indicators.values())
+
+    def ingest_scalar(
+        self,
+        open: RealNumber | None = None,
+        high: RealNumber | None = None,
+        low: RealNumber | None = None,
+        close: RealNumber | None = None,
+        volume: RealNumber | None = None,
+        timestamp: DateOrDatetime | None = None,
+    ) -> None:
+        """
+        Ingest the values of a single bar into the root indicators.
+
+        Args:
+            open: The open price.
+            high: The high price.
+            low: The low price.
+            close: The close price.
+            volume: The volume.
+            timestamp: The timestamp.
+        """
+        self.ingest_ohlcv(OHLCV(open, high, low, close, volume, timestamp))
+
+    def ingest_ohlcv(
+        self,
+        ohlcv: OHLCV,
+        resampled: Mapping[SamplingPeriodType, OHLCV] | None = None,
+    ) -> None:
+        """
+        Ingest a single bar into the root indicators, through
+        `BaseIndicator.ingest_ohlcv`, so lazy roots buffer it.
+
+        Args:
+            ohlcv (OHLCV): The bar, shared by all root indicators.
+            resampled (Mapping[SamplingPeriodType, OHLCV] | None): The bar of
+                each longer timeframe, ingested instead by the roots sampled
+                with that timeframe.
+        """
+        for root in self.roots:
+            if resampled and root.sampling_period in resampled:
+                root.ingest_ohlcv(resampled[root.sampling_period])
+            else:
+                root.ingest_ohlcv(ohlcv)
+
+    def ingest_batch(
+        self,
+        resampled: Mapping[SamplingPeriodType | None, Mapping] | None = None,
+        **kwargs,
+    ) -> None:
+        """
+        Ingest a batch of values into the root indicators.
+
+        Roots whose dependent indicators are all ready are skipped.
+
+        Args:
+            resampled (Mapping[SamplingPeriodType | None, Mapping] | None): The
+                columns of each longer timeframe, ingested instead by the roots
+                sampled with that timeframe.
+            **kwargs: The columns passed to `BaseIndicator.ingest_batch`.
+        """
+        pending = {
+            id(self._root(indicator))
+            for indicator in self.indicators.values()
+            if not indicator.is_ready
+        }
+        for root in self.roots:
+            if id(root) not in pending:
+                continue
+            if resampled and root.sampling_period in resampled:
+                root.ingest_batch(**resampled[root.sampling_period])
+            else:
+                root.ingest_batch(**kwargs)
+
+    @staticmethod
+    def _root(indicator: BaseIndicator) -> BaseIndicator:
+        """Get the root of the input chain of an indicator."""
+        while indicator.input_indicator is not None:
+            indicator = indicator.input_indicator
+        return indicator
@@ -1,27 +1,45 @@
 from __future__ import annotations
 
 import enum
+import math
+import os
+import tempfile
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 # from datetime import datetime
-from typing import TYPE_CHECKING, Generator, Mapping
+from typing import TYPE_CHECKING, Any, Generator, Iterable, Mapping
 
+import numpy as np
+import pandas as pd
 import pendulum
-from benedict import benedict
 from pydantic import ConfigDict, Field
 from pydantic.dataclasses import dataclass
-
+from talipp.input import SamplingPeriodType
+from talipp.ohlcv import OHLCV
+
+from modular_trader.common.constants import DEFAULT_SNAPSHOT_PATH
+from modular_trader.indicator.bank import BankIndicator, IndicatorBank
+from modular_trader.indicator.graph import IndicatorGraph, IndicatorGraphInstance
+from modular_trader.indicator.handler.parallel import SharedHistory, warmup_shard
+from modular_trader.indicator.registry import IndicatorHistory, IndicatorRegistry
+from modular_trader.indicator.resample import BarResampler, ResampledBar
+from modular_trader.indicator.snapshot import (
+    IndicatorSnapshot,
+    read_snapshot,
+    write_snapshot,
+)
 from modular_trader.indicator.technical.base import BaseIndicator
 
 from .base import BaseIndicatorHandler
 
 if TYPE_CHECKING:
-    import pandas as pd
     from alpaca.data.models.bars import Bar
 
     from modular_trader.universe import AssetUniverse
 
 STALE_DURATION = pendulum.duration(hours=1)
+COLUMNS = ["open", "high", "low", "close", "volume"]
 
 
 class Frequency(enum.Enum):
@@ -38,6 +56,12 @@ class Frequency(enum.Enum):
     DAY = enum.auto()
 
 
+FREQUENCY_SECONDS = {
+    Frequency.MINUTE: 60,
+    Frequency.DAY: 24 * 60 * 60,
+}
+
+
 @dataclass(config=ConfigDict(arbitrary_types_allowed=True, extra="forbid"))
 class AlpacaIndicatorHandler(BaseIndicatorHandler):
     """
@@ -47,24 +71,101 @@ class AlpacaIndicatorHandler(BaseIndicatorHandler):
 
     Attributes:
         indicators (list[BaseIndicator]):
-            The list of indicators to be used.
+            The list of indicators to be used. An indicator whose input chain
+            starts with an indicator sampled over a longer period than the
+            frequency (e.g. `sampling_period=SamplingPeriodType.DAY_1` with
+            minute bars) ingests the bars of that period, built from the
+            incoming bars by a `BarResampler`.
         frequency (Frequency):
-            The frequency of the indicator handler.
+            The frequency of the indicator handler, i.e. of the incoming bars.
         warmup_length (int | None):
-            The length of the warmup period. If None, it is set to the maximum
-            cache size of the indicators.
-        _attached_indicators (benedict):
-            The dictionary of attached indicators. The keys are the symbol names
-            and the values are the indicator objects.
+            The length of the warmup period, in bars of the frequency. If None,
+            it is set to the maximum cache size of the indicators (converted to
+            bars of the frequency for resampled indicators) and warmup length
+            of the banks.
+        minutes_per_day (float):
+            The number of minute bars in a day, used to size the warmup of
+            indicators sampled daily from minute bars. Defaults to the regular
+            US equity session; use 24 * 60 for crypto.
+        banks (list[IndicatorBank]):
+            The list of indicator banks to be used. A bank computes one
+            indicator for all symbols at once, as an alternative to per-symbol
+            copies of the indicators.
+        deduplicate (bool):
+            If True, the indicators are merged into an `IndicatorGraph` and
+            structurally identical indicators (including shared input
+            indicators) are computed once per bar per symbol.
+        warmup_workers (int | None):
+            The number of processes the warmup of the indicators is sharded
+            across, by symbol. The history is shared with the workers through
+            shared memory and the warm indicators are sent back as snapshots.
+            1 warms up in this process, None uses all CPUs. Banks are always
+            warmed up in this process.
+        _attached_indicators (IndicatorRegistry):
+            The attached indicators, by symbol and name.
+        _pending_bars (dict[str, Bar]):
+            The bars of the current timestamp, not yet applied to the banks.
+        _graph (IndicatorGraph | None):
+            The indicator graph, if deduplicate is True.
+        _graph_instances (dict[str, IndicatorGraphInstance]):
+            The indicators of each symbol created from the graph.
+        _last_timestamps (dict[str, datetime]):
+            The time of the last bar ingested for each symbol.
+        _snapshot (IndicatorSnapshot | None):
+            The loaded snapshot, used to restore the indicators of added symbols.
+        _catch_up_symbols (set[str]):
+            The symbols restored from the snapshot that have not caught up yet.
+        _timeframes (dict[str, SamplingPeriodType | None]):
+            The timeframe of the bars ingested by each indicator, by name. None
+            means the bars of the frequency.
+        _resamplers (dict[SamplingPeriodType, BarResampler]):
+            The resampler of each timeframe longer than the frequency.
+        _not_ready (dict[str, int]):
+            The number of indicators (bank rows included) that are not ready,
+            for each symbol that has any. Updated when indicators are attached,
+            removed or fed, so that `is_warmup` is O(1).
+        _not_ready_count (int):
+            The total number of indicators that are not ready.
     """
 
     indicators: list[BaseIndicator] = Field(default_factory=list)
     frequency: Frequency = Field(default=Frequency.DAY)
     warmup_length: int | None = Field(default=None)
-    _attached_indicators: benedict = Field(default_factory=lambda: benedict())
+    banks: list[IndicatorBank] = Field(default_factory=list)
+    deduplicate: bool = Field(default=False)
+    minutes_per_day: float = Field(default=6.5 * 60)
+    warmup_workers: int | None = Field(default=1)
+    _attached_indicators: IndicatorRegistry = Field(default_factory=IndicatorRegistry)
+    _pending_bars: dict[str, Any] = Field(default_factory=dict)
+    _graph: IndicatorGraph | None = Field(default=None)
+    _graph_instances: dict[str, IndicatorGraphInstance] = Field(default_factory=dict)
+    _last_timestamps: dict[str, Any] = Field(default_factory=dict)
+    _snapshot: IndicatorSnapshot | None = Field(default=None)
+    _catch_up_symbols: set[str] = Field(default_factory=set)
+    _timeframes: dict[str, Any] = Field(default_factory=dict)
+    _resamplers: dict[Any, BarResampler] = Field(default_factory=dict)
+    _not_ready: dict[str, int] = Field(default_factory=dict)
+    _not_ready_count: int = Field(default=0)
 
     attached_indicators = property(fget=lambda self: self._attached_indicators)
-    symbols = property(fget=lambda self: list(self._attached_indicators.keys()))
+    not_ready_symbols = property(
+        fget=lambda self: self._not_ready.keys(),
+        doc="The symbols that have indicators that are not ready, as a set view.",
+    )
+    not_ready_count = property(
+        fget=lambda self: self._not_ready_count,
+        doc="The number of indicators that are not ready.",
+    )
+    symbols = property(
+        fget=lambda self: list(
+            dict.fromkeys(
+                [
+                    *self._attached_indicators.keys(),
+                    *(s for bank in self.banks for s in bank.symbols),
+                ]
+            )
+        )
+    )
 
     # save to Context
     # dict[symbol, dict[name, indicator]]
@@ -75,9 +176,64 @@ class AlpacaIndicatorHandler(BaseIndicatorHandler):
         Find the minimum cache size of the indicators and use it to set the warmup
         length. If warmup_length is already set, it is not changed.
         """
+        self._timeframes = {x.name: self._timeframe(x) for x in self.indicators}
+        # known to `history` before any symbol is attached
+        for name in self._timeframes:
+            self._attached_indicators.add_name(name)
+        self._resamplers = {
+            timeframe: BarResampler(timeframe)
+            for timeframe in self._timeframes.values()
+            if timeframe is not None
+        }
         self.warmup_length = self.warmup_length or max(
-            [x.cache_size for x in self.indicators]
+            [
+                math.ceil(
+                    x.cache_size * self._bars_per_period(self._timeframes[x.name])
+                )
+                for x in self.indicators
+            ]
+            + [x.warmup_length for x in self.banks]
         )
+        if self.deduplicate:
+            self._graph = IndicatorGraph(self.indicators)
+
+    def _timeframe(self, indicator: BaseIndicator) -> SamplingPeriodType | None:
+        """
+        Get the timeframe of the bars ingested by an indicator.
+
+        Args:
+            indicator (BaseIndicator): The indicator.
+
+        Returns:
+            SamplingPeriodType | None: The sampling period of the root of the
+                input chain if it is longer than the frequency, otherwise None.
+        """
+        while indicator.input_indicator is not None:
+            indicator = indicator.input_indicator
+        timeframe = indicator.sampling_period
+        if timeframe is None:
+            return None
+        span = BarResampler(timeframe).span.total_seconds()
+        return timeframe if span > FREQUENCY_SECONDS[self.frequency] else None
+
+    def _bars_per_period(self, timeframe: SamplingPeriodType | None) -> float:
+        """
+        Get the number of bars of the frequency in a period of the timeframe.
+
+        Args:
+            timeframe (SamplingPeriodType | None): The timeframe.
+
+        Returns:
+            float: The number of bars, 1 for the frequency itself.
+        """
+        if timeframe is None:
+            return 1
+        span = BarResampler(timeframe).span.total_seconds()
+        bars = span / FREQUENCY_SECONDS[self.frequency]
+        if self.frequency == Frequency.MINUTE and span >= 24 * 60 * 60:
+            # only the trading minutes of each day have a bar
+            bars *= self.minutes_per_day / (24 * 60)
+        return bars
 
     def __iter__(self) -> Generator[BaseIndicator, None, None]:
         """
@@ -102,17 +258,44 @@ class AlpacaIndicatorHandler(BaseIndicatorHandler):
         """
         Check if the warmup period is finished.
 
+        The readiness of the indicators is tracked as they are fed, so this
+        does not check every indicator.
+
         Returns:
             bool: True if the warmup period is finished, False otherwise.
         """
-        return all(
-            indicator.is_ready
-            for indicator in self._attached_indicators.flatten().values()
-        )
+        self.flush()
+        return self._not_ready_count == 0
+
+    def _refresh_readiness(self, symbols: Iterable[str]) -> None:
+        """
+        Count again the indicators of the given symbols that are not ready.
+
+        Args:
+            symbols (Iterable[str]): The symbols whose indicators were attached,
+                removed or fed.
+
+        Returns:
+            None
+        """
+        for symbol in symbols:
+            indicators = self._attached_indicators.get(symbol, {})
+            count = sum(not x.is_ready for x in indicators.values())
+            count += sum(
+                not bank.is_ready(symbol) for bank in self.banks if symbol in bank
+            )
+            self._not_ready_count += count - self._not_ready.pop(symbol, 0)
+            if count:
+                self._not_ready[symbol] = count
 
     def get(
         self, symbol: str, name: str | None = None
-    ) -> BaseIndicator | Mapping[str, BaseIndicator] | None:
+    ) -> (
+        BaseIndicator
+        | BankIndicator
+        | Mapping[str, BaseIndicator | BankIndicator]
+        | None
+    ):
         """
         Get the indicator(s) by symbol and name.
 
@@ -122,14 +305,63 @@ class AlpacaIndicatorHandler(BaseIndicatorHandler):
                 indicators for the symbol.
 
         Returns:
-            BaseIndicator | Mapping[str, BaseIndicator] | None: The indicator or
-                all indicators for the symbol if name is None. If the symbol or
-                indicator is not found, it returns None.
+            BaseIndicator | BankIndicator | Mapping[str, BaseIndicator | BankIndicator] | None:
+                The indicator or all indicators for the symbol if name is None.
+                Indicators computed by a bank are returned as a `BankIndicator`
+                view. If the symbol or indicator is not found, it returns None.
         """
-        symbol_indicators = self.attached_indicators.get(symbol, None)
+        self.flush()
+        if symbol and name:
+            indicator = self._attached_indicators.indicator(symbol, name)
+            if indicator is not None or not self.banks:
+                return indicator
+        symbol_indicators = self._attached_indicators.get(symbol, None)
+        if not self.banks:
+            return symbol_indicators
+
+        banked = {
+            bank.name: bank.get(symbol) for bank in self.banks if symbol in bank
+        }
         if symbol and name:
-            return symbol_indicators.get(name, None)
-        return symbol_indicators
+            return banked.get(name, None)
+        if symbol_indicators is None and not banked:
+            return None
+        return {**(symbol_indicators or {}), **banked}
+
+    def history(
+        self,
+        name: str,
+        length: int = 1,
+        field: str | None = None,
+        symbols: Iterable[str] | None = None,
+    ) -> IndicatorHistory:
+        """
+        Get the last output values of an indicator across the universe.
+
+        Cross-sectional strategies read the indicator of every symbol in one
+        call, as a dense (symbols, length) array, instead of one `get` per
+        symbol. Indicators computed by banks only keep their current value and
+        are not included.
+
+        Args:
+            name (str): The indicator name.
+            length (int): The number of values per symbol.
+            field (str | None): The field of the output values to read, for
+                indicators whose values are dataclasses (e.g. "k" of STOCH).
+            symbols (Iterable[str] | None): The symbols, in row order. Defaults
+                to all symbols with attached indicators.
+
+        Returns:
+            IndicatorHistory: The values, aligned on the last column, and the
+                time of the last value of each symbol.
+
+        Raises:
+            KeyError: If no indicator has the name, e.g. a bank indicator.
+        """
+        self.flush()
+        return self._attached_indicators.history(
+            name, length, field, None if symbols is None else list(symbols)
+        )
 
     def init_indicator(self, universe: AssetUniverse) -> None:
         # add indicators for added symbol
@@ -143,17 +375,55 @@ class AlpacaIndicatorHandler(BaseIndicatorHandler):
         Returns:
             None
         """
+        created: list[str] = []
         symbol: str
         for symbol in universe.added:
+            if symbol not in self._attached_indicators:
+                created.append(symbol)
+            if self._graph is not None:
+                self._init_graph_indicator(symbol)
+                continue
             indicator: BaseIndicator
             for indicator in self.indicators:
-                key: str = f"{symbol}.{indicator.name}"
-                if key in self._attached_indicators:
+                if self._attached_indicators.indicator(symbol, indicator.name):
                     continue
-                self._attached_indicators[key] = indicator.copy()
+                self._attached_indicators.add(symbol, indicator.name, indicator.spawn())
+
+        bank: IndicatorBank
+        for bank in self.banks:
+            created.extend(s for s in universe.added if s not in bank)
+            bank.add(universe.added)
+            bank.remove(universe.removed)
 
         # remove indicators for removed symbol
-        self._attached_indicators.remove(list(universe.removed))
+        self._attached_indicators.remove(universe.removed)
+        for resampler in self._resamplers.values():
+            resampler.remove(universe.removed)
+        for symbol in universe.removed:
+            self._graph_instances.pop(symbol, None)
+            self._last_timestamps.pop(symbol, None)
+            self._catch_up_symbols.discard(symbol)
+
+        if self._snapshot is not None:
+            self._restore(dict.fromkeys(created))
+        self._refresh_readiness([*created, *universe.removed])
+
+    def _init_graph_indicator(self, symbol: str) -> None:
+        """
+        Create the indicators of a symbol from the indicator graph.
+
+        Args:
+            symbol (str): The symbol name.
+
+        Returns:
+            None
+        """
+        if symbol in self._graph_instances:
+            return
+        instance = self._graph.instantiate()
+        self._graph_instances[symbol] = instance
+        for name, indicator in instance.indicators.items():
+            self._attached_indicators.add(symbol, name, indicator)
 
     def warmup(self, data: pd.DataFrame) -> None:
         # data -> MultiIndex [symbol, ...]
@@ -169,21 +439,176 @@ class AlpacaIndicatorHandler(BaseIndicatorHandler):
             None
         """
         data_symbols: list[str] = data.index.get_level_values(0).unique().to_list()
-        symbol: str
-        for symbol, it in self.attached_indicators.items():
+        index = data.index.to_frame(index=False)
+        last_timestamps = index.groupby(index.columns[0])[index.columns[1]].max()
+        for symbol, timestamp in last_timestamps.items():
+            if symbol not in self._last_timestamps:
+                self._last_timestamps[symbol] = timestamp
+
+        symbols: list[str] = []
+        for symbol in self.attached_indicators.keys():
+            if symbol not in self._not_ready:
+                continue
             if symbol not in data_symbols:
                 warnings.warn(f"Warm up indicator: {symbol} is not found in data.")
                 continue
+            symbols.append(symbol)
+        workers = min(self.warmup_workers or os.cpu_count() or 1, len(symbols))
+        if workers > 1:
+            self._warmup_parallel(data, symbols, workers)
+            columns = None
+        else:
+            columns = self._warmup_symbols(data, symbols)
+
+        bank: IndicatorBank
+        for bank in self.banks:
+            for symbol in bank.symbols:
+                if symbol not in self._not_ready or bank.is_ready(symbol):
+                    continue
+                if symbol not in data_symbols:
+                    warnings.warn(f"Warm up bank: {symbol} is not found in data.")
+                    continue
+                columns = columns or self._group_columns(data)
+                bank.warmup(symbol, **{k: columns[symbol][k] for k in COLUMNS})
+        self._refresh_readiness(list(self._not_ready))
+
+    @staticmethod
+    def _group_columns(data: pd.DataFrame) -> dict[str, dict[str, Any]]:
+        """
+        Group historical data by symbol into contiguous columns.
+
+        Each column is converted to a float64 array once, with the rows
+        grouped by symbol, and every symbol gets views of its rows instead of
+        copies. The timestamps are kept as an index backed by int64
+        nanoseconds; only the indicators that store them convert them to
+        datetimes.
+
+        Args:
+            data (pd.DataFrame): The historical data, with a MultiIndex
+                [symbol, timestamp] and open, high, low, close and volume
+                columns.
+
+        Returns:
+            dict[str, dict[str, Any]]: The open, high, low, close, volume and
+                timestamp columns of each symbol, in the order of the data.
+        """
+        codes, symbols = pd.factorize(data.index.get_level_values(0))
+        timestamps = data.index.get_level_values(1)
+        arrays = {k: data[k].to_numpy(dtype=np.float64) for k in COLUMNS}
+        # codes follow the order of first appearance, so they only decrease
+        # when the rows of a symbol are not contiguous
+        if len(codes) > 1 and (np.diff(codes) < 0).any():
+            order = np.argsort(codes, kind="stable")
+            arrays = {k: v[order] for k, v in arrays.items()}
+            timestamps = timestamps[order]
+        arrays["timestamp"] = timestamps
+        stops = np.cumsum(np.bincount(codes, minlength=len(symbols))).tolist()
+        starts = [0, *stops[:-1]]
+        return {
+            symbol: {k: v[start:stop] for k, v in arrays.items()}
+            for symbol, start, stop in zip(symbols, starts, stops)
+        }
+
+    def _warmup_symbols(
+        self, data: pd.DataFrame, symbols: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Warm up the attached indicators of the given symbols in this process.
+
+        Args:
+            data (pd.DataFrame): The historical data, with a MultiIndex
+                [symbol, timestamp].
+            symbols (list[str]): The symbols to warm up, all present in data.
+
+        Returns:
+            dict[str, dict[str, Any]]: The columns of each symbol in data, as
+                returned by `_group_columns`.
+        """
+        grouped = {None: self._group_columns(data)}
+        # bars of the longer timeframes, the last period of each symbol goes on
+        # with the incoming bars
+        for timeframe, resampler in self._resamplers.items():
+            frame = resampler.resample(data)
+            resampler.seed(frame)
+            grouped[timeframe] = self._group_columns(frame)
+
+        symbol: str
+        for symbol in symbols:
+            columns = {timeframe: x[symbol] for timeframe, x in grouped.items()}
+            instance = self._graph_instances.get(symbol, None)
+            if instance is not None:
+                if not instance.is_ready:
+                    instance.ingest_batch(resampled=columns, **columns[None])
+                continue
             indicator: BaseIndicator
-            for indicator in it.values():
+            for name, indicator in self.attached_indicators[symbol].items():
                 if indicator.is_ready:
                     continue
-                intput_data = (
-                    data.loc[symbol, ["open", "high", "low", "close", "volume"]]
-                    .reset_index()
-                    .to_dict("list")
-                )
-                indicator.ingest(**intput_data)
+                indicator.ingest_batch(**columns[self._timeframes.get(name, None)])
+        return grouped[None]
+
+    def _warmup_parallel(
+        self, data: pd.DataFrame, symbols: list[str], workers: int
+    ) -> None:
+        """
+        Warm up the attached indicators of the given symbols across a process
+        pool.
+
+        The symbols are split into one shard per worker with about the same
+        number of bars. Each worker warms up fresh indicators of its shard and
+        writes them as a snapshot, which is restored into the indicators that
+        are not ready yet.
+
+        Args:
+            data (pd.DataFrame): The historical data, with a MultiIndex
+                [symbol, timestamp].
+            symbols (list[str]): The symbols to warm up, all present in data.
+            workers (int): The number of worker processes.
+
+        Returns:
+            None
+        """
+        params = {
+            "indicators": self.indicators,
+            "frequency": self.frequency,
+            "warmup_length": self.warmup_length,
+            "deduplicate": self.deduplicate,
+            "minutes_per_day": self.minutes_per_day,
+        }
+        with (
+            SharedHistory(data, symbols) as history,
+            tempfile.TemporaryDirectory() as directory,
+            ProcessPoolExecutor(max_workers=workers) as executor,
+        ):
+            # contiguous shards of about the same number of bars
+            stops = np.array([stop for _, stop in history.offsets.values()])
+            bounds = np.searchsorted(
+                stops, np.linspace(0, history.spec["rows"], workers + 1)[1:-1]
+            )
+            shards = [
+                {s: history.offsets[s] for s in shard}
+                for shard in np.split(np.array(symbols, dtype=object), bounds)
+                if len(shard)
+            ]
+            paths = [os.path.join(directory, f"{i}.snap") for i in range(len(shards))]
+            futures = [
+                executor.submit(warmup_shard, params, history.spec, shard, path)
+                for shard, path in zip(shards, paths)
+            ]
+            for future, shard, path in zip(futures, shards, paths):
+                bars = future.result()
+                for timeframe, resampler in self._resamplers.items():
+                    resampler.seed_bars(bars.get(timeframe, []))
+                snapshot = read_snapshot(path)
+                for symbol in shard:
+                    instance = self._graph_instances.get(symbol, None)
+                    if instance is not None and instance.is_ready:
+                        continue
+                    for indicator in self.attached_indicators[symbol].values():
+                        if instance is None and indicator.is_ready:
+                            continue
+                        snapshot.restore(symbol, indicator)
+                del snapshot
 
     def update(self, bar: Bar) -> None:
         # if TimePeriod.MINUTE -> update in subscribe (minute) bars
@@ -197,18 +622,246 @@ class AlpacaIndicatorHandler(BaseIndicatorHandler):
         Returns:
             None
         """
+        if self.banks:
+            self._stage(bar)
         indicators = self.attached_indicators.get(bar.symbol, None)
-        if indicators is None:
+        if indicators is None and not any(bar.symbol in bank for bank in self.banks):
             warnings.warn(
                 f"Update indicator: indicators for {bar.symbol} is not available."
             )
             return
-        for indicator in indicators.values():
-            indicator.ingest(
-                open=bar.open,
-                high=bar.high,
-                low=bar.low,
-                close=bar.close,
-                volume=bar.volume,
-                timestamp=bar.timestamp,
+        self._last_timestamps[bar.symbol] = bar.timestamp
+        if indicators is not None:
+            self._ingest_bar(
+                bar.symbol,
+                bar.open,
+                bar.high,
+                bar.low,
+                bar.close,
+                bar.volume,
+                bar.timestamp,
+            )
+            if bar.symbol in self._not_ready:
+                self._refresh_readiness([bar.symbol])
+
+    def _ingest_bar(self, symbol: str, *values) -> None:
+        """
+        Ingest one bar into the attached indicators of a symbol.
+
+        The bar is built once as an OHLCV object and shared by all indicators.
+        It is also added to the bar of each longer timeframe, which is ingested
+        by the indicators of that timeframe.
+
+        Args:
+            symbol (str): The symbol name.
+            *values: The open, high, low, close, volume and timestamp of the bar.
+
+        Returns:
+            None
+        """
+        ohlcv = OHLCV(*values)
+        resampled = None
+        if self._resamplers:
+            resampled = {
+                timeframe: self._as_ohlcv(resampler.update_ohlcv(symbol, ohlcv))
+                for timeframe, resampler in self._resamplers.items()
+            }
+        instance = self._graph_instances.get(symbol, None)
+        if instance is not None:
+            return instance.ingest_ohlcv(ohlcv, resampled)
+        for name, indicator in self.attached_indicators.get(symbol, {}).items():
+            timeframe = self._timeframes.get(name, None)
+            indicator.ingest_ohlcv(ohlcv if timeframe is None else resampled[timeframe])
+
+    @staticmethod
+    def _as_ohlcv(bar: ResampledBar) -> OHLCV:
+        """Convert a resampled bar into an OHLCV object."""
+        return OHLCV(bar.open, bar.high, bar.low, bar.close, bar.volume, bar.timestamp)
+
+    def flush(self) -> None:
+        """
+        Apply the pending bars to the banks.
+
+        All symbols that printed a bar at the pending timestamp are updated in
+        one vectorized step per bank.
+
+        Returns:
+            None
+        """
+        if not self._pending_bars:
+            return
+        bars = list(self._pending_bars.values())
+        self._pending_bars.clear()
+        columns = {
+            field: [getattr(bar, field) for bar in bars]
+            for field in ("open", "high", "low", "close", "volume")
+        }
+        bank: IndicatorBank
+        for bank in self.banks:
+            included = [i for i, bar in enumerate(bars) if bar.symbol in bank]
+            if len(included) == len(bars):
+                bank.update([bar.symbol for bar in bars], **columns)
+                continue
+            bank.update(
+                [bars[i].symbol for i in included],
+                **{k: [v[i] for i in included] for k, v in columns.items()},
             )
+        if self._not_ready:
+            self._refresh_readiness(
+                [bar.symbol for bar in bars if bar.symbol in self._not_ready]
+            )
+
+    def _stage(self, bar: Bar) -> None:
+        """
+        Add a bar to the pending bars of its timestamp. The pending bars are
+        flushed first when the bar starts a new timestamp, or when the symbol
+        already has a pending bar.
+
+        Args:
+            bar (Bar): The bar to stage.
+
+        Returns:
+            None
+        """
+        pending = next(iter(self._pending_bars.values()), None)
+        if pending is not None and (
+            pending.timestamp != bar.timestamp or bar.symbol in self._pending_bars
+        ):
+            self.flush()
+        self._pending_bars[bar.symbol] = bar
+
+    catch_up_symbols = property(fget=lambda self: sorted(self._catch_up_symbols))
+
+    @property
+    def catch_up_timestamp(self) -> Any | None:
+        """
+        Get the time from which the symbols restored from the snapshot must
+        catch up.
+
+        Returns:
+            datetime | None: The earliest time of the last bar ingested by the
+                restored symbols, or None if there is nothing to catch up. With
+                resampled indicators, it is the start of the period of that
+                bar, so that the bar of the period can be built again.
+        """
+        timestamps = [
+            self._catch_up_start(self._last_timestamps[s])
+            for s in self._catch_up_symbols
+            if s in self._last_timestamps
+        ]
+        return min(timestamps) if timestamps else None
+
+    def _catch_up_start(self, timestamp: Any) -> Any:
+        """
+        Get the time of the first bar needed to catch up after a given bar.
+
+        Args:
+            timestamp (datetime): The time of the last ingested bar.
+
+        Returns:
+            datetime: The start of the longest period containing the timestamp.
+        """
+        starts = [r.period_start(timestamp) for r in self._resamplers.values()]
+        return min([timestamp, *starts])
+
+    def save_snapshot(self, path: os.PathLike = DEFAULT_SNAPSHOT_PATH) -> None:
+        """
+        Save the state of the attached indicators and banks to a snapshot file.
+
+        Args:
+            path (os.PathLike): The path of the snapshot file.
+
+        Returns:
+            None
+        """
+        self.flush()
+        write_snapshot(
+            path,
+            (
+                (symbol, indicator)
+                for symbol, _, indicator in self._attached_indicators.indicators()
+            ),
+            self.banks,
+            self._last_timestamps,
+        )
+
+    def load_snapshot(self, path: os.PathLike = DEFAULT_SNAPSHOT_PATH) -> None:
+        """
+        Load a snapshot file.
+
+        The indicators of symbols already attached are restored now, those of
+        symbols added later are restored by `init_indicator`. Indicators whose
+        configuration differs from the snapshot are not restored.
+
+        Args:
+            path (os.PathLike): The path of the snapshot file.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version.
+        """
+        self._snapshot = read_snapshot(path)
+        self._restore(self.symbols)
+
+    def _restore(self, symbols: Iterable[str]) -> None:
+        """
+        Restore the indicators of the given symbols from the loaded snapshot.
+
+        Args:
+            symbols (Iterable[str]): The symbols to restore.
+
+        Returns:
+            None
+        """
+        restored: set[str] = set()
+        for symbol in symbols:
+            if symbol not in self._snapshot.timestamps:
+                continue
+            for indicator in self.attached_indicators.get(symbol, {}).values():
+                if self._snapshot.restore(symbol, indicator):
+                    restored.add(symbol)
+        bank: IndicatorBank
+        for bank in self.banks:
+            restored.update(self._snapshot.restore_bank(bank, symbols))
+
+        for symbol in restored:
+            self._last_timestamps[symbol] = self._snapshot.timestamps[symbol]
+            self._catch_up_symbols.add(symbol)
+        self._refresh_readiness(restored)
+
+    def catch_up(self, data: pd.DataFrame) -> None:
+        """
+        Ingest the bars newer than the snapshot for the restored symbols.
+
+        Args:
+            data (pd.DataFrame): The historical data since the snapshot. The
+                DataFrame should have a MultiIndex [symbol, timestamp].
+
+        Returns:
+            None
+        """
+        self.flush()
+        data_symbols = set(data.index.get_level_values(0))
+        for symbol in list(self._catch_up_symbols):
+            self._catch_up_symbols.discard(symbol)
+            if symbol not in data_symbols:
+                continue
+            last = self._last_timestamps.get(symbol, None)
+            frame = data.loc[symbol, ["open", "high", "low", "close", "volume"]]
+            if last is not None:
+                frame = frame[frame.index >= self._catch_up_start(last)]
+            banks = [bank for bank in self.banks if symbol in bank]
+            for timestamp, o, h, lo, c, v in frame.itertuples():
+                if last is not None and timestamp <= last:
+                    # already ingested, only rebuilds the bar of its period
+                    for resampler in self._resamplers.values():
+                        resampler.update(symbol, o, h, lo, c, v, timestamp)
+                    continue
+                self._ingest_bar(symbol, o, h, lo, c, v, timestamp)
+                for bank in banks:
+                    bank.update([symbol], [o], [h], [lo], [c], [v])
+                self._last_timestamps[symbol] = timestamp
+            if symbol in self._not_ready:
+                self._refresh_readiness([symbol])
@@ -0,0 +1,170 @@
+"""Warm up indicators across a process pool.
+
+The history is copied once into shared memory, grouped by symbol, and split
+into shards of symbols. Each worker rebuilds the frame of its shard from the
+shared memory, warms up fresh indicators with it and writes their state as an
+indicator snapshot, which the parent process restores into its indicators.
+"""
+
+from __future__ import annotations
+
+import os
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from modular_trader.indicator.snapshot import write_snapshot
+
+if TYPE_CHECKING:
+    from talipp.input import SamplingPeriodType
+
+    from modular_trader.indicator.resample import ResampledBar
+
+COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class SharedHistory:
+    """Historical bars of a set of symbols in shared memory.
+
+    The rows are grouped by symbol, in the given symbol order, and stored as a
+    float64 (5, rows) block of the OHLCV columns followed by the int64
+    nanosecond timestamps. The block is released when the context exits.
+
+    Attributes:
+        spec (dict): What a worker needs to attach to the block, picklable.
+        offsets (dict[str, tuple[int, int]]): The [start, stop) rows of each
+            symbol.
+    """
+
+    def __init__(self, data: pd.DataFrame, symbols: Sequence[str]):
+        """
+        Copy the history of the given symbols into shared memory.
+
+        Args:
+            data (pd.DataFrame): The historical data, with a MultiIndex
+                [symbol, timestamp] and open, high, low, close and volume
+                columns.
+            symbols (Sequence[str]): The symbols to copy, all present in data.
+        """
+        codes, uniques = pd.factorize(data.index.get_level_values(0))
+        # rank of each row's symbol in the requested order, -1 if not requested
+        ranks = np.full(len(uniques), -1, dtype=np.int64)
+        ranks[uniques.get_indexer(symbols)] = np.arange(len(symbols))
+        row_ranks = ranks[codes]
+        rows = np.flatnonzero(row_ranks >= 0)
+        rows = rows[np.argsort(row_ranks[rows], kind="stable")]
+        counts = np.bincount(row_ranks[rows], minlength=len(symbols))
+        stops = np.cumsum(counts)
+
+        timestamps = pd.DatetimeIndex(data.index.get_level_values(1)[rows])
+        n = len(rows)
+        self._shm = SharedMemory(create=True, size=max(6 * 8 * n, 1))
+        values, times = _views(self._shm, n)
+        values[:] = data[COLUMNS].to_numpy(dtype=np.float64)[rows].T
+        times[:] = timestamps.as_unit("ns").asi8
+        del values, times
+
+        self.offsets: dict[str, tuple[int, int]] = {
+            symbol: (int(stop - count), int(stop))
+            for symbol, count, stop in zip(symbols, counts, stops)
+        }
+        self.spec: dict[str, Any] = {
+            "name": self._shm.name,
+            "rows": n,
+            "tz": None if timestamps.tz is None else str(timestamps.tz),
+            "names": list(data.index.names),
+        }
+
+    def __enter__(self) -> SharedHistory:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+
+def _views(shm: SharedMemory, rows: int) -> tuple[np.ndarray, np.ndarray]:
+    """Get the OHLCV and timestamp arrays of a shared memory block."""
+    values = np.ndarray((5, rows), dtype=np.float64, buffer=shm.buf)
+    times = np.ndarray((rows,), dtype=np.int64, buffer=shm.buf, offset=5 * 8 * rows)
+    return values, times
+
+
+def read_shard(
+    spec: Mapping[str, Any], offsets: Mapping[str, tuple[int, int]]
+) -> pd.DataFrame:
+    """
+    Rebuild the historical data of a shard from shared memory.
+
+    Args:
+        spec (Mapping[str, Any]): The `SharedHistory.spec`.
+        offsets (Mapping[str, tuple[int, int]]): The [start, stop) rows of each
+            symbol of the shard, contiguous and in order.
+
+    Returns:
+        pd.DataFrame: The historical data of the shard, with the same MultiIndex
+            [symbol, timestamp] and columns as the original data.
+    """
+    shm = SharedMemory(name=spec["name"])
+    try:
+        values, times = _views(shm, spec["rows"])
+        bounds = list(offsets.values())
+        start, stop = bounds[0][0], bounds[-1][1]
+        timestamps = pd.DatetimeIndex(times[start:stop].copy().view("M8[ns]"))
+        if spec["tz"] is not None:
+            timestamps = timestamps.tz_localize("UTC").tz_convert(spec["tz"])
+        symbols = np.repeat(list(offsets), [b - a for a, b in bounds])
+        frame = pd.DataFrame(
+            values[:, start:stop].T.copy(),
+            columns=COLUMNS,
+            index=pd.MultiIndex.from_arrays([symbols, timestamps], names=spec["names"]),
+        )
+        del values, times
+    finally:
+        shm.close()
+    return frame
+
+
+def warmup_shard(
+    handler_params: Mapping[str, Any],
+    spec: Mapping[str, Any],
+    offsets: Mapping[str, tuple[int, int]],
+    path: os.PathLike,
+) -> dict[SamplingPeriodType, list[ResampledBar]]:
+    """
+    Warm up the indicators of a shard of symbols in a worker process.
+
+    Args:
+        handler_params (Mapping[str, Any]): The parameters of the
+            `AlpacaIndicatorHandler` to warm up a copy of.
+        spec (Mapping[str, Any]): The `SharedHistory.spec`.
+        offsets (Mapping[str, tuple[int, int]]): The [start, stop) rows of each
+            symbol of the shard.
+        path (os.PathLike): Where to write the snapshot of the warm indicators.
+
+    Returns:
+        dict[SamplingPeriodType, list[ResampledBar]]: The bar of the current
+            period of each symbol, by resampled timeframe.
+    """
+    from modular_trader.indicator.handler.alpaca import AlpacaIndicatorHandler
+    from modular_trader.universe import AssetUniverse
+
+    data = read_shard(spec, offsets)
+    symbols = list(offsets)
+    handler = AlpacaIndicatorHandler(**handler_params)
+    handler.init_indicator(AssetUniverse(added=set(symbols)))
+    handler._warmup_symbols(data, symbols)
+    write_snapshot(
+        path,
+        (
+            (symbol, indicator)
+            for symbol in symbols
+            for indicator in handler.attached_indicators[symbol].values()
+        ),
+    )
+    return {
+        timeframe: [resampler.get(s) for s in symbols if s in resampler]
+        for timeframe, resampler in handler._resamplers.items()
+    }
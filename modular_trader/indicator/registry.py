@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping, Sequence
+
+import numpy as np
+
+from modular_trader.indicator.snapshot import to_nanoseconds
+from modular_trader.indicator.technical.buffer import RingBuffer
+
+if TYPE_CHECKING:
+    from modular_trader.indicator.technical.base import BaseIndicator
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class IndicatorHistory:
+    """The last output values of one indicator across symbols.
+
+    Attributes:
+        name (str): The indicator name.
+        symbols (list[str]): The symbols, one per row.
+        values (np.ndarray): The float64 (symbols, length) array of the last
+            output values of each symbol, oldest first and aligned on the last
+            column. Missing and not yet calculated values are NaN.
+        timestamps (np.ndarray): The datetime64[ns] time of the last value of
+            each symbol, NaT if the symbol has none. Aware times are in UTC.
+    """
+
+    name: str
+    symbols: list[str]
+    values: np.ndarray
+    timestamps: np.ndarray
+
+
+class SymbolIndicators(Mapping):
+    """Read-only view of the indicators of one symbol, by name.
+
+    Attributes:
+        symbol (str): The symbol name.
+    """
+
+    __slots__ = ("symbol", "_names", "_name_ids", "_row")
+
+    def __init__(
+        self, symbol: str, names: list[str], name_ids: dict[str, int], row: list
+    ):
+        self.symbol = symbol
+        self._names = names
+        self._name_ids = name_ids
+        self._row = row
+
+    def __getitem__(self, name: str) -> BaseIndicator:
+        name_id = self._name_ids.get(name, None)
+        if name_id is not None and name_id < len(self._row):
+            indicator = self._row[name_id]
+            if indicator is not None:
+                return indicator
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return (k for k, x in zip(self._names, self._row) if x is not None)
+
+    def __len__(self) -> int:
+        return sum(x is not None for x in self._row)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.symbol!r}, {dict(self.items())})"
+
+    def items(self) -> Iterator[tuple[str, BaseIndicator]]:
+        return ((k, x) for k, x in zip(self._names, self._row) if x is not None)
+
+    def values(self) -> Iterator[BaseIndicator]:
+        return (x for x in self._row if x is not None)
+
+
+class IndicatorRegistry(Mapping):
+    """Indicators attached to symbols, stored by integer ids.
+
+    Symbols and indicator names are interned to integer ids once, when they
+    are added. The indicators are stored in one row per symbol id, a list
+    indexed by name id, so looking up the indicators of a symbol or a single
+    (symbol, name) indicator is a dict lookup and a list index. Unlike keypaths,
+    symbols and names may contain any character, e.g. "BRK.B".
+
+    The ids of removed symbols are reused by the symbols added later. Name ids
+    are never released.
+
+    As a mapping, the registry maps each symbol to a `SymbolIndicators` view of
+    its indicators by name.
+
+    Attributes:
+        names (list[str]): The indicator names, by name id.
+    """
+
+    def __init__(self):
+        self._symbol_ids: dict[str, int] = {}
+        self._name_ids: dict[str, int] = {}
+        self._names: list[str] = []
+        # by symbol id, None for free ids
+        self._rows: list[list[BaseIndicator | None] | None] = []
+        self._views: list[SymbolIndicators | None] = []
+        self._free: list[int] = []
+
+    names = property(fget=lambda self: self._names)
+
+    def __getitem__(self, symbol: str) -> SymbolIndicators:
+        return self._views[self._symbol_ids[symbol]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._symbol_ids)
+
+    def __len__(self) -> int:
+        return len(self._symbol_ids)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._symbol_ids
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}"
+            f"(symbols={len(self._symbol_ids)}, names={len(self._names)})"
+        )
+
+    def symbol_id(self, symbol: str) -> int | None:
+        """
+        Get the id of a symbol.
+
+        Args:
+            symbol (str): The symbol name.
+
+        Returns:
+            int | None: The id, or None if the symbol is not in the registry.
+        """
+        return self._symbol_ids.get(symbol, None)
+
+    def name_id(self, name: str) -> int | None:
+        """
+        Get the id of an indicator name.
+
+        Args:
+            name (str): The indicator name.
+
+        Returns:
+            int | None: The id, or None if no indicator has the name.
+        """
+        return self._name_ids.get(name, None)
+
+    def indicator(self, symbol: str, name: str) -> BaseIndicator | None:
+        """
+        Get the indicator of a symbol by name.
+
+        Args:
+            symbol (str): The symbol name.
+            name (str): The indicator name.
+
+        Returns:
+            BaseIndicator | None: The indicator, or None if not found.
+        """
+        symbol_id = self._symbol_ids.get(symbol, None)
+        name_id = self._name_ids.get(name, None)
+        if symbol_id is None or name_id is None:
+            return None
+        row = self._rows[symbol_id]
+        return row[name_id] if name_id < len(row) else None
+
+    def add_name(self, name: str) -> int:
+        """
+        Give an id to an indicator name, e.g. before any symbol has it.
+
+        Args:
+            name (str): The indicator name.
+
+        Returns:
+            int: The id of the name.
+        """
+        name_id = self._name_ids.get(name, None)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self._names)
+            self._names.append(name)
+        return name_id
+
+    def add(self, symbol: str, name: str, indicator: BaseIndicator) -> None:
+        """
+        Attach an indicator to a symbol, replacing the one with the same name.
+
+        Args:
+            symbol (str): The symbol name.
+            name (str): The indicator name.
+            indicator (BaseIndicator): The indicator.
+        """
+        name_id = self.add_name(name)
+        symbol_id = self._symbol_ids.get(symbol, None)
+        if symbol_id is None:
+            symbol_id = self._add_symbol(symbol)
+        row = self._rows[symbol_id]
+        if name_id >= len(row):
+            row.extend([None] * (name_id + 1 - len(row)))
+        row[name_id] = indicator
+
+    def _add_symbol(self, symbol: str) -> int:
+        """Give an id and an empty row to a symbol."""
+        row: list[BaseIndicator | None] = []
+        view = SymbolIndicators(symbol, self._names, self._name_ids, row)
+        if self._free:
+            symbol_id = self._free.pop()
+            self._rows[symbol_id] = row
+            self._views[symbol_id] = view
+        else:
+            symbol_id = len(self._rows)
+            self._rows.append(row)
+            self._views.append(view)
+        self._symbol_ids[symbol] = symbol_id
+        return symbol_id
+
+    def remove(self, symbols: Iterable[str]) -> None:
+        """
+        Detach all indicators of the given symbols. Unknown symbols are ignored.
+
+        Args:
+            symbols (Iterable[str]): The symbols to remove.
+        """
+        for symbol in symbols:
+            symbol_id = self._symbol_ids.pop(symbol, None)
+            if symbol_id is None:
+                continue
+            self._rows[symbol_id] = None
+            self._views[symbol_id] = None
+            self._free.append(symbol_id)
+
+    def indicators(self) -> Iterator[tuple[str, str, BaseIndicator]]:
+        """
+        Iterate over all attached indicators.
+
+        Yields:
+            tuple[str, str, BaseIndicator]: The symbol, name and indicator.
+        """
+        for symbol, symbol_id in self._symbol_ids.items():
+            for name, indicator in zip(self._names, self._rows[symbol_id]):
+                if indicator is not None:
+                    yield symbol, name, indicator
+
+    def history(
+        self,
+        name: str,
+        length: int,
+        field: str | None = None,
+        symbols: Sequence[str] | None = None,
+    ) -> IndicatorHistory:
+        """
+        Get the last output values of an indicator across symbols.
+
+        The newest values of each symbol are taken as views on its output
+        buffer and converted to float64 together, in one scatter into the
+        result, so no value is copied one at a time in Python.
+
+        Args:
+            name (str): The indicator name.
+            length (int): The number of values per symbol.
+            field (str | None): The field of the output values to read, for
+                indicators whose values are dataclasses (e.g. "k" of STOCH).
+            symbols (Sequence[str] | None): The symbols, in row order. Symbols
+                without the indicator get a row of NaN. Defaults to all
+                symbols of the registry.
+
+        Returns:
+            IndicatorHistory: The values and last times.
+
+        Raises:
+            KeyError: If no indicator has the name.
+        """
+        name_id = self._name_ids.get(name, None)
+        if name_id is None:
+            raise KeyError(name)
+        symbols = list(self._symbol_ids) if symbols is None else list(symbols)
+        values = np.full((len(symbols), length), np.nan)
+        timestamps = np.full(len(symbols), to_nanoseconds(None), dtype=np.int64)
+        parts: list[np.ndarray] = []
+        rows: list[int] = []
+        counts: list[int] = []
+        for i, symbol in enumerate(symbols):
+            symbol_id = self._symbol_ids.get(symbol, None)
+            if symbol_id is None:
+                continue
+            row = self._rows[symbol_id]
+            indicator = row[name_id] if name_id < len(row) else None
+            if indicator is None:
+                continue
+            outputs = indicator.output_values
+            if type(outputs) is RingBuffer:
+                parts += outputs.tail(length)
+            else:
+                parts.append(
+                    np.array(outputs[max(0, len(outputs) - length) :], dtype=object)
+                )
+            rows.append(i)
+            counts.append(min(length, len(outputs)))
+            # the time is kept by the indicator that ingests the bars: in its
+            # last bar if multi-input, which do not set previous_time
+            while indicator._input_indicator is not None:
+                indicator = indicator._input_indicator
+            inputs = indicator.input_values
+            time = getattr(inputs[-1], "time", None) if len(inputs) else None
+            timestamps[i] = to_nanoseconds(time or indicator._previous_time)
+
+        if parts:
+            data = np.concatenate(parts)
+            if field is not None:
+                data = np.frompyfunc(
+                    lambda x: None if x is None else getattr(x, field), 1, 1
+                )(data)
+            # flat position of each value: right-aligned in the row of its symbol
+            counts = np.array(counts)
+            starts = (np.array(rows) + 1) * length - counts
+            firsts = np.cumsum(counts) - counts
+            positions = np.arange(len(data)) + np.repeat(starts - firsts, counts)
+            values.reshape(-1)[positions] = data
+        return IndicatorHistory(name, symbols, values, timestamps.view("M8[ns]"))
+
+    def to_dict(self) -> dict[str, dict[str, BaseIndicator]]:
+        """
+        Get the attached indicators as nested dictionaries.
+
+        Returns:
+            dict[str, dict[str, BaseIndicator]]: The indicators by symbol and
+                name.
+        """
+        return {symbol: dict(view.items()) for symbol, view in self.items()}
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import dataclasses
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Iterable
+
+import pandas as pd
+from talipp.input import Sampler, SamplingPeriodType, TimeUnitType
+
+from modular_trader.common.type_aliases import RealNumber
+
+if TYPE_CHECKING:
+    from talipp.ohlcv import OHLCV
+
+AGGREGATION = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
+# the part of the timestamp a period is counted from, as in `Sampler._normalize`
+_PERIOD_BASE = {
+    TimeUnitType.SEC: "min",
+    TimeUnitType.MIN: "h",
+    TimeUnitType.HOUR: "D",
+}
+
+
+@dataclasses.dataclass(slots=True)
+class ResampledBar:
+    """A bar built from the bars of a shorter timeframe.
+
+    It has the attributes of an Alpaca `Bar` that the handlers and traders use.
+
+    Attributes:
+        symbol (str): The symbol name.
+        timestamp (datetime): The start of the period.
+        open (RealNumber): The open of the first bar of the period.
+        high (RealNumber): The highest high of the period.
+        low (RealNumber): The lowest low of the period.
+        close (RealNumber): The close of the last bar of the period.
+        volume (RealNumber): The total volume of the period.
+    """
+
+    symbol: str
+    timestamp: datetime
+    open: RealNumber
+    high: RealNumber
+    low: RealNumber
+    close: RealNumber
+    volume: RealNumber
+
+
+class BarResampler:
+    """Build bars of a longer timeframe from a stream of bars.
+
+    The bar of the current period is kept per symbol and updated with every
+    bar of the period, so it is always the bar of the period so far, like the
+    daily bars streamed by Alpaca during the session. Periods are delimited as
+    by talipp's `Sampler`, so the bars can be ingested by indicators sampled
+    with the same period: each update replaces the last value of the period.
+
+    Attributes:
+        timeframe (SamplingPeriodType): The timeframe of the built bars.
+    """
+
+    def __init__(self, timeframe: SamplingPeriodType):
+        """
+        Initialize the resampler.
+
+        Args:
+            timeframe (SamplingPeriodType): The timeframe of the built bars.
+        """
+        self._timeframe = timeframe
+        self._sampler = Sampler(period_type=timeframe)
+        unit, length = timeframe.value
+        self._span = timedelta(seconds=length * Sampler.CONVERSION_TO_SEC[unit])
+        # symbol -> [bar, start, end], start and end in POSIX seconds
+        self._bars: dict[str, list] = {}
+
+    timeframe = property(fget=lambda self: self._timeframe)
+    span = property(fget=lambda self: self._span)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._bars
+
+    def get(self, symbol: str) -> ResampledBar | None:
+        """
+        Get the bar of the current period of a symbol.
+
+        Args:
+            symbol (str): The symbol name.
+
+        Returns:
+            ResampledBar | None: The bar, or None if the symbol has no bar.
+        """
+        state = self._bars.get(symbol, None)
+        return state[0] if state is not None else None
+
+    def closed_bar(self, symbol: str, timestamp: datetime) -> ResampledBar | None:
+        """
+        Get the bar of the current period of a symbol if a bar at the given
+        timestamp would close it, i.e. the timestamp is past the period.
+
+        Call it before `update` with the same timestamp to get the bars of the
+        periods as they complete.
+
+        Args:
+            symbol (str): The symbol name.
+            timestamp (datetime): The timestamp of the next bar.
+
+        Returns:
+            ResampledBar | None: The complete bar, or None if the symbol has no
+                bar or the timestamp is in its period.
+        """
+        state = self._bars.get(symbol, None)
+        if state is None or timestamp.timestamp() < state[2]:
+            return None
+        return state[0]
+
+    def period_start(self, timestamp: datetime) -> datetime:
+        """
+        Get the start of the period that contains the given timestamp.
+
+        Args:
+            timestamp (datetime): The timestamp.
+
+        Returns:
+            datetime: The start of the period.
+        """
+        return self._sampler._normalize(timestamp)
+
+    def update(
+        self,
+        symbol: str,
+        open: RealNumber,
+        high: RealNumber,
+        low: RealNumber,
+        close: RealNumber,
+        volume: RealNumber,
+        timestamp: datetime,
+    ) -> ResampledBar:
+        """
+        Add a bar to the bar of its period.
+
+        Args:
+            symbol (str): The symbol name.
+            open (RealNumber): The open price.
+            high (RealNumber): The high price.
+            low (RealNumber): The low price.
+            close (RealNumber): The close price.
+            volume (RealNumber): The volume.
+            timestamp (datetime): The timestamp of the bar.
+
+        Returns:
+            ResampledBar: The bar of the period so far. A new object is returned
+                on every update, so earlier bars are not modified.
+        """
+        state = self._bars.get(symbol, None)
+        if state is not None and state[1] <= timestamp.timestamp() < state[2]:
+            bar: ResampledBar = state[0]
+            state[0] = bar = ResampledBar(
+                symbol,
+                bar.timestamp,
+                bar.open,
+                max(bar.high, high),
+                min(bar.low, low),
+                close,
+                bar.volume + volume,
+            )
+            return bar
+        start = self.period_start(timestamp)
+        bar = ResampledBar(symbol, start, open, high, low, close, volume)
+        self._bars[symbol] = [
+            bar,
+            start.timestamp(),
+            (start + self._span).timestamp(),
+        ]
+        return bar
+
+    def update_ohlcv(self, symbol: str, ohlcv: OHLCV) -> ResampledBar:
+        """
+        Add a bar given as an OHLCV object to the bar of its period.
+
+        Args:
+            symbol (str): The symbol name.
+            ohlcv (OHLCV): The bar.
+
+        Returns:
+            ResampledBar: The bar of the period so far.
+        """
+        return self.update(
+            symbol,
+            ohlcv.open,
+            ohlcv.high,
+            ohlcv.low,
+            ohlcv.close,
+            ohlcv.volume,
+            ohlcv.time,
+        )
+
+    def remove(self, symbols: Iterable[str]) -> None:
+        """
+        Drop the bars of the given symbols.
+
+        Args:
+            symbols (Iterable[str]): The symbols to drop.
+        """
+        for symbol in symbols:
+            self._bars.pop(symbol, None)
+
+    def period_starts(self, timestamps: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        """
+        Get the start of the period of each timestamp.
+
+        Vectorized version of `period_start`.
+
+        Args:
+            timestamps (pd.DatetimeIndex): The timestamps.
+
+        Returns:
+            pd.DatetimeIndex: The start of the period of each timestamp.
+        """
+        tz = timestamps.tz
+        # periods are counted on the wall clock, as by `Sampler._normalize`
+        wall = timestamps.tz_localize(None) if tz is not None else timestamps
+        unit, _ = self._timeframe.value
+        if unit == TimeUnitType.DAY:
+            base = wall.to_period("M").to_timestamp()
+        else:
+            base = wall.floor(_PERIOD_BASE[unit])
+        span = pd.Timedelta(self._span)
+        starts = base + ((wall - base) // span) * span
+        return starts.tz_localize(tz) if tz is not None else starts
+
+    def resample(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the bars of the timeframe from historical data.
+
+        Args:
+            data (pd.DataFrame): The historical data, with a MultiIndex
+                [symbol, timestamp] and open, high, low, close and volume
+                columns.
+
+        Returns:
+            pd.DataFrame: The bars of the timeframe, with a MultiIndex
+                [symbol, timestamp] where timestamp is the start of the period.
+                The last bar of a symbol may be a partial period.
+        """
+        symbols = data.index.get_level_values(0)
+        starts = self.period_starts(pd.DatetimeIndex(data.index.get_level_values(1)))
+        resampled = (
+            data[list(AGGREGATION)]
+            .groupby([symbols, starts], sort=True)
+            .agg(AGGREGATION)
+        )
+        resampled.index.names = data.index.names
+        return resampled
+
+    def seed(self, data: pd.DataFrame) -> None:
+        """
+        Start the bar of the current period of each symbol from resampled data.
+
+        The last bar of each symbol is taken as the bar of its period so far,
+        so that the following bars of the period are added to it. Symbols that
+        already have a bar of the same or a later period are left as is.
+
+        Args:
+            data (pd.DataFrame): The output of `resample`.
+        """
+        last = data.groupby(level=0, sort=False).tail(1)
+        self.seed_bars(
+            ResampledBar(
+                symbol,
+                start.to_pydatetime(),
+                row.open,
+                row.high,
+                row.low,
+                row.close,
+                row.volume,
+            )
+            for (symbol, start), row in zip(last.index, last.itertuples(index=False))
+        )
+
+    def seed_bars(self, bars: Iterable[ResampledBar]) -> None:
+        """
+        Start the bar of the current period of each symbol from the given bars.
+
+        Symbols that already have a bar of the same or a later period are left
+        as is.
+
+        Args:
+            bars (Iterable[ResampledBar]): The bars of the current periods, as
+                returned by `get`.
+        """
+        for bar in bars:
+            start = bar.timestamp.timestamp()
+            state = self._bars.get(bar.symbol, None)
+            if state is not None and state[1] >= start:
+                continue
+            self._bars[bar.symbol] = [
+                bar,
+                start,
+                (bar.timestamp + self._span).timestamp(),
+            ]
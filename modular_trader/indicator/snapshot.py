@@ -0,0 +1,442 @@
+"""Binary snapshots of indicator state.
+
+A snapshot stores the state of the attached indicators (and indicator banks)
+of an indicator handler, so that a restarted trader can restore them instead
+of warming them up again.
+
+File layout::
+
+    magic (8 bytes) | version (uint32) | header length (uint32) | JSON header
+    | padding | data
+
+The header describes the indicators and where each array is stored in the
+data section. Arrays are 8-byte aligned, so the data section is memory-mapped
+on load and arrays are read as views without copying the file.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import json
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+from talipp.indicators.Indicator import Indicator
+
+from modular_trader.indicator.technical.base import BaseIndicator
+
+SNAPSHOT_MAGIC: bytes = b"MTSNAP\x00\x00"
+SNAPSHOT_VERSION: int = 1
+
+_PREFIX = struct.Struct("<8sII")
+_ALIGNMENT = 8
+_NAT = np.iinfo(np.int64).min
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# value types are restored only from these packages
+_TRUSTED_MODULES = ("talipp.", "modular_trader.")
+
+
+def to_nanoseconds(value: datetime | None) -> int:
+    """
+    Convert a datetime into nanoseconds since the epoch.
+
+    Naive datetimes are taken as is, aware ones are converted to UTC.
+
+    Args:
+        value (datetime | None): The datetime.
+
+    Returns:
+        int: The nanoseconds since the epoch, or the NaT sentinel if value is
+            None or `datetime.min`.
+    """
+    if isinstance(value, pd.Timestamp):
+        return value.value
+    if value is None or value == datetime.min:
+        return _NAT
+    nanosecond = getattr(value, "nanosecond", 0)
+    epoch = _EPOCH if value.tzinfo is None else _EPOCH_UTC
+    return (value - epoch) // timedelta(microseconds=1) * 1000 + nanosecond
+
+
+def from_nanoseconds(value: int, aware: bool = True) -> datetime | None:
+    """
+    Convert nanoseconds since the epoch into a datetime.
+
+    Args:
+        value (int): The nanoseconds since the epoch.
+        aware (bool): If True, return an UTC datetime, otherwise a naive one.
+
+    Returns:
+        datetime | None: The datetime, or None for the NaT sentinel.
+    """
+    if value == _NAT:
+        return None
+    epoch = _EPOCH_UTC if aware else _EPOCH
+    return epoch + timedelta(microseconds=int(value) // 1000)
+
+
+class IndicatorSnapshot:
+    """Snapshot read from disk.
+
+    Attributes:
+        version (int): The format version.
+        created (datetime): When the snapshot was written.
+        timestamps (dict[str, datetime]): The time of the last bar ingested for
+            each symbol.
+        entries (dict[tuple[str, str], dict]): The indicator states by
+            (symbol, name).
+        banks (dict[str, dict]): The bank states by name.
+    """
+
+    def __init__(self, header: Mapping[str, Any], data: np.ndarray):
+        self._header = header
+        self._data = data
+        self.version: int = header["version"]
+        self.created = datetime.fromisoformat(header["created"])
+        self.timestamps: dict[str, datetime] = {
+            symbol: from_nanoseconds(ns, aware)
+            for symbol, (ns, aware) in header["timestamps"].items()
+        }
+        self.entries: dict[tuple[str, str], dict] = {
+            (x["symbol"], x["name"]): x for x in header["indicators"]
+        }
+        self.banks: dict[str, dict] = {x["name"]: x for x in header["banks"]}
+
+    def array(self, index: int) -> np.ndarray:
+        """
+        Get an array of the snapshot as a read-only view on the file.
+
+        Args:
+            index (int): The index of the array in the header.
+
+        Returns:
+            np.ndarray: The array.
+        """
+        spec = self._header["arrays"][index]
+        dtype = np.dtype(spec["dtype"])
+        size = int(np.prod(spec["shape"])) * dtype.itemsize
+        offset = spec["offset"]
+        return self._data[offset : offset + size].view(dtype).reshape(spec["shape"])
+
+    def restore(self, symbol: str, indicator: BaseIndicator) -> bool:
+        """
+        Restore the state of an indicator.
+
+        The indicator must have the same class, parameters, cache size and
+        sampling period as the snapshotted one, and so must its input
+        indicators, otherwise it is left untouched.
+
+        Args:
+            symbol (str): The symbol of the indicator.
+            indicator (BaseIndicator): The indicator to restore.
+
+        Returns:
+            bool: True if the indicator is restored, False otherwise.
+        """
+        entry = self.entries.get((symbol, indicator.name), None)
+        chain = _chain(indicator)
+        if entry is None or entry["signature"] != [_signature(x) for x in chain]:
+            return False
+        for member, state in zip(chain, entry["chain"]):
+            self._restore_state(member, state)
+        return True
+
+    def restore_bank(self, bank: Any, symbols: Iterable[str]) -> list[str]:
+        """
+        Restore the state of symbols in an indicator bank.
+
+        Args:
+            bank (IndicatorBank): The bank to restore.
+            symbols (Iterable[str]): The symbols to restore.
+
+        Returns:
+            list[str]: The restored symbols.
+        """
+        entry = self.banks.get(bank.name, None)
+        if entry is None or entry["signature"] != _signature(bank):
+            return []
+        positions = {s: entry["rows"][s] for s in symbols if s in entry["rows"]}
+        if positions:
+            arrays = {k: self.array(v) for k, v in entry["arrays"].items()}
+            bank.restore(positions, arrays)
+        return list(positions.keys())
+
+    def _restore_state(self, indicator: Indicator, state: Mapping[str, Any]) -> None:
+        """Restore the values of a single indicator (not its input chain)."""
+        indicator.input_values = self._read_values(state["input_values"])
+        indicator.output_values = self._read_values(state["output_values"])
+        for sequence, spec in zip(indicator.managed_sequences, state["managed"]):
+            if isinstance(sequence, Indicator):
+                self._restore_state(sequence, spec)
+            else:
+                sequence[:] = self._read_values(spec)
+        for sub_indicator, spec in zip(
+            indicator.sub_indicators, state.get("sub_indicators", [])
+        ):
+            self._restore_state(sub_indicator, spec)
+        if isinstance(indicator, BaseIndicator):
+            previous_time = from_nanoseconds(*state["previous_time"])
+            indicator.previous_time = previous_time or datetime.min
+            indicator._install_buffers()
+
+    def _read_values(self, spec: Mapping[str, Any]) -> list:
+        """Decode a sequence of values."""
+        present = self.array(spec["present"]).tolist()
+        columns = {}
+        for field, column in spec["columns"].items():
+            if column["kind"] == "none":
+                columns[field] = [None] * column["length"]
+                continue
+            values = self.array(column["array"]).tolist()
+            if column["kind"] == "datetime":
+                values = [from_nanoseconds(x, column["aware"]) for x in values]
+            if "nulls" in column:
+                nulls = self.array(column["nulls"]).tolist()
+                values = [None if n else v for v, n in zip(values, nulls)]
+            columns[field] = values
+        if spec["type"] is None:
+            values = columns.get("", [])
+            return [v if p else None for v, p in zip(values, present)]
+        cls = _import(spec["type"])
+        fields = list(columns.keys())
+        return [
+            cls(**dict(zip(fields, row))) if p else None
+            for row, p in zip(zip(*columns.values()), present)
+        ]
+
+
+class _SnapshotWriter:
+    """Collect the arrays and header of a snapshot."""
+
+    def __init__(self):
+        self.arrays: list[np.ndarray] = []
+        self.specs: list[dict] = []
+        self.size = 0
+
+    def add(self, array: np.ndarray) -> int:
+        """Add an array and return its index."""
+        array = np.ascontiguousarray(array)
+        self.size += -self.size % _ALIGNMENT
+        self.specs.append(
+            {"dtype": array.dtype.str, "shape": list(array.shape), "offset": self.size}
+        )
+        self.arrays.append(array)
+        self.size += array.nbytes
+        return len(self.arrays) - 1
+
+    def state(self, indicator: Indicator) -> dict:
+        """Encode the values of a single indicator (not its input chain)."""
+        if isinstance(indicator, BaseIndicator):
+            indicator.evaluate()
+        managed = [
+            self.state(x) if isinstance(x, Indicator) else self.values(x)
+            for x in indicator.managed_sequences
+        ]
+        state = {
+            "input_values": self.values(indicator.input_values),
+            "output_values": self.values(indicator.output_values),
+            "managed": managed,
+            "sub_indicators": [self.state(x) for x in indicator.sub_indicators],
+        }
+        if isinstance(indicator, BaseIndicator):
+            previous_time = indicator.previous_time
+            state["previous_time"] = [
+                to_nanoseconds(previous_time),
+                getattr(previous_time, "tzinfo", None) is not None,
+            ]
+        return state
+
+    def values(self, values: Iterable[Any]) -> dict:
+        """Encode a sequence of floats or dataclass values, any of which may be None."""
+        values = list(values)
+        present = [x is not None for x in values]
+        sample = next((x for x in values if x is not None), None)
+        if sample is None or not dataclasses.is_dataclass(sample):
+            column = [np.nan if x is None else x for x in values]
+            return {
+                "type": None,
+                "present": self.add(np.array(present, dtype=bool)),
+                "columns": {"": self.column(column)},
+            }
+        cls = type(sample)
+        columns = {
+            field.name: self.column(
+                [None if x is None else getattr(x, field.name) for x in values]
+            )
+            for field in dataclasses.fields(cls)
+        }
+        return {
+            "type": f"{cls.__module__}:{cls.__qualname__}",
+            "present": self.add(np.array(present, dtype=bool)),
+            "columns": columns,
+        }
+
+    def column(self, values: list[Any]) -> dict:
+        """
+        Encode one column as float64, or int64 nanoseconds for datetimes. The
+        None values of a float column are recorded in a mask, so that they are
+        not read back as NaN.
+        """
+        sample = next((x for x in values if x is not None), None)
+        if sample is None:
+            return {"array": None, "kind": "none", "length": len(values)}
+        if isinstance(sample, datetime):
+            array = np.array([to_nanoseconds(x) for x in values], dtype=np.int64)
+            aware = sample.tzinfo is not None
+            return {"array": self.add(array), "kind": "datetime", "aware": aware}
+        array = np.array([np.nan if x is None else x for x in values], dtype=np.float64)
+        column = {"array": self.add(array), "kind": "float"}
+        nulls = [x is None for x in values]
+        if any(nulls):
+            column["nulls"] = self.add(np.array(nulls, dtype=bool))
+        return column
+
+    def write(self, path: os.PathLike, header: dict) -> None:
+        """Write the header and arrays to disk, replacing the file atomically."""
+        header["arrays"] = self.specs
+        encoded = json.dumps(header, default=str).encode("utf-8")
+        prefix = _PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(encoded))
+        start = len(prefix) + len(encoded)
+        padding = -start % _ALIGNMENT
+
+        tmp_path = f"{os.fspath(path)}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(prefix)
+            f.write(encoded)
+            f.write(b"\x00" * padding)
+            position = 0
+            for array, spec in zip(self.arrays, self.specs):
+                f.write(b"\x00" * (spec["offset"] - position))
+                f.write(array.tobytes())
+                position = spec["offset"] + array.nbytes
+        os.replace(tmp_path, path)
+
+
+def write_snapshot(
+    path: os.PathLike,
+    indicators: Iterable[tuple[str, BaseIndicator]],
+    banks: Iterable[Any] = (),
+    timestamps: Mapping[str, datetime] | None = None,
+) -> None:
+    """
+    Write a snapshot of indicators to disk.
+
+    Args:
+        path (os.PathLike): The path of the snapshot file.
+        indicators (Iterable[tuple[str, BaseIndicator]]): The (symbol, indicator)
+            pairs. The input indicator chain of each indicator is included.
+        banks (Iterable[IndicatorBank]): The indicator banks.
+        timestamps (Mapping[str, datetime] | None): The time of the last bar
+            ingested for each symbol.
+    """
+    writer = _SnapshotWriter()
+    entries = []
+    for symbol, indicator in indicators:
+        chain = _chain(indicator)
+        entries.append(
+            {
+                "symbol": symbol,
+                "name": indicator.name,
+                "signature": [_signature(x) for x in chain],
+                "chain": [writer.state(x) for x in chain],
+            }
+        )
+    bank_entries = []
+    for bank in banks:
+        rows, arrays = bank.state()
+        bank_entries.append(
+            {
+                "name": bank.name,
+                "signature": _signature(bank),
+                "rows": rows,
+                "arrays": {k: writer.add(v) for k, v in arrays.items()},
+            }
+        )
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "timestamps": {
+            symbol: [to_nanoseconds(t), getattr(t, "tzinfo", None) is not None]
+            for symbol, t in (timestamps or {}).items()
+        },
+        "indicators": entries,
+        "banks": bank_entries,
+    }
+    writer.write(path, header)
+
+
+def read_snapshot(path: os.PathLike) -> IndicatorSnapshot:
+    """
+    Read a snapshot from disk. The data section is memory-mapped.
+
+    Args:
+        path (os.PathLike): The path of the snapshot file.
+
+    Returns:
+        IndicatorSnapshot: The snapshot.
+
+    Raises:
+        ValueError: If the file is not a snapshot or was written with another
+            format version.
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"Not an indicator snapshot: {path}")
+        magic, version, length = _PREFIX.unpack(prefix)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not an indicator snapshot: {path}")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot version {version}, expected {SNAPSHOT_VERSION}"
+            )
+        header = json.loads(f.read(length).decode("utf-8"))
+
+    start = _PREFIX.size + length
+    start += -start % _ALIGNMENT
+    if os.path.getsize(path) > start:
+        data = np.memmap(path, dtype=np.uint8, mode="r", offset=start)
+    else:
+        data = np.empty(0, dtype=np.uint8)
+    return IndicatorSnapshot(header, data)
+
+
+def _chain(indicator: BaseIndicator) -> list[BaseIndicator]:
+    """Get the input indicator chain of an indicator, root first."""
+    chain = [indicator]
+    while chain[-1].input_indicator is not None:
+        chain.append(chain[-1].input_indicator)
+    return chain[::-1]
+
+
+def _signature(indicator: Any) -> list:
+    """Get what must match for a state to be restored into an indicator, its
+    input indicators included."""
+    cls = type(indicator)
+    params = getattr(indicator, "params", {})
+    sampling_period = getattr(indicator, "sampling_period", None)
+    input_indicator = getattr(indicator, "input_indicator", None)
+    return [
+        f"{cls.__module__}:{cls.__qualname__}",
+        json.loads(json.dumps(params, default=str)),
+        getattr(indicator, "cache_size", None),
+        None if sampling_period is None else sampling_period.name,
+        None if input_indicator is None else _signature(input_indicator),
+    ]
+
+
+def _import(qualified_name: str) -> type:
+    """Import a value type from its qualified name."""
+    module, _, name = qualified_name.partition(":")
+    if not module.startswith(_TRUSTED_MODULES):
+        raise ValueError(f"Untrusted value type in snapshot: {qualified_name}")
+    obj = importlib.import_module(module)
+    for part in name.split("."):
+        obj = getattr(obj, part)
+    return obj
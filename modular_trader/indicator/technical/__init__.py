@@ -1,5 +1,11 @@
+from .adx import ADX
+from .atr import ATR
+from .bb import BB
+from .ema import EMA
+from .macd import MACD
+from .obv import OBV
 from .rsi import RSI
 from .sma import SMA
 from .stoch import STOCH
 
-__all__ = ["RSI", "SMA", "STOCH"]
+__all__ = ["ADX", "ATR", "BB", "EMA", "MACD", "OBV", "RSI", "SMA", "STOCH"]
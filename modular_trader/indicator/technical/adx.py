@@ -0,0 +1,107 @@
+from typing import Iterable
+
+import numpy as np
+from talipp.indicators import ADX as BaseADX
+from talipp.indicators.ADX import ADXVal
+from talipp.input import SamplingPeriodType
+
+from modular_trader.common.type_aliases import DateOrDatetime, RealNumber
+
+from . import kernels
+from .base import BaseIndicator, MultipleInputMixin
+
+
+class ADX(BaseIndicator, BaseADX, MultipleInputMixin):
+    """
+    Average Directional Index (ADX)
+
+    The Average Directional Index (ADX) measures the strength of a trend,
+    regardless of its direction. It is the smoothed average of the difference
+    between the plus and minus directional indicators, which measure the upward
+    and downward price movements relative to the Average True Range.
+
+    Args:
+        di_period (int): The period of the directional indicators.
+        adx_period (int): The period of the ADX.
+        input_indicator (BaseIndicator | None): The input indicator.
+        sampling_period (SamplingPeriodType | None): The sampling period.
+        cache_size (int | None): The cache size.
+        name (str | None): The name of the indicator.
+        lazy (bool): Whether the values are computed when read.
+    """
+
+    params = property(
+        fget=lambda self: {
+            "di_period": self.di_period,
+            "adx_period": self.adx_period,
+        }
+    )
+
+    def __init__(
+        self,
+        di_period: int,
+        adx_period: int,
+        input_indicator: BaseIndicator | None = None,
+        sampling_period: SamplingPeriodType | None = None,
+        cache_size: int | None = None,
+        name: str | None = None,
+        lazy: bool = False,
+    ):
+        period = di_period + adx_period
+        cache_size = cache_size or period
+        assert cache_size >= period - 1, f"Cache size must be at least {period - 1}"
+        name = name or f"{self.__class__.__name__}_{di_period}_{adx_period}"
+
+        BaseADX.__init__(
+            self,
+            di_period,
+            adx_period,
+            input_indicator=input_indicator,
+            input_sampling=sampling_period,
+        )
+        BaseIndicator.__init__(
+            self, cache_size, sampling_period, input_indicator, name, lazy
+        )
+
+    def _ingest_batch(
+        self,
+        open: Iterable[RealNumber] | None = None,
+        high: Iterable[RealNumber] | None = None,
+        low: Iterable[RealNumber] | None = None,
+        close: Iterable[RealNumber] | None = None,
+        volume: Iterable[RealNumber] | None = None,
+        timestamp: Iterable[DateOrDatetime] | None = None,
+    ) -> None:
+        n = len(close)
+        values = kernels.adx(
+            kernels.as_float_array(high),
+            kernels.as_float_array(low),
+            kernels.as_float_array(close),
+            self.di_period,
+            self.adx_period,
+            self._max_length,
+        )
+
+        # the indices are calculated from bar di_period on
+        first = n - len(values["pdi"])
+        adx, pdi, mdi = (
+            np.concatenate((np.full(first, np.nan), values[key]))
+            for key in ("adx", "pdi", "mdi")
+        )
+        start = self._purged_length(n)
+        bars = self._cached_ohlcv(n, open, high, low, close, volume, timestamp)
+        self.input_values = bars
+        self.output_values = [
+            ADXVal(None if a != a else a, p, m) if p == p else None
+            for a, p, m in zip(
+                adx[start:].tolist(), pdi[start:].tolist(), mdi[start:].tolist()
+            )
+        ]
+        self._install_buffers()
+
+        self._seed_sub_indicator(self.atr, bars, values["atr"])
+        self._seed_sequence(self.atr.tr, values["tr"], n)
+        for key in ("pdm", "mdm", "spdm", "smdm", "pdi", "mdi", "dx"):
+            self._seed_sequence(getattr(self, key), values[key], n)
+        if timestamp is not None and len(timestamp) > 0:
+            self.previous_time = timestamp[-1]
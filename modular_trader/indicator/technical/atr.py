@@ -0,0 +1,77 @@
+from typing import Iterable
+
+from talipp.indicators import ATR as BaseATR
+from talipp.input import SamplingPeriodType
+
+from modular_trader.common.type_aliases import DateOrDatetime, RealNumber
+
+from . import kernels
+from .base import BaseIndicator, MultipleInputMixin
+
+
+class ATR(BaseIndicator, BaseATR, MultipleInputMixin):
+    """
+    Average True Range (ATR)
+
+    The Average True Range (ATR) is a volatility indicator that averages the
+    true range of a security over a given period with Wilder's smoothing. The
+    true range of a bar is the largest of its high-low range and the distances
+    between its high and low and the previous close.
+
+    Args:
+        period (int): The period of the ATR.
+        input_indicator (BaseIndicator | None): The input indicator.
+        sampling_period (SamplingPeriodType | None): The sampling period.
+        cache_size (int | None): The cache size.
+        name (str | None): The name of the indicator.
+        lazy (bool): Whether the values are computed when read.
+    """
+
+    params = property(fget=lambda self: {"period": self.period})
+
+    def __init__(
+        self,
+        period: int,
+        input_indicator: BaseIndicator | None = None,
+        sampling_period: SamplingPeriodType | None = None,
+        cache_size: int | None = None,
+        name: str | None = None,
+        lazy: bool = False,
+    ):
+        cache_size = cache_size or period
+        assert cache_size >= period, f"Cache size must be at least {period}"
+        name = name or f"{self.__class__.__name__}_{period}"
+
+        BaseATR.__init__(
+            self,
+            period,
+            input_indicator=input_indicator,
+            input_sampling=sampling_period,
+        )
+        BaseIndicator.__init__(
+            self, cache_size, sampling_period, input_indicator, name, lazy
+        )
+
+    def _ingest_batch(
+        self,
+        open: Iterable[RealNumber] | None = None,
+        high: Iterable[RealNumber] | None = None,
+        low: Iterable[RealNumber] | None = None,
+        close: Iterable[RealNumber] | None = None,
+        volume: Iterable[RealNumber] | None = None,
+        timestamp: Iterable[DateOrDatetime] | None = None,
+    ) -> None:
+        n = len(close)
+        output, tr = kernels.atr(
+            kernels.as_float_array(high),
+            kernels.as_float_array(low),
+            kernels.as_float_array(close),
+            self.period,
+            self._max_length,
+        )
+        self._seed(
+            self._cached_ohlcv(n, open, high, low, close, volume, timestamp), output
+        )
+        self._seed_sequence(self.tr, tr, n)
+        if timestamp is not None and len(timestamp) > 0:
+            self.previous_time = timestamp[-1]
@@ -2,15 +2,19 @@ from __future__ import annotations
 
 from abc import ABC
 from copy import deepcopy
-from datetime import datetime
-from typing import Iterable
+from datetime import datetime, timedelta
+from typing import Iterable, Sequence
 
+import numpy as np
 from multimethod import multidispatch
+from talipp.indicators.Indicator import Indicator
 from talipp.input import Sampler, SamplingPeriodType
 from talipp.ohlcv import OHLCV, OHLCVFactory
 
 from modular_trader.common.type_aliases import DateOrDatetime, RealNumber
 
+from .buffer import RingBuffer
+
 
 class BaseIndicator(ABC):
     """Base class for all indicators.
@@ -21,6 +25,7 @@ class BaseIndicator(ABC):
         input_indicator (BaseIndicator | None): The input indicator.
         previous_time (datetime | None): The time of the last value.
         name (str | None): The name of the indicator.
+        lazy (bool): Whether the values are computed when read.
     """
 
     def __init__(
@@ -29,6 +34,7 @@ class BaseIndicator(ABC):
         sampling_period: SamplingPeriodType | None = None,
         input_indicator: BaseIndicator | None = None,
         name: str | None = None,
+        lazy: bool = False,
     ):
         """
         Initialize the indicator.
@@ -38,20 +44,100 @@ class BaseIndicator(ABC):
             sampling_period (SamplingPeriodType | None): The sampling period.
             input_indicator (BaseIndicator | None): The input indicator.
             name (str | None): The name of the indicator.
+            lazy (bool): If True, the bars ingested by this indicator are only
+                buffered, and the values of this indicator and of the indicators
+                fed by it are computed when `output_values` (and so `value` or
+                `is_ready`) is read. Only the root of an input indicator chain
+                buffers bars. Defaults to False.
         """
         self._cache_size = cache_size
+        self._sampling_period = sampling_period
         self._sampler = (
             Sampler(period_type=sampling_period) if sampling_period else None
         )
         self._input_indicator = input_indicator
         self._previous_time = datetime.min
+        # [start, end) of the sampling period of previous_time, in POSIX seconds
+        self._period_bounds: tuple[float, float] = (np.inf, -np.inf)
         self._name = name or self.__class__.__name__
+        self._lazy = lazy
+        self._pending: list[OHLCV] = []
+        self._pending_bounds: tuple[float, float] = (np.inf, -np.inf)
+        self._root = input_indicator._root if input_indicator is not None else self
         self.calibrate_cache_size(input_indicator)
+        self._install_buffers()
+
+    # whether the indicator provides a vectorized kernel
+    supports_batch = property(
+        fget=lambda self: type(self)._ingest_batch is not BaseIndicator._ingest_batch
+    )
+    # set in __init__, which runs after talipp has initialized the indicator
+    _root: BaseIndicator | None = None
 
     cache_size = property(fget=lambda self: self._cache_size)
+    sampling_period = property(fget=lambda self: self._sampling_period)
     sampler = property(fget=lambda self: self._sampler)
+    input_indicator = property(fget=lambda self: self._input_indicator)
     previous_time = property(fget=lambda self: self._previous_time)
     name = property(fget=lambda self: self._name)
+    lazy = property(fget=lambda self: self._lazy)
+
+    @property
+    def output_values(self) -> list:
+        """
+        Get the output values.
+
+        Bars buffered by a lazy root indicator are computed first.
+
+        Returns:
+            list: The output values.
+        """
+        root = self._root
+        if root is not None and root._pending:
+            root._evaluate_pending()
+        return self._output_values
+
+    @output_values.setter
+    def output_values(self, values: list) -> None:
+        self._output_values = values
+
+    def evaluate(self) -> None:
+        """
+        Compute the bars buffered by the lazy root indicator, if any.
+        """
+        root = self._root
+        if root is not None and root._pending:
+            root._evaluate_pending()
+
+    def _evaluate_pending(self) -> None:
+        """Ingest the buffered bars."""
+        pending, self._pending = self._pending, []
+        self._pending_bounds = (np.inf, -np.inf)
+        for ohlcv in pending:
+            self._ingest_ohlcv(ohlcv)
+
+    def _defer(self, ohlcv: OHLCV) -> None:
+        """
+        Buffer a bar until the values are read.
+
+        With a sampling period, a bar in the same period as the last buffered
+        bar replaces it, so each period is computed from its last bar only.
+        The buffer is computed before it grows beyond `cache_size` bars.
+
+        Args:
+            ohlcv (OHLCV): The bar.
+        """
+        if self._sampler is not None and ohlcv.time:
+            start, end = self._pending_bounds
+            if self._pending and start <= ohlcv.time.timestamp() < end:
+                self._pending[-1] = ohlcv
+                return
+            if len(self._pending) >= max(self.cache_size or 0, 1):
+                self._evaluate_pending()
+            self._pending_bounds = self.period_bounds(ohlcv.time)
+        elif len(self._pending) >= max(self.cache_size or 0, 1):
+            self._evaluate_pending()
+        self._pending.append(ohlcv)
 
     def __repr__(self) -> str:
         """Return a string representation of the indicator.
@@ -110,6 +196,38 @@ class BaseIndicator(ABC):
             return
         return self.output_values[-1]
 
+    @property
+    def params(self) -> dict:
+        """
+        Get the parameters of the indicator.
+
+        The parameters are the constructor arguments that define the
+        calculation, i.e. all arguments except the input indicator, sampling
+        period, cache size and name.
+
+        Returns:
+            dict: The parameters of the indicator.
+        """
+        return {}
+
+    @property
+    def is_batchable(self) -> bool:
+        """
+        Check if a batch can be computed by the vectorized kernel.
+
+        The kernel is used when the indicator provides one, starts from an
+        empty state, is not sampled and does not feed other indicators.
+
+        Returns:
+            bool: True if the batch can be computed by the vectorized kernel, False otherwise.
+        """
+        return (
+            self.supports_batch
+            and self.sampler is None
+            and not self.output_listeners
+            and len(self.input_values) == 0
+        )
+
     @property
     def time(self) -> datetime:
         return (
@@ -129,6 +247,7 @@ class BaseIndicator(ABC):
             value (int): The cache size. Must be greater than 0.
         """
         self._cache_size = value
+        self._install_buffers()
 
     @previous_time.setter
     def previous_time(self, value: DateOrDatetime):
@@ -143,6 +262,28 @@ class BaseIndicator(ABC):
             value (DateOrDatetime): The new previous time.
         """
         self._previous_time = value
+        if self._sampler is not None:
+            start, end = self._period_bounds
+            if value == datetime.min:
+                self._period_bounds = (np.inf, -np.inf)
+            elif not start <= value.timestamp() < end:
+                self._period_bounds = self.period_bounds(value)
+
+    def period_bounds(self, timestamp: datetime) -> tuple[float, float]:
+        """
+        Get the sampling period that contains the given timestamp.
+
+        Args:
+            timestamp (datetime): The timestamp.
+
+        Returns:
+            tuple[float, float]: The start (inclusive) and end (exclusive) of the
+                period, in POSIX seconds.
+        """
+        start = self.sampler._normalize(timestamp)
+        unit, length = self.sampling_period.value
+        span = timedelta(seconds=length * Sampler.CONVERSION_TO_SEC[unit])
+        return start.timestamp(), (start + span).timestamp()
 
     def copy(self):
         """
@@ -156,6 +297,42 @@ class BaseIndicator(ABC):
         """
         return deepcopy(self)
 
+    def spawn(
+        self,
+        input_indicator: BaseIndicator | None = None,
+        cache_size: int | None = None,
+        name: str | None = None,
+    ) -> BaseIndicator:
+        """
+        Create a new indicator with the same configuration and fresh state.
+
+        The indicator is built from its constructor parameters instead of being
+        deep-copied, so no value is copied. Use it to create per-symbol
+        indicators from a prototype.
+
+        Args:
+            input_indicator (BaseIndicator | None): The input indicator of the new
+                indicator. If None, the input indicator chain of this indicator
+                is spawned as well.
+            cache_size (int | None): The cache size. If None, the cache size
+                of this indicator is used.
+            name (str | None): The name. If None, the name of this indicator
+                is used.
+
+        Returns:
+            BaseIndicator: The new indicator.
+        """
+        if input_indicator is None and self._input_indicator is not None:
+            input_indicator = self._input_indicator.spawn()
+        return type(self)(
+            **self.params,
+            input_indicator=input_indicator,
+            sampling_period=self.sampling_period,
+            cache_size=cache_size or self.cache_size,
+            name=name or self.name,
+            lazy=self.lazy,
+        )
+
     def calibrate_cache_size(self, input_indicator):
         """
         Calibrate the cache size of the input indicator.
@@ -173,6 +350,66 @@ class BaseIndicator(ABC):
                 self.cache_size, input_indicator.cache_size
             )
 
+    def _install_buffers(self) -> None:
+        """
+        Store the input and output values in ring buffers sized from the cache size.
+
+        The buffers hold one value more than `clean_cache` keeps, which is the
+        number of values visible while a new value is calculated. Values
+        already ingested are kept.
+        """
+        if not self.cache_size:
+            return
+        capacity = self._kept_length + 1
+        for attr in ("input_values", "output_values"):
+            values = getattr(self, attr)
+            if isinstance(values, RingBuffer):
+                if values.capacity < capacity:
+                    values.resize(capacity)
+            else:
+                setattr(self, attr, RingBuffer(max(capacity, len(values)), values))
+
+    def _remove_all_custom(self) -> None:
+        """Reinstall the ring buffers after talipp resets all values."""
+        super()._remove_all_custom()
+        if getattr(self, "_cache_size", None):
+            self._install_buffers()
+
+    def purge_oldest(self, size: int) -> None:
+        """
+        Purge the oldest input values.
+
+        Same as talipp's `purge_oldest`, except that the values are deleted in
+        place, so that ring buffers purge in O(1), and that the managed
+        sequences are also cut to the number of input values left. Some talipp
+        indicators append more than one value per input to them (e.g. RSI when
+        it reinitializes its averages), so they would otherwise grow with every
+        bar.
+
+        Args:
+            size (int): The number of oldest input values to purge.
+        """
+        for sub_indicator in self.sub_indicators:
+            sub_indicator.purge_oldest(size)
+
+        del self.input_values[:size]
+        self._purge_oldest_output_value(size)
+
+        kept = len(self.input_values)
+        for lst in self.managed_sequences:
+            if isinstance(lst, Indicator):
+                lst.purge_oldest(size)
+            else:
+                del lst[: max(size, len(lst) - kept)]
+
+        self._purge_oldest_custom(size)
+
+        for listener in self.output_listeners:
+            listener.purge_oldest(size)
+
+    def _purge_oldest_output_value(self, size: int) -> None:
+        del self.output_values[:size]
+
     def is_same_period(self, timestamp: DateOrDatetime | None) -> bool:
         """
         Check if the timestamp is in the same period as the previous time.
@@ -190,9 +427,9 @@ class BaseIndicator(ABC):
         """
         if not self.sampler or not timestamp:
             return False
-        norm_prev_time = self.sampler._normalize(self.previous_time)
-        norm_new_time = self.sampler._normalize(timestamp)
-        return norm_prev_time == norm_new_time
+        # bounds are updated when previous_time moves to another period
+        start, end = self._period_bounds
+        return start <= timestamp.timestamp() < end
 
     def clean_cache(self) -> None:
         """
@@ -208,9 +445,21 @@ class BaseIndicator(ABC):
         """
         if self.cache_size:
             # print(self.__class__.__name__, f"({self.cache_size})", "clean_cache")
-            purge_size = max(0, len(self.input_values) - self.cache_size)
+            purge_size = max(0, len(self.input_values) - self._kept_length)
             self.purge_oldest(purge_size)
 
+    @property
+    def _kept_length(self) -> int:
+        """
+        The number of input values kept by `clean_cache`.
+
+        A sampled indicator keeps one value more than the cache size: updating
+        the last value of a period removes it before adding it again, so the
+        calculation sees as many values as when the value was first added.
+        """
+        sampled = getattr(self, "_sampler", None) is not None
+        return self.cache_size + 1 if sampled else self.cache_size
+
     def make_ohlcv(
         self,
         open: Iterable[RealNumber] | None = None,
@@ -268,6 +517,7 @@ class BaseIndicator(ABC):
             volume: The volumes.
             timestamp: The timestamps.
         """
+        self.evaluate()
         if self._input_indicator is not None:
             return self._input_indicator.ingest(
                 open=open,
@@ -287,6 +537,266 @@ class BaseIndicator(ABC):
                 timestamp=timestamp,
             )
 
+    def ingest_scalar(
+        self,
+        open: RealNumber | None = None,
+        high: RealNumber | None = None,
+        low: RealNumber | None = None,
+        close: RealNumber | None = None,
+        volume: RealNumber | None = None,
+        timestamp: DateOrDatetime | None = None,
+    ) -> None:
+        """
+        Ingest the values of a single bar into the indicator.
+
+        Same as `ingest` with scalar values, but skips the type dispatch, which
+        makes it the cheapest way to update an indicator on every live bar.
+
+        Args:
+            open: The open price.
+            high: The high price.
+            low: The low price.
+            close: The close price.
+            volume: The volume.
+            timestamp: The timestamp.
+        """
+        indicator = self._root
+        if indicator._lazy:
+            return indicator._defer(OHLCV(open, high, low, close, volume, timestamp))
+        indicator._ingest_scalar(open, high, low, close, volume, timestamp)
+
+    def ingest_ohlcv(self, ohlcv: OHLCV) -> None:
+        """
+        Ingest a single bar given as an OHLCV object into the indicator.
+
+        Same as `ingest_scalar`, but the bar is built once by the caller and
+        can be shared by all the indicators of a symbol. Multi-input indicators
+        store the given object as is, so it must not be modified afterwards.
+
+        Args:
+            ohlcv (OHLCV): The bar.
+        """
+        indicator = self._root
+        if indicator._lazy:
+            return indicator._defer(ohlcv)
+        indicator._ingest_ohlcv(ohlcv)
+
+    def ingest_batch(
+        self,
+        open: Iterable[RealNumber] | None = None,
+        high: Iterable[RealNumber] | None = None,
+        low: Iterable[RealNumber] | None = None,
+        close: Iterable[RealNumber] | None = None,
+        volume: Iterable[RealNumber] | None = None,
+        timestamp: Iterable[DateOrDatetime] | None = None,
+    ):
+        """
+        Ingest a batch of values into the indicator.
+
+        If the indicator is batchable, the whole batch is computed in one pass by
+        the vectorized kernel and the streaming state is seeded from the result,
+        which is the same as ingesting the values bar by bar. Otherwise, the
+        values are ingested bar by bar.
+
+        Args:
+            open: The open prices.
+            high: The high prices.
+            low: The low prices.
+            close: The close prices.
+            volume: The volumes.
+            timestamp: The timestamps.
+        """
+        self.evaluate()
+        if self._input_indicator is not None:
+            return self._input_indicator.ingest_batch(
+                open=open,
+                high=high,
+                low=low,
+                close=close,
+                volume=volume,
+                timestamp=timestamp,
+            )
+        if self.is_batchable:
+            return self._ingest_batch(
+                open=open,
+                high=high,
+                low=low,
+                close=close,
+                volume=volume,
+                timestamp=timestamp,
+            )
+        return self._ingest_bars(open, high, low, close, volume, timestamp)
+
+    def _ingest_batch(
+        self,
+        open: Iterable[RealNumber] | None = None,
+        high: Iterable[RealNumber] | None = None,
+        low: Iterable[RealNumber] | None = None,
+        close: Iterable[RealNumber] | None = None,
+        volume: Iterable[RealNumber] | None = None,
+        timestamp: Iterable[DateOrDatetime] | None = None,
+    ) -> None:
+        """
+        Compute a batch with the vectorized kernel and seed the streaming state.
+
+        Indicators with a vectorized kernel override it, which sets
+        `supports_batch`. By default, the values are ingested bar by bar.
+        """
+        self._ingest_bars(open, high, low, close, volume, timestamp)
+
+    def _ingest_bars(
+        self,
+        open: Iterable[RealNumber] | None = None,
+        high: Iterable[RealNumber] | None = None,
+        low: Iterable[RealNumber] | None = None,
+        close: Iterable[RealNumber] | None = None,
+        volume: Iterable[RealNumber] | None = None,
+        timestamp: Iterable[DateOrDatetime] | None = None,
+    ) -> None:
+        """Ingest a batch bar by bar."""
+        self._ingest(
+            open=self._as_list(open),
+            high=self._as_list(high),
+            low=self._as_list(low),
+            close=self._as_list(close),
+            volume=self._as_list(volume),
+            timestamp=self._as_list(timestamp),
+        )
+
+    @staticmethod
+    def _as_list(values: Iterable | None) -> list | None:
+        """
+        Convert the values into a list of Python objects.
+
+        Args:
+            values (Iterable | None): The values to convert.
+
+        Returns:
+            list | None: The values as a list, or None if values is None.
+        """
+        if values is None:
+            return None
+        if isinstance(values, np.ndarray):
+            return values.tolist()
+        return list(values)
+
+    def _cached(self, values: Sequence) -> list:
+        """
+        Keep the values that remain in the cache after ingestion.
+
+        Args:
+            values (Sequence): The values of the whole batch.
+
+        Returns:
+            list: The last `cache_size` values, or all of them if the cache size is not set.
+        """
+        if self.cache_size:
+            values = values[-self.cache_size :]
+        return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+    @property
+    def _max_length(self) -> int | None:
+        """The maximum number of values visible to the streaming calculation."""
+        return self.cache_size + 1 if self.cache_size else None
+
+    def _purged_length(self, n: int) -> int:
+        """
+        The number of values purged from the cache after ingesting n values.
+
+        Args:
+            n (int): The number of ingested values.
+
+        Returns:
+            int: The number of purged values.
+        """
+        return max(0, n - self.cache_size) if self.cache_size else 0
+
+    def _seed(self, input_values: Sequence, output_values: np.ndarray) -> None:
+        """
+        Seed the input and output values from a computed batch.
+
+        Args:
+            input_values (Sequence): The input values of the whole batch.
+            output_values (np.ndarray): The output values of the whole batch,
+                NaN where no value is calculated.
+        """
+        self.input_values = self._cached(input_values)
+        self.output_values = [
+            None if x != x else x for x in self._cached(output_values)
+        ]
+        self._install_buffers()
+
+    def _seed_sub_indicator(
+        self, indicator: Indicator, input_values: Sequence, output_values: np.ndarray
+    ) -> None:
+        """
+        Seed a talipp sub-indicator from a computed batch.
+
+        Sub-indicators are fed every bar and purged along with this indicator.
+
+        Args:
+            indicator (Indicator): The sub-indicator.
+            input_values (Sequence): The input values of the whole batch.
+            output_values (np.ndarray): The output values of the whole batch,
+                NaN where no value is calculated.
+        """
+        indicator.input_values = self._cached(input_values)
+        indicator.output_values = [
+            None if x != x else x for x in self._cached(output_values)
+        ]
+
+    def _seed_sequence(self, sequence: list, values: np.ndarray, n: int) -> None:
+        """
+        Seed a managed sequence from a computed batch, in place.
+
+        Managed sequences are appended once per bar from their first value on
+        and purged along with the input values, so only the values that
+        outlive the purges of the batch are kept.
+
+        Args:
+            sequence (list): The managed sequence.
+            values (np.ndarray): The values appended to the sequence during
+                the batch.
+            n (int): The number of bars in the batch.
+        """
+        keep = max(0, len(values) - self._purged_length(n))
+        values = values[len(values) - keep :].tolist()
+        sequence[:] = [None if x != x else x for x in values]
+
+    def _cached_ohlcv(
+        self,
+        n: int,
+        open: Iterable[RealNumber] | None = None,
+        high: Iterable[RealNumber] | None = None,
+        low: Iterable[RealNumber] | None = None,
+        close: Iterable[RealNumber] | None = None,
+        volume: Iterable[RealNumber] | None = None,
+        timestamp: Iterable[DateOrDatetime] | None = None,
+    ) -> list[OHLCV]:
+        """
+        Build the bars that remain in the cache after ingesting a batch.
+
+        Only the cached bars are materialized as OHLCV.
+
+        Args:
+            n (int): The number of bars in the batch.
+            open: The open prices.
+            high: The high prices.
+            low: The low prices.
+            close: The close prices.
+            volume: The volumes.
+            timestamp: The timestamps.
+
+        Returns:
+            list[OHLCV]: The cached bars.
+        """
+        start = self._purged_length(n)
+        columns = [
+            self._as_list(x[start:]) if x is not None else [None] * (n - start)
+            for x in (open, high, low, close, volume, timestamp)
+        ]
+        return [OHLCV(*bar) for bar in zip(*columns)]
+
 
 class SingleInputMixin:
     """
@@ -334,15 +844,7 @@ class SingleInputMixin:
         Returns:
             None
         """
-        if self.is_same_period(timestamp):
-            self.update(close)
-        else:
-            self.add(close)
-
-        if timestamp:
-            self.previous_time = timestamp
-
-        self.clean_cache()
+        self._ingest_scalar(close=close, timestamp=timestamp)
 
     @_ingest.register
     def _(
@@ -385,7 +887,55 @@ class SingleInputMixin:
             None
         """
         for c, d in zip(close, timestamp):
-            self._ingest(c, d)
+            self._ingest_scalar(close=c, timestamp=d)
+
+    def _ingest_scalar(
+        self,
+        open: RealNumber | None = None,
+        high: RealNumber | None = None,
+        low: RealNumber | None = None,
+        close: RealNumber | None = None,
+        volume: RealNumber | None = None,
+        timestamp: DateOrDatetime | None = None,
+    ) -> None:
+        """
+        Ingests a single value into the indicator without type dispatch.
+
+        Only the close price is used.
+
+        Args:
+            open (RealNumber | None): The open price, not used.
+            high (RealNumber | None): The high price, not used.
+            low (RealNumber | None): The low price, not used.
+            close (RealNumber | None): The value to ingest.
+            volume (RealNumber | None): The volume, not used.
+            timestamp (DateOrDatetime | None): The timestamp of the value.
+                Defaults to None.
+
+        Returns:
+            None
+        """
+        if self.is_same_period(timestamp):
+            self.update(close)
+        else:
+            self.add(close)
+
+        if timestamp:
+            self.previous_time = timestamp
+
+        self.clean_cache()
+
+    def _ingest_ohlcv(self, ohlcv: OHLCV) -> None:
+        """
+        Ingests the close price of a bar into the indicator.
+
+        Args:
+            ohlcv (OHLCV): The bar.
+
+        Returns:
+            None
+        """
+        self._ingest_scalar(close=ohlcv.close, timestamp=ohlcv.time)
 
 
 class MultipleInputMixin:
@@ -430,18 +980,7 @@ class MultipleInputMixin:
         Returns:
             None
         """
-        # OHLCV use talipp's input sampling
-        ohlcv = self.make_ohlcv(
-            open=open,
-            high=high,
-            low=low,
-            close=close,
-            volume=volume,
-            timestamp=timestamp,
-        )
-        for value in ohlcv:
-            self.add(value)
-        self.clean_cache()
+        self._ingest_columns(open, high, low, close, volume, timestamp)
 
     @_ingest.register
     def _(
@@ -469,11 +1008,83 @@ class MultipleInputMixin:
         Returns:
             None
         """
-        return self._ingest(
-            [open] if open is not None else None,
-            [high] if high is not None else None,
-            [low] if low is not None else None,
-            [close] if close is not None else None,
-            [volume] if volume is not None else None,
-            [timestamp] if timestamp is not None else None,
+        return self._ingest_scalar(open, high, low, close, volume, timestamp)
+
+    def _ingest_scalar(
+        self,
+        open: RealNumber | None = None,
+        high: RealNumber | None = None,
+        low: RealNumber | None = None,
+        close: RealNumber | None = None,
+        volume: RealNumber | None = None,
+        timestamp: DateOrDatetime | None = None,
+    ) -> None:
+        """
+        Ingests a single value into the indicator without type dispatch.
+
+        Args:
+            open (RealNumber | None): The open price.
+            high (RealNumber | None): The high price.
+            low (RealNumber | None): The low price.
+            close (RealNumber | None): The close price.
+            volume (RealNumber | None): The volume.
+                Defaults to None.
+            timestamp (DateOrDatetime | None): The timestamp.
+                Defaults to None.
+
+        Returns:
+            None
+        """
+        self._ingest_ohlcv(OHLCV(open, high, low, close, volume, timestamp))
+
+    def _ingest_ohlcv(self, ohlcv: OHLCV) -> None:
+        """
+        Ingests a bar into the indicator.
+
+        Args:
+            ohlcv (OHLCV): The bar.
+
+        Returns:
+            None
+        """
+        # OHLCV use talipp's input sampling
+        self.add(ohlcv)
+        self.clean_cache()
+
+    def _ingest_columns(
+        self,
+        open: Iterable[RealNumber] | None,
+        high: Iterable[RealNumber] | None,
+        low: Iterable[RealNumber] | None,
+        close: Iterable[RealNumber] | None,
+        volume: Iterable[RealNumber] | None = None,
+        timestamp: Iterable[DateOrDatetime] | None = None,
+    ) -> None:
+        """
+        Ingests columns of values into the indicator.
+
+        Args:
+            open (Iterable[RealNumber] | None): The open prices.
+            high (Iterable[RealNumber] | None): The high prices.
+            low (Iterable[RealNumber] | None): The low prices.
+            close (Iterable[RealNumber] | None): The close prices.
+            volume (Iterable[RealNumber] | None): The volumes.
+                Defaults to None.
+            timestamp (Iterable[DateOrDatetime] | None): The timestamps.
+                Defaults to None.
+
+        Returns:
+            None
+        """
+        # OHLCV use talipp's input sampling
+        ohlcv = self.make_ohlcv(
+            open=open,
+            high=high,
+            low=low,
+            close=close,
+            volume=volume,
+            timestamp=timestamp,
         )
+        for value in ohlcv:
+            self.add(value)
+        self.clean_cache()
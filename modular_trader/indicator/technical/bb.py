@@ -0,0 +1,80 @@
+from typing import Iterable
+
+from talipp.indicators import BB as BaseBB
+from talipp.indicators.BB import BBVal
+from talipp.input import SamplingPeriodType
+
+from modular_trader.common.type_aliases import DateOrDatetime, RealNumber
+
+from . import kernels
+from .base import BaseIndicator, SingleInputMixin
+
+
+class BB(BaseIndicator, BaseBB, SingleInputMixin):
+    """
+    Bollinger Bands (BB)
+
+    Bollinger Bands are a volatility indicator made of a central band, which is
+    the simple moving average of a security's price, and a lower and an upper
+    band placed a multiple of the standard deviation of the price below and
+    above the central band. The bands widen when the volatility increases and
+    narrow when it decreases.
+
+    Args:
+        period (int): The period of the moving average and standard deviation.
+        std_dev_mult (float): The standard deviation multiplier.
+        input_indicator (BaseIndicator | None): The input indicator.
+        sampling_period (SamplingPeriodType | None): The sampling period.
+        cache_size (int | None): The cache size.
+        name (str | None): The name of the indicator.
+        lazy (bool): Whether the values are computed when read.
+    """
+
+    params = property(
+        fget=lambda self: {"period": self.period, "std_dev_mult": self.std_dev_mult}
+    )
+
+    def __init__(
+        self,
+        period: int,
+        std_dev_mult: float = 2.0,
+        input_indicator: BaseIndicator | None = None,
+        sampling_period: SamplingPeriodType | None = None,
+        cache_size: int | None = None,
+        name: str | None = None,
+        lazy: bool = False,
+    ):
+        cache_size = cache_size or period
+        assert cache_size >= period, f"Cache size must be at least {period}"
+        name = name or f"{self.__class__.__name__}_{period}_{std_dev_mult:g}"
+
+        BaseBB.__init__(self, period, std_dev_mult, input_indicator=input_indicator)
+        BaseIndicator.__init__(
+            self, cache_size, sampling_period, input_indicator, name, lazy
+        )
+
+    def _ingest_batch(
+        self,
+        close: Iterable[RealNumber],
+        timestamp: Iterable[DateOrDatetime] | None = None,
+        **kwargs,
+    ) -> None:
+        values = kernels.as_float_array(close)
+        n = len(values)
+        lower, central, upper, std = kernels.bb(
+            values, self.period, self.std_dev_mult, self._max_length
+        )
+
+        start = self._purged_length(n)
+        self.input_values = self._cached(values)
+        self.output_values = [
+            BBVal(lb, cb, ub) if cb == cb else None
+            for lb, cb, ub in zip(
+                lower[start:].tolist(), central[start:].tolist(), upper[start:].tolist()
+            )
+        ]
+        self._install_buffers()
+        self._seed_sub_indicator(self.central_band, values, central)
+        self._seed_sub_indicator(self.std_dev, values, std)
+        if timestamp is not None and len(timestamp) > 0:
+            self.previous_time = timestamp[-1]
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from collections.abc import MutableSequence
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+
+class RingBuffer(MutableSequence):
+    """Fixed-capacity ring buffer backed by a NumPy array.
+
+    The buffer behaves like a list for the operations used by talipp
+    indicators; appending to the end, removing from the end and purging from
+    the front all cost O(1), so the cost of a tick does not depend on the
+    cache size. If the capacity is exceeded, the buffer grows to keep list
+    semantics.
+
+    Attributes:
+        capacity (int): The number of values the buffer can hold.
+        dtype (np.dtype): The data type of the backing array.
+    """
+
+    __slots__ = ("_data", "_start", "_size")
+
+    def __init__(
+        self,
+        capacity: int,
+        values: Iterable[Any] | None = None,
+        dtype: np.dtype | type = object,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity (int): The number of values the buffer can hold.
+            values (Iterable[Any] | None): The initial values.
+            dtype (np.dtype | type): The data type of the backing array.
+                Defaults to object.
+        """
+        self._data = np.empty(max(capacity, 1), dtype=dtype)
+        self._start = 0
+        self._size = 0
+        if values is not None:
+            self._reset(list(values))
+
+    capacity = property(fget=lambda self: len(self._data))
+    dtype = property(fget=lambda self: self._data.dtype)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.to_numpy().tolist())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_numpy().tolist()})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (RingBuffer, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._size)
+            if step == 1:
+                return self._take(start, max(start, stop)).tolist()
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RingBuffer index out of range")
+        return self._data[(self._start + index) % len(self._data)]
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RingBuffer index out of range")
+        self._data[(self._start + index) % len(self._data)] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._size)
+            if start == 0 and step == 1:
+                # purge from the front
+                return self.popleft(max(0, stop))
+            values = self.to_numpy().tolist()
+            del values[index]
+            return self._reset(values)
+        if index < 0:
+            index += self._size
+        if index == self._size - 1:
+            self.pop()
+        elif index == 0:
+            self.popleft()
+        else:
+            values = self.to_numpy().tolist()
+            del values[index]
+            self._reset(values)
+
+    def insert(self, index: int, value: Any) -> None:
+        if index >= self._size:
+            return self.append(value)
+        values = self.to_numpy().tolist()
+        values.insert(index, value)
+        self._reset(values)
+
+    def append(self, value: Any) -> None:
+        """
+        Append a value to the end of the buffer.
+
+        Args:
+            value (Any): The value to append.
+        """
+        if self._size == len(self._data):
+            self._grow()
+        self._data[(self._start + self._size) % len(self._data)] = value
+        self._size += 1
+
+    def pop(self, index: int = -1) -> Any:
+        """
+        Remove and return the value at the given index.
+
+        Args:
+            index (int): The index of the value. Defaults to -1.
+
+        Returns:
+            Any: The removed value.
+        """
+        if self._size == 0:
+            raise IndexError("pop from empty RingBuffer")
+        if index not in (-1, self._size - 1):
+            value = self[index]
+            del self[index]
+            return value
+        self._size -= 1
+        position = (self._start + self._size) % len(self._data)
+        value = self._data[position]
+        self._data[position] = None if self._data.dtype == object else 0
+        return value
+
+    def popleft(self, size: int = 1) -> None:
+        """
+        Remove the given number of oldest values.
+
+        Args:
+            size (int): The number of values to remove. Defaults to 1.
+        """
+        size = min(size, self._size)
+        if size <= 0:
+            return
+        capacity = len(self._data)
+        if self._data.dtype == object:
+            # release references to purged values
+            for i in range(size):
+                self._data[(self._start + i) % capacity] = None
+        self._start = (self._start + size) % capacity
+        self._size -= size
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._data[:] = None if self._data.dtype == object else 0
+        self._start = 0
+        self._size = 0
+
+    def resize(self, capacity: int) -> None:
+        """
+        Change the capacity of the buffer, keeping the newest values.
+
+        Args:
+            capacity (int): The new capacity.
+        """
+        values = self.to_numpy().tolist()[-capacity:] if capacity > 0 else []
+        self._data = np.empty(max(capacity, 1), dtype=self._data.dtype)
+        self._reset(values)
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Return the values in order as a NumPy array.
+
+        Returns:
+            np.ndarray: A copy of the values, oldest first.
+        """
+        return self._take(0, self._size)
+
+    def tail(self, size: int) -> list[np.ndarray]:
+        """
+        Return the newest values as views on the backing array.
+
+        Args:
+            size (int): The number of values.
+
+        Returns:
+            list[np.ndarray]: One or two views, oldest first, holding together
+                the last `min(size, len(self))` values. They are invalidated by
+                the next change to the buffer.
+        """
+        size = min(max(size, 0), self._size)
+        capacity = len(self._data)
+        begin = (self._start + self._size - size) % capacity
+        end = begin + size
+        if end <= capacity:
+            return [self._data[begin:end]]
+        return [self._data[begin:], self._data[: end - capacity]]
+
+    def _take(self, start: int, stop: int) -> np.ndarray:
+        """Return the values between the logical indices start and stop."""
+        capacity = len(self._data)
+        begin = (self._start + start) % capacity
+        end = begin + (stop - start)
+        if end <= capacity:
+            return self._data[begin:end].copy()
+        return np.concatenate((self._data[begin:], self._data[: end - capacity]))
+
+    def _grow(self) -> None:
+        """Double the capacity of the buffer."""
+        self.resize(2 * len(self._data))
+
+    def _reset(self, values: list[Any]) -> None:
+        """Replace the content of the buffer with the given values."""
+        self.clear()
+        if len(values) > len(self._data):
+            self._data = np.empty(len(values), dtype=self._data.dtype)
+        # assigned one by one so that sequence values are not broadcast
+        for i, value in enumerate(values):
+            self._data[i] = value
+        self._size = len(values)
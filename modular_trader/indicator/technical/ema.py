@@ -0,0 +1,60 @@
+from typing import Iterable
+
+from talipp.indicators import EMA as BaseEMA
+from talipp.input import SamplingPeriodType
+
+from modular_trader.common.type_aliases import DateOrDatetime, RealNumber
+
+from . import kernels
+from .base import BaseIndicator, SingleInputMixin
+
+
+class EMA(BaseIndicator, BaseEMA, SingleInputMixin):
+    """
+    Exponential Moving Average (EMA)
+
+    The Exponential Moving Average (EMA) is a moving average that gives more
+    weight to the most recent prices, so it reacts faster to price changes
+    than the Simple Moving Average. It is initialized with the simple average
+    of the first period prices.
+
+    Args:
+        period (int): The number of periods to calculate the average over.
+        input_indicator (BaseIndicator | None): The input indicator.
+        sampling_period (SamplingPeriodType | None): The sampling period.
+        cache_size (int | None): The cache size.
+        name (str | None): The name of the indicator.
+        lazy (bool): Whether the values are computed when read.
+    """
+
+    params = property(fget=lambda self: {"period": self.period})
+
+    def __init__(
+        self,
+        period: int,
+        input_indicator: BaseIndicator | None = None,
+        sampling_period: SamplingPeriodType | None = None,
+        cache_size: int | None = None,
+        name: str | None = None,
+        lazy: bool = False,
+    ):
+        cache_size = cache_size or period
+        assert cache_size >= period, f"Cache size must be at least {period}"
+        name = name or f"{self.__class__.__name__}_{period}"
+
+        BaseEMA.__init__(self, period, input_indicator=input_indicator)
+        BaseIndicator.__init__(
+            self, cache_size, sampling_period, input_indicator, name, lazy
+        )
+
+    def _ingest_batch(
+        self,
+        close: Iterable[RealNumber],
+        timestamp: Iterable[DateOrDatetime] | None = None,
+        **kwargs,
+    ) -> None:
+        values = kernels.as_float_array(close)
+        output = kernels.ema(values, self.period, self._max_length)
+        self._seed(values, output)
+        if timestamp is not None and len(timestamp) > 0:
+            self.previous_time = timestamp[-1]
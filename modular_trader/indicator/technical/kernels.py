@@ -0,0 +1,565 @@
+"""Vectorized batch kernels for the technical indicators.
+
+The kernels compute a whole history in one pass and reproduce, value for
+value, what the streaming talipp implementation produces when the same
+history is ingested bar by bar with the cache cleaning done by
+`BaseIndicator.clean_cache`.
+
+Because the cache is purged after every bar, talipp only ever sees at most
+``max_length`` values (``cache_size + 1``) at the time a new value is
+calculated. Some indicators re-initialize themselves when the visible window
+has exactly ``period`` values, so the kernels take ``max_length`` into
+account to reproduce those re-initializations.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def as_float_array(values: Sequence[float] | np.ndarray | None) -> np.ndarray:
+    """
+    Convert the given values into a one-dimensional float64 array.
+
+    Args:
+        values (Sequence[float] | np.ndarray | None): The values to convert.
+
+    Returns:
+        np.ndarray: The values as a float64 array. An empty array is returned
+            when values is None.
+    """
+    if values is None:
+        return np.empty(0, dtype=np.float64)
+    return np.asarray(values, dtype=np.float64).reshape(-1)
+
+
+def visible_lengths(n: int, max_length: int | None) -> np.ndarray:
+    """
+    Number of values visible to the streaming calculation at each step.
+
+    Args:
+        n (int): The number of values.
+        max_length (int | None): The maximum number of visible values, i.e. the
+            cache size plus one. None means unlimited.
+
+    Returns:
+        np.ndarray: The visible length for each of the n steps.
+    """
+    lengths = np.arange(1, n + 1)
+    if max_length is not None:
+        np.minimum(lengths, max_length, out=lengths)
+    return lengths
+
+
+def sma(
+    values: np.ndarray, period: int, max_length: int | None = None
+) -> np.ndarray:
+    """
+    Simple Moving Average.
+
+    Reproduces talipp's `SMA`, which sums the first full window and then
+    updates the average recursively. When the visible window is capped at
+    ``period`` values the sum is recalculated on every step.
+
+    Args:
+        values (np.ndarray): The input values.
+        period (int): The period of the average.
+        max_length (int | None): The maximum number of visible values.
+
+    Returns:
+        np.ndarray: The averages, NaN where no value is calculated.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < period or (max_length is not None and max_length < period):
+        return out
+
+    if max_length == period:
+        # window is re-summed on every step
+        items = values.tolist()
+        out[period - 1 :] = [
+            float(sum(items[i - period + 1 : i + 1])) / period
+            for i in range(period - 1, n)
+        ]
+        return out
+
+    first = float(sum(values[:period].tolist())) / period
+    # out[i] = out[i - 1] - (x[i - period] - x[i]) / period
+    steps = (values[: n - period] - values[period:]) / float(period)
+    out[period - 1 :] = np.subtract.accumulate(np.concatenate(([first], steps)))
+    return out
+
+
+def rsi(
+    values: np.ndarray, period: int, max_length: int | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Relative Strength Index.
+
+    Reproduces talipp's `RSI`. The average gain and loss are initialized from
+    ``period - 1`` changes whenever the visible window holds exactly
+    ``period + 1`` values, and smoothed recursively otherwise.
+
+    Args:
+        values (np.ndarray): The input values.
+        period (int): The period of the RSI.
+        max_length (int | None): The maximum number of visible values.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The RSI values and the
+            average gain and loss sequences kept by talipp, in the order they
+            are appended.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < period + 1 or (max_length is not None and max_length < period + 1):
+        return out, np.empty(0), np.empty(0)
+
+    change = np.diff(values)
+    gains = np.where(change > 0, change, 0.0).tolist()
+    losses = np.where(change < 0, -change, 0.0).tolist()
+    reinit = max_length == period + 1
+
+    avg_gain: list[float] = []
+    avg_loss: list[float] = []
+    last_gain = last_loss = 0.0
+    for i in range(period, n):
+        if i == period or reinit:
+            last_gain = float(sum(gains[i - period : i - 1])) / (period - 1)
+            last_loss = float(sum(losses[i - period : i - 1])) / (period - 1)
+            avg_gain.append(last_gain)
+            avg_loss.append(last_loss)
+        last_gain = float(last_gain * (period - 1) + gains[i - 1]) / period
+        last_loss = float(last_loss * (period - 1) + losses[i - 1]) / period
+        avg_gain.append(last_gain)
+        avg_loss.append(last_loss)
+
+    gain_arr = np.asarray(avg_gain)
+    loss_arr = np.asarray(avg_loss)
+    # the final average of each step is the last one appended for that step
+    final_gain = gain_arr[1::2] if reinit else gain_arr[1:]
+    final_loss = loss_arr[1::2] if reinit else loss_arr[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = final_gain / final_loss
+        out[period:] = np.where(final_loss == 0, 100.0, 100.0 - (100.0 / (1.0 + rs)))
+    return out, gain_arr, loss_arr
+
+
+def stoch(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int,
+    smoothing_period: int,
+    max_length: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Stochastic Oscillator.
+
+    Reproduces talipp's `Stoch` with a simple moving average as the smoothing
+    average of %K.
+
+    Args:
+        high (np.ndarray): The high prices.
+        low (np.ndarray): The low prices.
+        close (np.ndarray): The close prices.
+        period (int): The period of %K.
+        smoothing_period (int): The period of %D.
+        max_length (int | None): The maximum number of visible values.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The %K and %D values, NaN where no
+            value is calculated.
+    """
+    n = len(close)
+    k = np.full(n, np.nan)
+    d = np.full(n, np.nan)
+    if n < period:
+        return k, d
+
+    max_high = sliding_window_view(high, period).max(axis=1)
+    min_low = sliding_window_view(low, period).min(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k[period - 1 :] = np.where(
+            max_high == min_low,
+            100.0,
+            100.0 * (close[period - 1 :] - min_low) / (max_high - min_low),
+        )
+
+    # the %D average sees one value per calculated %K, capped by the cache
+    d_max_length = None if max_length is None else max_length - period + 1
+    d[period - 1 :] = sma(k[period - 1 :], smoothing_period, d_max_length)
+    return k, d
+
+
+def recursive(
+    values: np.ndarray,
+    period: int,
+    max_length: int | None,
+    step: Callable[[float, float], float],
+) -> np.ndarray:
+    """
+    Average initialized from the first full window and updated recursively.
+
+    This is the pattern shared by talipp's `EMA`, `ATR` and the smoothing of
+    `ADX`: the first value is the mean of the first ``period`` values and each
+    following value is ``step(previous, value)``. When the visible window is
+    capped at ``period`` values the mean is recalculated on every step.
+
+    The recursion runs as a ufunc accumulation over Python floats, so that
+    every value goes through the very same arithmetic as the streaming
+    calculation.
+
+    Args:
+        values (np.ndarray): The input values.
+        period (int): The period of the average.
+        max_length (int | None): The maximum number of visible values.
+        step (Callable[[float, float], float]): Calculates a value from the
+            previous value and the current input value.
+
+    Returns:
+        np.ndarray: The averages, NaN where no value is calculated.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < period or (max_length is not None and max_length < period):
+        return out
+
+    items = values.tolist()
+    if max_length == period:
+        out[period - 1 :] = [
+            sum(items[i - period + 1 : i + 1]) / period for i in range(period - 1, n)
+        ]
+        return out
+
+    seed = np.empty(n - period + 1, dtype=object)
+    seed[0] = sum(items[:period]) / period
+    seed[1:] = items[period:]
+    out[period - 1 :] = np.frompyfunc(step, 2, 1).accumulate(seed)
+    return out
+
+
+def ema(
+    values: np.ndarray, period: int, max_length: int | None = None
+) -> np.ndarray:
+    """
+    Exponential Moving Average.
+
+    Reproduces talipp's `EMA`, initialized with the simple average of the
+    first ``period`` values.
+
+    Args:
+        values (np.ndarray): The input values.
+        period (int): The period of the average.
+        max_length (int | None): The maximum number of visible values.
+
+    Returns:
+        np.ndarray: The averages, NaN where no value is calculated.
+    """
+    mult = 2.0 / (period + 1.0)
+    return recursive(
+        values,
+        period,
+        max_length,
+        lambda previous, value: float(mult * value + (1.0 - mult) * previous),
+    )
+
+
+def wilder(
+    values: np.ndarray, period: int, max_length: int | None = None
+) -> np.ndarray:
+    """
+    Wilder's smoothing, as used by talipp's `ATR` and `ADX`.
+
+    Args:
+        values (np.ndarray): The input values.
+        period (int): The period of the smoothing.
+        max_length (int | None): The maximum number of visible values.
+
+    Returns:
+        np.ndarray: The smoothed values, NaN where no value is calculated.
+    """
+    return recursive(
+        values,
+        period,
+        max_length,
+        lambda previous, value: (previous * (period - 1) + value) / period,
+    )
+
+
+def macd(
+    values: np.ndarray,
+    fast_period: int,
+    slow_period: int,
+    signal_period: int,
+    max_length: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving Average Convergence Divergence.
+
+    Reproduces talipp's `MACD` with exponential moving averages.
+
+    Args:
+        values (np.ndarray): The input values.
+        fast_period (int): The period of the fast average.
+        slow_period (int): The period of the slow average.
+        signal_period (int): The period of the signal line.
+        max_length (int | None): The maximum number of visible values.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The fast
+            average, slow average, MACD and signal line, NaN where no value
+            is calculated.
+    """
+    n = len(values)
+    fast = ema(values, fast_period, max_length)
+    slow = ema(values, slow_period, max_length)
+    line = fast - slow
+    signal = np.full(n, np.nan)
+
+    valid = np.flatnonzero(line == line)
+    if len(valid) > 0:
+        # the signal line sees one value per calculated MACD, capped by the cache
+        start = valid[0]
+        signal_max_length = None if max_length is None else max(1, max_length - start)
+        signal[start:] = ema(line[start:], signal_period, signal_max_length)
+    return fast, slow, line, signal
+
+
+def stddev(
+    values: np.ndarray, period: int, max_length: int | None = None
+) -> np.ndarray:
+    """
+    Population standard deviation of a rolling window.
+
+    Reproduces talipp's `StdDev`, which calculates every window from scratch.
+
+    Args:
+        values (np.ndarray): The input values.
+        period (int): The size of the window.
+        max_length (int | None): The maximum number of visible values.
+
+    Returns:
+        np.ndarray: The standard deviations, NaN where no value is calculated.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < period or (max_length is not None and max_length < period):
+        return out
+
+    items = values.tolist()
+    result = []
+    for i in range(period - 1, n):
+        window = items[i - period + 1 : i + 1]
+        mean = sum(window) / period
+        result.append(math.sqrt(sum([(x - mean) ** 2 for x in window]) / period))
+    out[period - 1 :] = result
+    return out
+
+
+def bb(
+    values: np.ndarray,
+    period: int,
+    std_dev_mult: float,
+    max_length: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands.
+
+    Reproduces talipp's `BB` with a simple moving average as the central band.
+
+    Args:
+        values (np.ndarray): The input values.
+        period (int): The period of the bands.
+        std_dev_mult (float): The standard deviation multiplier.
+        max_length (int | None): The maximum number of visible values.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The lower,
+            central and upper bands and the standard deviation, NaN where no
+            value is calculated.
+    """
+    central = sma(values, period, max_length)
+    std = stddev(values, period, max_length)
+    return central - std_dev_mult * std, central, central + std_dev_mult * std, std
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    True range of each bar, the high-low range for the first one.
+
+    Args:
+        high (np.ndarray): The high prices.
+        low (np.ndarray): The low prices.
+        close (np.ndarray): The close prices.
+
+    Returns:
+        np.ndarray: The true ranges.
+    """
+    tr = high - low
+    if len(tr) > 1:
+        previous = close[:-1]
+        tr[1:] = np.maximum.reduce(
+            [tr[1:], np.abs(high[1:] - previous), np.abs(low[1:] - previous)]
+        )
+    return tr
+
+
+def atr(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int,
+    max_length: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Average True Range.
+
+    Reproduces talipp's `ATR`.
+
+    Args:
+        high (np.ndarray): The high prices.
+        low (np.ndarray): The low prices.
+        close (np.ndarray): The close prices.
+        period (int): The period of the average.
+        max_length (int | None): The maximum number of visible values.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The ATR values, NaN where no value is
+            calculated, and the true ranges.
+    """
+    tr = true_range(high, low, close)
+    return wilder(tr, period, max_length), tr
+
+
+def adx(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    di_period: int,
+    adx_period: int,
+    max_length: int | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Average Directional Index.
+
+    Reproduces talipp's `ADX`. The sequences kept by talipp start at different
+    bars; each one sees its values since its first bar, capped by the cache.
+
+    Args:
+        high (np.ndarray): The high prices.
+        low (np.ndarray): The low prices.
+        close (np.ndarray): The close prices.
+        di_period (int): The period of the directional indices.
+        adx_period (int): The period of the ADX.
+        max_length (int | None): The maximum number of visible values.
+
+    Returns:
+        dict[str, np.ndarray]: The sequences named after talipp's attributes,
+            each holding the values appended since its first bar: ``tr`` and
+            ``atr`` from the first bar, ``pdm`` and ``mdm`` from the second
+            bar, ``spdm``, ``smdm``, ``pdi``, ``mdi`` and ``dx`` from bar
+            ``di_period``, and ``adx``, aligned with ``dx`` and NaN where no
+            value is calculated.
+    """
+    n = len(high)
+    atr_values, tr = atr(high, low, close, di_period, max_length)
+
+    up = high[1:] - high[:-1]
+    down = low[:-1] - low[1:]
+    pdm = np.where((up > down) & (up > 0), up, 0.0)
+    mdm = np.where((down > up) & (down > 0), down, 0.0)
+
+    pdm_max_length = None if max_length is None else max(1, max_length - 1)
+    spdm = wilder(pdm, di_period, pdm_max_length)[di_period - 1 :]
+    smdm = wilder(mdm, di_period, pdm_max_length)[di_period - 1 :]
+
+    start = min(di_period, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        flat = atr_values[start:] == 0
+        pdi = np.where(flat, np.nan, 100.0 * spdm / atr_values[start:])
+        mdi = np.where(flat, np.nan, 100.0 * smdm / atr_values[start:])
+
+    # a flat ATR repeats the last index, which is only visible if the cache
+    # keeps more than the indices of the current bar
+    carry = max_length is None or max_length - 1 > di_period
+    pdi = _fill_forward(pdi, flat, carry, 0)
+    mdi = _fill_forward(mdi, flat, carry, 0)
+
+    denominator = pdi + mdi
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx = 100.0 * np.abs(pdi - mdi) / denominator
+    dx = _fill_forward(dx, denominator == 0, carry, 0)
+
+    dx_max_length = None if max_length is None else max(1, max_length - di_period)
+    return {
+        "tr": tr,
+        "atr": atr_values,
+        "pdm": pdm,
+        "mdm": mdm,
+        "spdm": spdm,
+        "smdm": smdm,
+        "pdi": pdi,
+        "mdi": mdi,
+        "dx": dx,
+        "adx": wilder(dx, adx_period, dx_max_length),
+    }
+
+
+def _fill_forward(
+    values: np.ndarray, mask: np.ndarray, carry: bool, default: float
+) -> np.ndarray:
+    """
+    Replace the masked values by the previous value, as talipp's
+    `previous_if_exists` does.
+
+    Args:
+        values (np.ndarray): The values.
+        mask (np.ndarray): Where the previous value is used.
+        carry (bool): Whether the previous value is visible. If False, the
+            default is used instead.
+        default (float): The value used when there is no previous value.
+
+    Returns:
+        np.ndarray: The filled values.
+    """
+    if not mask.any():
+        return values
+    values = values.copy()
+    if not carry:
+        values[mask] = default
+        return values
+    index = np.where(mask, 0, np.arange(len(values)))
+    np.maximum.accumulate(index, out=index)
+    filled = values[index]
+    # masked values with no unmasked value before them
+    filled[mask & (index == 0) & mask[0]] = default
+    return filled
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    On Balance Volume.
+
+    Reproduces talipp's `OBV`. The running total is accumulated in order, so
+    it is the same as adding the volumes one bar at a time.
+
+    Args:
+        close (np.ndarray): The close prices.
+        volume (np.ndarray): The volumes.
+
+    Returns:
+        np.ndarray: The OBV values.
+    """
+    signed = np.empty(len(close))
+    if len(close) == 0:
+        return signed
+    up = close[1:] > close[:-1]
+    down = close[1:] < close[:-1]
+    signed[0] = volume[0]
+    signed[1:] = np.where(up, volume[1:], np.where(down, -volume[1:], 0.0))
+    return np.add.accumulate(signed)
@@ -0,0 +1,108 @@
+from typing import Iterable
+
+from talipp.indicators import MACD as BaseMACD
+from talipp.indicators.MACD import MACDVal
+from talipp.input import SamplingPeriodType
+
+from modular_trader.common.type_aliases import DateOrDatetime, RealNumber
+
+from . import kernels
+from .base import BaseIndicator, SingleInputMixin
+
+
+class MACD(BaseIndicator, BaseMACD, SingleInputMixin):
+    """
+    Moving Average Convergence Divergence (MACD)
+
+    The MACD is a trend-following momentum indicator that shows the relationship
+    between a fast and a slow exponential moving average of a security's price.
+    The MACD line is the difference between the two averages, the signal line is
+    an exponential moving average of the MACD line, and the histogram is the
+    difference between the MACD line and the signal line.
+
+    Args:
+        fast_period (int): The period of the fast moving average.
+        slow_period (int): The period of the slow moving average.
+        signal_period (int): The period of the signal line.
+        input_indicator (BaseIndicator | None): The input indicator.
+        sampling_period (SamplingPeriodType | None): The sampling period.
+        cache_size (int | None): The cache size.
+        name (str | None): The name of the indicator.
+        lazy (bool): Whether the values are computed when read.
+    """
+
+    params = property(
+        fget=lambda self: {
+            "fast_period": self.ma_fast.period,
+            "slow_period": self.ma_slow.period,
+            "signal_period": self.signal_line.period,
+        }
+    )
+
+    def __init__(
+        self,
+        fast_period: int,
+        slow_period: int,
+        signal_period: int,
+        input_indicator: BaseIndicator | None = None,
+        sampling_period: SamplingPeriodType | None = None,
+        cache_size: int | None = None,
+        name: str | None = None,
+        lazy: bool = False,
+    ):
+        period = max(fast_period, slow_period)
+        cache_size = cache_size or (period + signal_period)
+        assert cache_size >= period, f"Cache size must be at least {period}"
+        name = name or (
+            f"{self.__class__.__name__}_{fast_period}_{slow_period}_{signal_period}"
+        )
+
+        BaseMACD.__init__(
+            self,
+            fast_period,
+            slow_period,
+            signal_period,
+            input_indicator=input_indicator,
+        )
+        BaseIndicator.__init__(
+            self, cache_size, sampling_period, input_indicator, name, lazy
+        )
+
+    def _ingest_batch(
+        self,
+        close: Iterable[RealNumber],
+        timestamp: Iterable[DateOrDatetime] | None = None,
+        **kwargs,
+    ) -> None:
+        values = kernels.as_float_array(close)
+        n = len(values)
+        fast, slow, line, signal = kernels.macd(
+            values,
+            self.ma_fast.period,
+            self.ma_slow.period,
+            self.signal_line.period,
+            self._max_length,
+        )
+
+        start = self._purged_length(n)
+        self.input_values = self._cached(values)
+        self.output_values = [
+            (
+                MACDVal(m, None, None)
+                if s != s
+                else MACDVal(m, s, m - s)
+            )
+            if m == m
+            else None
+            for m, s in zip(line[start:].tolist(), signal[start:].tolist())
+        ]
+        self._install_buffers()
+        self._seed_sub_indicator(self.ma_fast, values, fast)
+        self._seed_sub_indicator(self.ma_slow, values, slow)
+
+        # the signal line holds one value per calculated MACD
+        first = n - int((line == line).sum())
+        self._seed_sequence(self.signal_line.input_values, line[first:], n)
+        self._seed_sequence(self.signal_line.output_values, signal[first:], n)
+        if timestamp is not None and len(timestamp) > 0:
+            self.previous_time = timestamp[-1]
@@ -0,0 +1,66 @@
+from typing import Iterable
+
+from talipp.indicators import OBV as BaseOBV
+from talipp.input import SamplingPeriodType
+
+from modular_trader.common.type_aliases import DateOrDatetime, RealNumber
+
+from . import kernels
+from .base import BaseIndicator, MultipleInputMixin
+
+
+class OBV(BaseIndicator, BaseOBV, MultipleInputMixin):
+    """
+    On Balance Volume (OBV)
+
+    The On Balance Volume (OBV) is a momentum indicator that uses the volume
+    flow to predict changes in a security's price. The volume of a bar is
+    added to the running total when the price closes up, and subtracted when
+    the price closes down.
+
+    Args:
+        input_indicator (BaseIndicator | None): The input indicator.
+        sampling_period (SamplingPeriodType | None): The sampling period.
+        cache_size (int | None): The cache size.
+        name (str | None): The name of the indicator.
+        lazy (bool): Whether the values are computed when read.
+    """
+
+    def __init__(
+        self,
+        input_indicator: BaseIndicator | None = None,
+        sampling_period: SamplingPeriodType | None = None,
+        cache_size: int | None = None,
+        name: str | None = None,
+        lazy: bool = False,
+    ):
+        cache_size = cache_size or 1
+        name = name or self.__class__.__name__
+
+        BaseOBV.__init__(
+            self,
+            input_indicator=input_indicator,
+            input_sampling=sampling_period,
+        )
+        BaseIndicator.__init__(
+            self, cache_size, sampling_period, input_indicator, name, lazy
+        )
+
+    def _ingest_batch(
+        self,
+        open: Iterable[RealNumber] | None = None,
+        high: Iterable[RealNumber] | None = None,
+        low: Iterable[RealNumber] | None = None,
+        close: Iterable[RealNumber] | None = None,
+        volume: Iterable[RealNumber] | None = None,
+        timestamp: Iterable[DateOrDatetime] | None = None,
+    ) -> None:
+        n = len(close)
+        output = kernels.obv(
+            kernels.as_float_array(close), kernels.as_float_array(volume)
+        )
+        self._seed(
+            self._cached_ohlcv(n, open, high, low, close, volume, timestamp), output
+        )
+        if timestamp is not None and len(timestamp) > 0:
+            self.previous_time = timestamp[-1]
@@ -1,6 +1,11 @@
+from typing import Iterable
+
 from talipp.indicators import RSI as BaseRSI
 from talipp.input import SamplingPeriodType
 
+from modular_trader.common.type_aliases import DateOrDatetime, RealNumber
+
+from . import kernels
 from .base import BaseIndicator, SingleInputMixin
 
 
@@ -21,7 +26,11 @@ class RSI(BaseIndicator, BaseRSI, SingleInputMixin):
         sampling_period (SamplingPeriodType | None): The sampling period.
         cache_size (int | None): The cache size.
         name (str | None): The name of the indicator.
+        lazy (bool): Whether the values are computed when read.
     """
+
+    params = property(fget=lambda self: {"period": self.period})
+
     def __init__(
         self,
         period: int,
@@ -29,10 +38,31 @@ class RSI(BaseIndicator, BaseRSI, SingleInputMixin):
         sampling_period: SamplingPeriodType | None = None,
         cache_size: int | None = None,
         name: str | None = None,
+        lazy: bool = False,
     ):
         cache_size = cache_size or period
         assert cache_size >= period, f"Cache size must be at least {self.period}"
         name = name or f"{self.__class__.__name__}_{period}"
 
         BaseRSI.__init__(self, period, input_indicator=input_indicator)
-        BaseIndicator.__init__(self, cache_size, sampling_period, input_indicator, name)
+        BaseIndicator.__init__(
+            self, cache_size, sampling_period, input_indicator, name, lazy
+        )
+
+    def _ingest_batch(
+        self,
+        close: Iterable[RealNumber],
+        timestamp: Iterable[DateOrDatetime] | None = None,
+        **kwargs,
+    ) -> None:
+        values = kernels.as_float_array(close)
+        output, avg_gain, avg_loss = kernels.rsi(values, self.period, self._max_length)
+        self._seed(values, output)
+        # averages are purged along with the input values, and cut to their
+        # number as by `purge_oldest`
+        keep = max(0, len(avg_gain) - self._purged_length(len(values)))
+        keep = min(keep, len(self.input_values))
+        self.avg_gain[:] = avg_gain[len(avg_gain) - keep :].tolist()
+        self.avg_loss[:] = avg_loss[len(avg_loss) - keep :].tolist()
+        if timestamp is not None and len(timestamp) > 0:
+            self.previous_time = timestamp[-1]
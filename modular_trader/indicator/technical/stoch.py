@@ -1,6 +1,12 @@
+from typing import Iterable
+
 from talipp.indicators import Stoch as BaseSTOCH
+from talipp.indicators.Stoch import StochVal
 from talipp.input import SamplingPeriodType
 
+from modular_trader.common.type_aliases import DateOrDatetime, RealNumber
+
+from . import kernels
 from .base import BaseIndicator, MultipleInputMixin
 
 
@@ -19,8 +25,16 @@ class STOCH(BaseIndicator, BaseSTOCH, MultipleInputMixin):
         sampling_period (SamplingPeriodType | None): The sampling period.
         cache_size (int | None): The cache size.
         name (str | None): The name of the indicator.
+        lazy (bool): Whether the values are computed when read.
     """
 
+    params = property(
+        fget=lambda self: {
+            "period": self.period,
+            "smoothing_period": self.values_d.period,
+        }
+    )
+
     def __init__(
         self,
         period: int,
@@ -29,6 +43,7 @@ class STOCH(BaseIndicator, BaseSTOCH, MultipleInputMixin):
         sampling_period: SamplingPeriodType | None = None,
         cache_size: int | None = None,
         name: str | None = None,
+        lazy: bool = False,
     ):
         cache_size = cache_size or (period + smoothing_period)
         assert cache_size >= period, f"Cache size must be at least {self.period}"
@@ -41,4 +56,43 @@ class STOCH(BaseIndicator, BaseSTOCH, MultipleInputMixin):
             input_indicator=input_indicator,
             input_sampling=sampling_period,
         )
-        BaseIndicator.__init__(self, cache_size, sampling_period, input_indicator, name)
+        BaseIndicator.__init__(
+            self, cache_size, sampling_period, input_indicator, name, lazy
+        )
+
+    def _ingest_batch(
+        self,
+        open: Iterable[RealNumber] | None = None,
+        high: Iterable[RealNumber] | None = None,
+        low: Iterable[RealNumber] | None = None,
+        close: Iterable[RealNumber] | None = None,
+        volume: Iterable[RealNumber] | None = None,
+        timestamp: Iterable[DateOrDatetime] | None = None,
+    ) -> None:
+        n = len(close)
+        k, d = kernels.stoch(
+            kernels.as_float_array(high),
+            kernels.as_float_array(low),
+            kernels.as_float_array(close),
+            self.period,
+            self.values_d.period,
+            self._max_length,
+        )
+
+        start = self._purged_length(n)
+        self.input_values = self._cached_ohlcv(
+            n, open, high, low, close, volume, timestamp
+        )
+        self.output_values = [
+            StochVal(k_, None if d_ != d_ else d_) if k_ == k_ else None
+            for k_, d_ in zip(k[start:].tolist(), d[start:].tolist())
+        ]
+        self._install_buffers()
+
+        # %D average holds one value per calculated %K, purged with the input
+        n_k = max(0, n - self.period + 1)
+        keep = max(0, n_k - self._purged_length(n))
+        self.values_d.input_values = k[n - keep :].tolist()
+        self.values_d.output_values = [
+            None if x != x else x for x in d[n - keep :].tolist()
+        ]
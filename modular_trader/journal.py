@@ -0,0 +1,344 @@
+"""Append-only journal of a record.
+
+Each save appends one JSON line with the sections (top-level keys) of the
+record that changed since the previous save. Sections that are mappings are
+diffed one level down: only their entries that changed are written, under
+"patch", and their removed entries under "unset", so saving one symbol of a
+mapping of all symbols writes that symbol only::
+
+    {"time":"2024-01-02T14:30:00.000000+00:00","set":{"timestamp":...},
+     "patch":{"indicators":{"AAPL":{...}}},"unset":{"indicators":["MSFT"]}}
+
+Every `checkpoint_interval` saves, a line with all the sections is written
+instead, so the state at a time is rebuilt from the last checkpoint before it
+rather than from the start of the journal::
+
+    {"time":"2024-01-02T14:30:00.000000+00:00","full":{...}}
+
+Times are UTC with a fixed width, so the time and kind of a line are read from
+its prefix without parsing the whole line. Compaction folds the lines older
+than a given time into one checkpoint; with a retention, it runs at each
+checkpoint.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator, Mapping
+
+# '{"time":"<32 chars>","full":' and '{"time":"<32 chars>","set":'
+_TIME = slice(9, 41)
+_KIND = slice(44, 48)
+
+
+def _now() -> str:
+    """Get the current UTC time in the fixed-width journal format."""
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _format_time(timestamp: datetime | str) -> str:
+    """Convert a time to the fixed-width journal format; naive times are UTC."""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _compact(value: Any) -> str:
+    """Serialize a section as compact JSON text."""
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def _object(items: Mapping[Any, str | Mapping[Any, str]]) -> str:
+    """Build a JSON object from serialized values, or mappings of them."""
+    body = ",".join(
+        f"{json.dumps(str(k))}:{v if isinstance(v, str) else _object(v)}"
+        for k, v in items.items()
+    )
+    return f"{{{body}}}"
+
+
+def _line(
+    time: str,
+    kind: str,
+    sections: Mapping[Any, str | Mapping[Any, str]],
+    patches: Mapping[Any, Mapping[Any, str]] | None = None,
+    removed: Mapping[Any, Iterable[Any]] | None = None,
+) -> str:
+    """Build a journal line from serialized sections and section entries."""
+    line = f'{{"time":"{time}","{kind}":{_object(sections)}'
+    if patches:
+        line += f',"patch":{_object(patches)}'
+    if removed:
+        line += ',"unset":' + _compact(
+            {str(k): [str(x) for x in keys] for k, keys in removed.items()}
+        )
+    return line + "}\n"
+
+
+def _apply(state: dict[str, Any], entry: Mapping[str, Any]) -> None:
+    """Apply a parsed journal line to a state."""
+    state.update(entry.get("full", entry.get("set")))
+    for key, items in entry.get("patch", {}).items():
+        section = state.get(key, None)
+        if not isinstance(section, dict):
+            section = state[key] = {}
+        section.update(items)
+    for key, keys in entry.get("unset", {}).items():
+        section = state.get(key, None)
+        if isinstance(section, dict):
+            for x in keys:
+                section.pop(x, None)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class JournalEntry:
+    """A save of a journal.
+
+    Attributes:
+        time (datetime): The time of the save.
+        full (bool): Whether the save is a checkpoint, with all the sections.
+        sections (dict[str, Any]): The sections set as a whole.
+        patches (dict[str, dict[str, Any]]): The entries set in each mapping
+            section.
+        removed (dict[str, list[str]]): The entries removed from each mapping
+            section.
+    """
+
+    time: datetime
+    full: bool
+    sections: dict[str, Any]
+    patches: dict[str, dict[str, Any]] = dataclasses.field(default_factory=dict)
+    removed: dict[str, list[str]] = dataclasses.field(default_factory=dict)
+
+
+class RecordJournal:
+    """Append-only JSON Lines journal of a record.
+
+    Attributes:
+        path (os.PathLike): The journal file.
+        checkpoint_interval (int): The number of saves between two checkpoints.
+        retention (timedelta | None): How long the saves are kept before being
+            folded into a checkpoint. If None, the journal is not compacted
+            automatically.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike,
+        checkpoint_interval: int = 1000,
+        retention: timedelta | None = None,
+    ):
+        """
+        Initialize the journal.
+
+        Args:
+            path (os.PathLike): The journal file, created on the first save.
+            checkpoint_interval (int): The number of saves between two
+                checkpoints.
+            retention (timedelta | None): How long the saves are kept before
+                being folded into a checkpoint.
+        """
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self.retention = retention
+        # serialized sections, or serialized entries of the mapping sections
+        self._sections: dict[str, str | dict[str, str]] | None = None
+        self._since_checkpoint = 0
+        self._lock = threading.RLock()
+
+    def append(
+        self,
+        changed: Mapping[Any, str | Mapping[Any, str]],
+        patches: Mapping[Any, Mapping[Any, str]] | None = None,
+        removed: Mapping[Any, Iterable[Any]] | None = None,
+    ) -> None:
+        """
+        Append a save to the journal.
+
+        Args:
+            changed (Mapping[Any, str | Mapping[Any, str]]): The sections set
+                as a whole, as compact JSON text or, for mapping sections, as
+                a mapping of entries to compact JSON text.
+            patches (Mapping[Any, Mapping[Any, str]] | None): The entries that
+                changed in mapping sections, as compact JSON text.
+            removed (Mapping[Any, Iterable[Any]] | None): The entries removed
+                from mapping sections.
+        """
+        with self._lock:
+            if self._sections is None:
+                self._repair()
+                # the sections saved by a previous run, for the checkpoints
+                self._sections = {k: _compact(v) for k, v in self.state_at().items()}
+                self._since_checkpoint = int(bool(self._sections))
+            self._update(changed, patches or {}, removed or {})
+            checkpoint = self._since_checkpoint == 0
+            time = _now()
+            if checkpoint:
+                line = _line(time, "full", self._sections)
+            else:
+                line = _line(time, "set", changed, patches, removed)
+            with open(self.path, "a") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._since_checkpoint = (
+                self._since_checkpoint + 1
+            ) % self.checkpoint_interval
+            if checkpoint and self.retention is not None:
+                self.compact(datetime.fromisoformat(time) - self.retention)
+
+    def _update(
+        self,
+        changed: Mapping[Any, str | Mapping[Any, str]],
+        patches: Mapping[Any, Mapping[Any, str]],
+        removed: Mapping[Any, Iterable[Any]],
+    ) -> None:
+        """Apply a save to the serialized sections kept for the checkpoints."""
+        for key, value in changed.items():
+            if not isinstance(value, str):
+                value = {str(k): v for k, v in value.items()}
+            self._sections[str(key)] = value
+        for key, items in patches.items():
+            self._entries(str(key)).update((str(k), v) for k, v in items.items())
+        for key, keys in removed.items():
+            if str(key) in self._sections:
+                entries = self._entries(str(key))
+                for x in keys:
+                    entries.pop(str(x), None)
+
+    def _entries(self, key: str) -> dict[str, str]:
+        """Get the serialized entries of a mapping section, to update them."""
+        section = self._sections.get(key, None)
+        if isinstance(section, str):
+            # set as a whole, e.g. by a previous run
+            value = json.loads(section)
+            section = None
+            if isinstance(value, dict):
+                section = {k: _compact(v) for k, v in value.items()}
+        if section is None:
+            section = {}
+        self._sections[key] = section
+        return section
+
+    def _repair(self) -> None:
+        """Drop the partial last line left by an interrupted save."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)
+
+    def _lines(self) -> Iterator[tuple[str, str, str]]:
+        """Iterate over the complete lines as (time, kind, line)."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                # the last line is partial if a save was interrupted
+                if not line.endswith("\n"):
+                    return
+                yield line[_TIME], line[_KIND], line
+
+    def entries(self, since: datetime | str | None = None) -> Iterator[JournalEntry]:
+        """
+        Iterate over the saves of the journal, oldest first.
+
+        Args:
+            since (datetime | str | None): Skip the saves before this time.
+
+        Yields:
+            JournalEntry: The saves.
+        """
+        start = None if since is None else _format_time(since)
+        for time, kind, line in self._lines():
+            if start is not None and time < start:
+                continue
+            entry = json.loads(line)
+            full = "full" in entry
+            yield JournalEntry(
+                datetime.fromisoformat(entry["time"]),
+                full,
+                entry["full"] if full else entry["set"],
+                entry.get("patch", {}),
+                entry.get("unset", {}),
+            )
+
+    def state_at(self, timestamp: datetime | str | None = None) -> dict[str, Any]:
+        """
+        Rebuild the record as it was saved at a time.
+
+        Only the lines from the last checkpoint at or before the time are
+        parsed.
+
+        Args:
+            timestamp (datetime | str | None): The time. Naive times are UTC.
+                Defaults to the latest state.
+
+        Returns:
+            dict[str, Any]: The record, empty if nothing was saved by then.
+        """
+        end = None if timestamp is None else _format_time(timestamp)
+        lines: list[str] = []
+        for time, kind, line in self._lines():
+            if end is not None and time > end:
+                break
+            if kind == "full":
+                lines.clear()
+            lines.append(line)
+        state: dict[str, Any] = {}
+        for line in lines:
+            _apply(state, json.loads(line))
+        return state
+
+    def compact(self, before: datetime | str | None = None) -> None:
+        """
+        Fold the saves before a time into one checkpoint.
+
+        The journal is rewritten to a temporary file and moved into place, so
+        readers see either journal.
+
+        Args:
+            before (datetime | str | None): Keep the saves from this time on.
+                Defaults to folding all saves.
+        """
+        end = None if before is None else _format_time(before)
+        with self._lock:
+            state: dict[str, Any] = {}
+            folded = None
+            kept: list[str] = []
+            for time, kind, line in self._lines():
+                if end is None or time < end:
+                    _apply(state, json.loads(line))
+                    folded = time
+                else:
+                    kept.append(line)
+            if folded is None:
+                return
+            sections = {k: _compact(v) for k, v in state.items()}
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                os.chmod(tmp_path, 0o644)
+                with os.fdopen(fd, "w") as f:
+                    f.write(_line(folded, "full", sections))
+                    f.writelines(kept)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
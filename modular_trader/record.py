@@ -1,12 +1,21 @@
 import json
 import os
-from typing import Any, Mapping
+import tempfile
+import threading
+from datetime import timedelta
+from typing import Any, Callable, Mapping
 
 from benedict import benedict
+from loguru import logger
 from pydantic import Field
 from pydantic.dataclasses import dataclass
 
-from modular_trader.common.constants import DEFAULT_RECORD_PATH
+from modular_trader.common.constants import (
+    DEFAULT_RECORD_JOURNAL_PATH,
+    DEFAULT_RECORD_PATH,
+)
+from modular_trader.common.enums import RecordFormat
+from modular_trader.journal import RecordJournal
 
 
 @dataclass
@@ -14,13 +23,70 @@ class Recorder:
     """
     Recorder to store and save data to disk.
 
+    The record is written as one JSON document, section by section: each
+    top-level key is a section, serialized again only when it was set since the
+    last write, and the file is not rewritten if no section changed. The file
+    is replaced atomically, so readers never see a partial record.
+
+    With `save_format=RecordFormat.JOURNAL`, each save instead appends the
+    changed sections to a `RecordJournal`, and only the changed entries of the
+    sections that are mappings (e.g. the indicator values by symbol), so the
+    cost of a save grows with the changes and every saved state stays
+    available (`RecordJournal.state_at`).
+
+    With the background writer started (`start`), `save_to_disk` only wakes the
+    writer thread, which waits `save_interval` seconds to merge a burst of
+    updates and writes them at once, off the event loop.
+
     Attributes:
-        record: Mapping of data to be stored.
-        save_path: Path to save the data to.
+        record: Mapping of data to be stored. Keys are plain keys, not
+            keypaths, so they may contain dots (e.g. symbols like "BRK.B").
+        save_path: Path to save the data to. Defaults to `DEFAULT_RECORD_PATH`,
+            or `DEFAULT_RECORD_JOURNAL_PATH` for a journal.
+        save_format: The file format.
+        journal_checkpoint_interval: The number of saves between two
+            checkpoints of the journal.
+        journal_retention: How long the saves are kept in the journal before
+            being folded into a checkpoint. If None, all saves are kept.
+        journal: The journal, if `save_format` is `RecordFormat.JOURNAL`.
+        save_interval: Seconds the background writer waits after an update
+            before writing, to merge the updates of the interval.
     """
 
-    record: Mapping[Any, Any] = Field(default_factory=benedict)
-    save_path: os.PathLike = Field(default=DEFAULT_RECORD_PATH)
+    record: Mapping[Any, Any] = Field(
+        default_factory=lambda: benedict(keypath_separator=None)
+    )
+    save_path: os.PathLike | None = Field(default=None)
+    save_interval: float = Field(default=1.0)
+    save_format: RecordFormat = Field(default=RecordFormat.JSON)
+    journal_checkpoint_interval: int = Field(default=1000)
+    journal_retention: timedelta | None = Field(default=None)
+    _journal: Any = Field(default=None)
+    _dirty: set[Any] = Field(default_factory=set)
+    _deferred: dict[Any, Callable[[], Any]] = Field(default_factory=dict)
+    _sections: dict[Any, Any] = Field(default_factory=dict)
+    _lock: Any = Field(default_factory=threading.Lock)
+    _write_lock: Any = Field(default_factory=threading.Lock)
+    _changed: Any = Field(default_factory=threading.Event)
+    _stopped: Any = Field(default_factory=threading.Event)
+    _writer: Any = Field(default=None)
+
+    journal = property(fget=lambda self: self._journal)
+    is_running = property(
+        fget=lambda self: self._writer is not None and self._writer.is_alive()
+    )
+
+    def __post_init__(self) -> None:
+        if self.save_format == RecordFormat.JOURNAL:
+            if self.save_path is None:
+                self.save_path = DEFAULT_RECORD_JOURNAL_PATH
+            self._journal = RecordJournal(
+                self.save_path,
+                self.journal_checkpoint_interval,
+                self.journal_retention,
+            )
+        elif self.save_path is None:
+            self.save_path = DEFAULT_RECORD_PATH
 
     def __getitem__(self, key: Any) -> Any:
         """
@@ -42,11 +108,178 @@ class Recorder:
             key: The key to set.
             value: The value to set.
         """
-        self.record[key] = value
+        with self._lock:
+            self._deferred.pop(key, None)
+            self.record[key] = value
+            self._dirty.add(key)
+
+    def defer(self, key: Any, func: Callable[[], Any]) -> None:
+        """
+        Set the value of a key to be computed by `func` when it is written.
+
+        Expensive values, e.g. from a REST call, are then computed once per
+        write instead of once per update, and by the background writer if it
+        is running. `func` then runs on the writer thread, so it must not read
+        state modified by the event loop, such as indicators; set such values
+        as plain copies instead.
+
+        Args:
+            key: The key to set.
+            func: Called without arguments to get the value.
+        """
+        with self._lock:
+            self._deferred[key] = func
+            self._dirty.add(key)
 
     def save_to_disk(self) -> None:
         """
         Save the record to disk.
+
+        If the background writer is running, the save is left to it and merged
+        with the other saves of the interval. Otherwise the record is written
+        now.
+        """
+        if self.is_running:
+            self._changed.set()
+        else:
+            self.flush()
+
+    def flush(self) -> bool:
         """
-        with open(self.save_path, "w") as f:
-            json.dump(self.record, f, indent=4, default=str)
+        Write the sections set since the last write.
+
+        Returns:
+            bool: Whether the file was written.
+        """
+        with self._write_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+                deferred = {
+                    k: self._deferred.pop(k) for k in dirty & self._deferred.keys()
+                }
+                values = {k: self.record[k] for k in dirty if k in self.record}
+            try:
+                return self._flush(values, deferred)
+            except BaseException:
+                # written again by the next flush
+                with self._lock:
+                    for key, func in deferred.items():
+                        self._deferred.setdefault(key, func)
+                    self._dirty |= dirty
+                    for key in dirty:
+                        self._sections.pop(key, None)
+                raise
+
+    def _flush(
+        self, values: dict[Any, Any], deferred: Mapping[Any, Callable[[], Any]]
+    ) -> bool:
+        """Serialize the given sections and write the file if one changed."""
+        for key, func in deferred.items():
+            values[key] = func()
+            with self._lock:
+                # unless set again meanwhile
+                if key not in self._dirty:
+                    self.record[key] = values[key]
+
+        if self._journal is not None:
+            return self._append(values)
+        changed = []
+        for key, value in values.items():
+            text = json.dumps(value, indent=4, default=str)
+            if self._sections.get(key, None) != text:
+                self._sections[key] = text
+                changed.append(key)
+        if not changed and os.path.exists(self.save_path):
+            return False
+        self._write({k: self._sections[k] for k in self.record if k in self._sections})
+        return True
+
+    def _append(self, values: dict[Any, Any]) -> bool:
+        """Append the entries that changed in the given sections to the journal."""
+        changed: dict[Any, Any] = {}
+        patches: dict[Any, dict[str, str]] = {}
+        removed: dict[Any, list[str]] = {}
+        for key, value in values.items():
+            previous = self._sections.get(key, None)
+            if not isinstance(value, Mapping):
+                text = json.dumps(value, separators=(",", ":"), default=str)
+                if previous != text:
+                    self._sections[key] = changed[key] = text
+                continue
+            # diffed by entry, e.g. by symbol
+            entries = {
+                str(k): json.dumps(v, separators=(",", ":"), default=str)
+                for k, v in value.items()
+            }
+            self._sections[key] = entries
+            if not isinstance(previous, dict):
+                changed[key] = entries
+                continue
+            patch = {k: v for k, v in entries.items() if previous.get(k, None) != v}
+            if patch:
+                patches[key] = patch
+            gone = [k for k in previous if k not in entries]
+            if gone:
+                removed[key] = gone
+        if not (changed or patches or removed):
+            return False
+        self._journal.append(changed, patches, removed)
+        return True
+
+    def _write(self, sections: Mapping[Any, str]) -> None:
+        """Replace the file with the given serialized sections."""
+        # same layout as json.dump(record, indent=4)
+        items = ",\n".join(
+            f"    {json.dumps(str(k))}: {text.replace(chr(10), chr(10) + '    ')}"
+            for k, text in sections.items()
+        )
+        document = "{\n" + items + "\n}" if items else "{}"
+        directory = os.path.dirname(os.path.abspath(self.save_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            os.chmod(tmp_path, 0o644)
+            with os.fdopen(fd, "w") as f:
+                f.write(document)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.save_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def start(self) -> None:
+        """
+        Start the background writer thread.
+        """
+        if self.is_running:
+            return
+        self._stopped.clear()
+        self._writer = threading.Thread(
+            target=self._run, name="recorder-writer", daemon=True
+        )
+        self._writer.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background writer thread, writing the pending updates.
+        """
+        if not self.is_running:
+            return
+        self._stopped.set()
+        self._changed.set()
+        self._writer.join()
+        self._writer = None
+
+    def _run(self) -> None:
+        """Write the updates of each interval until stopped."""
+        while not self._stopped.is_set():
+            self._changed.wait()
+            # merge the updates arriving during the interval
+            self._stopped.wait(self.save_interval)
+            self._changed.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # keep writing the next updates, e.g. after a full disk
+                logger.warning(f"Cannot save record to {self.save_path}: {e!r}")
+        self.flush()
@@ -1,4 +1,5 @@
 from .alpaca import AlpacaTrader
+from .barrier import BarBarrier
 from .base import BaseTrader
 
-__all__ = ["BaseTrader", "AlpacaTrader"]
+__all__ = ["BaseTrader", "AlpacaTrader", "BarBarrier"]
@@ -1,27 +1,34 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 import math
-from typing import TYPE_CHECKING
+import os
+from typing import TYPE_CHECKING, Any, Iterable
 
 import pendulum
 from alpaca.common.exceptions import APIError
 from alpaca.data.enums import Adjustment
 from alpaca.data.timeframe import TimeFrame
 from alpaca.trading.enums import AssetClass
+from talipp.input import SamplingPeriodType
 
+from modular_trader.common.enums import LateBarPolicy
 from modular_trader.context import Context
 from modular_trader.engine.alpaca import AlpacaEngine
 from modular_trader.framework.collection import FrameworkCollection
 from modular_trader.indicator.handler.alpaca import AlpacaIndicatorHandler, Frequency
+from modular_trader.indicator.resample import BarResampler
 from modular_trader.record import Recorder
 
+from .barrier import BarBarrier
 from .base import BaseTrader
 
 if TYPE_CHECKING:
     import pandas as pd
 
 MAXIMUM_DELAY = pendulum.duration(days=1)
+SNAPSHOT_INTERVAL = pendulum.duration(minutes=15)
 
 
 class AlpacaTrader(BaseTrader):
@@ -39,10 +46,30 @@ class AlpacaTrader(BaseTrader):
         context (Context | None): The context instance.
         recorder (Recorder | None): The recorder instance.
         is_log_heartbeat (bool): Whether to log heartbeats.
+        snapshot_path (os.PathLike | None): The path of the indicator snapshot.
+            The snapshot is loaded on start and saved periodically, e.g. to
+            `DEFAULT_SNAPSHOT_PATH`. If None, the default, snapshots are
+            disabled.
+        resample_daily_bars (bool): Whether to build the daily bars from the
+            minute bars instead of subscribing to the daily bars. A daily bar
+            is handled once complete, when the first minute bar of the next day
+            arrives, so the pipeline runs once per day and symbol.
+        daily_bar_resampler (BarResampler | None): The resampler building the
+            daily bars, if `resample_daily_bars` is True.
+        daily_bar_timeout (float | None): The seconds to wait for the daily
+            bars of all subscribed symbols, after the first bar of a timestamp,
+            before running the pipeline once with the bars received. If None,
+            the default, the pipeline runs on every daily bar.
+        late_bar_policy (LateBarPolicy): What to do with a daily bar that
+            arrives after the pipeline ran for its timestamp.
+        daily_bar_barrier (BarBarrier | None): The barrier collecting the
+            daily bars, if `daily_bar_timeout` is not None.
         daily_bar_heartbeat_timestamp (pendulum.DateTime): The timestamp of the
             daily bar heartbeat.
         minute_bar_heartbeat_timestamp (pendulum.DateTime): The timestamp of the
             minute bar heartbeat.
+        snapshot_timestamp (pendulum.DateTime): The timestamp of the next
+            indicator snapshot.
     """
 
     def __init__(
@@ -54,42 +81,75 @@ class AlpacaTrader(BaseTrader):
         context: Context | None = Context(),
         recorder: Recorder | None = Recorder(),
         is_log_heartbeat: bool = True,
+        snapshot_path: os.PathLike | None = None,
+        resample_daily_bars: bool = False,
+        daily_bar_timeout: float | None = None,
+        late_bar_policy: LateBarPolicy = LateBarPolicy.INDICATOR,
     ):
         super().__init__(engine, framework, indicator, context, recorder)
         self.is_log_heartbeat = is_log_heartbeat
+        self.snapshot_path = snapshot_path
+        self.snapshot_timestamp = pendulum.now() + SNAPSHOT_INTERVAL
         self.subscription_symbols = subscription_symbols
+        self.resample_daily_bars = resample_daily_bars
+        self.daily_bar_resampler = (
+            BarResampler(SamplingPeriodType.DAY_1) if resample_daily_bars else None
+        )
+        self.daily_bar_timeout = daily_bar_timeout
+        self.late_bar_policy = LateBarPolicy(late_bar_policy)
+        self.daily_bar_barrier = None
+        if daily_bar_timeout is not None:
+            self.daily_bar_barrier = BarBarrier(
+                self.handle_daily_bar_round,
+                self.handle_late_daily_bar,
+                # the symbols of a wildcard subscription are not known
+                None if "*" in subscription_symbols else subscription_symbols,
+                daily_bar_timeout,
+            )
         self.daily_bar_heartbeat_timestamp = pendulum.now().set(
             minute=0, second=0, microsecond=0
         )
         self.minute_bar_heartbeat_timestamp = pendulum.now().set(
             minute=0, second=0, microsecond=0
         )
+        # symbol -> name -> value, replaced rather than modified once recorded
+        self._indicator_values: dict[str, dict[str, Any]] = {}
 
     def run(self) -> None:
         """
         Run the trader.
 
-        This method will start the engine and set up the subscriptions.
+        This method will start the engine, the background writer of the
+        recorder and set up the subscriptions.
         """
         self.logger.debug("Starting")
+        self.load_snapshot()
         self.init_subscription()
-        asyncio.run(self.engine.streaming())
+        if self.recorder:
+            self.recorder.start()
+        try:
+            asyncio.run(self.engine.streaming())
+        finally:
+            if self.recorder:
+                self.recorder.stop()
 
     def init_subscription(self) -> None:
         """
         Initialize the subscriptions.
 
         This method will set up the subscriptions for the symbols in the
-        `subscription_symbols` attribute.
+        `subscription_symbols` attribute. The daily bars are not subscribed to
+        if they are built from the minute bars.
         """
         self.logger.debug("Setting up subscriptions")
         self.engine.subscribe_trade_update(self.handle_trade_update)
         self.engine.subscribe_minute_bars(
             self.handle_minute_bars, self.subscription_symbols
         )
-        self.engine.subscribe_daily_bars(
-            self.handle_daily_bars, self.subscription_symbols
-        )
+        if not self.resample_daily_bars:
+            self.engine.subscribe_daily_bars(
+                self.handle_daily_bars, self.subscription_symbols
+            )
         self.logger.debug("Finised setting up subscriptions")
 
     # def manage_subscription(self, universe: AssetUniverse):
@@ -102,19 +162,103 @@ class AlpacaTrader(BaseTrader):
     #         self.engine.unsubscribe_minute_bars(*universe.removed)
     #         self.engine.unsubscribe_daily_bars(*universe.removed)
 
-    def record_status(self) -> None:
+    def load_snapshot(self) -> None:
+        """
+        Load the indicator snapshot, if any.
+
+        The indicators restored from the snapshot only catch up on the bars
+        newer than the snapshot instead of being warmed up again.
+        """
+        if not self.indicator or not self.snapshot_path:
+            return
+        if not os.path.exists(self.snapshot_path):
+            return
+        try:
+            self.indicator.load_snapshot(self.snapshot_path)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Cannot load indicator snapshot: {e}")
+            return
+        self.logger.debug(f"Loaded indicator snapshot from {self.snapshot_path}")
+
+    def save_snapshot(self, force: bool = False) -> None:
+        """
+        Save the indicator snapshot, at most once per `SNAPSHOT_INTERVAL`.
+
+        Args:
+            force (bool): Whether to save regardless of the interval.
+        """
+        if not self.indicator or not self.snapshot_path:
+            return
+        if not force and pendulum.now() < self.snapshot_timestamp:
+            return
+        try:
+            self.indicator.save_snapshot(self.snapshot_path)
+        except OSError as e:
+            self.logger.warning(f"Cannot save indicator snapshot: {e}")
+        self.snapshot_timestamp = pendulum.now() + SNAPSHOT_INTERVAL
+
+    async def catch_up_indicator(self) -> None:
+        """
+        Catch up the indicators restored from the snapshot on the bars since
+        the snapshot. The bars are requested off the event loop.
+        """
+        start = self.indicator.catch_up_timestamp
+        if start is None:
+            return
+        self.logger.debug(f"Catching up indicator since {start}")
+        data: pd.DataFrame = await self.engine.run_async(
+            self.get_historical_data,
+            self.indicator.catch_up_symbols,
+            self.indicator.warmup_length,
+            self.indicator.frequency,
+            start=pendulum.instance(start),
+        )
+        self.indicator.catch_up(data)
+
+    def record_status(self, symbols: Iterable[str] | None = None) -> None:
         """
         Record the status of the trader.
 
         This method will record the positions, indicators, and other relevant
-        information of the trader.
+        information of the trader. The record is written by the background
+        writer of the recorder, so it is given plain values read here, on the
+        event loop, and never the indicators or the account state themselves.
+        Positions served from the local state of the engine are copied here;
+        otherwise they are requested over REST once per write.
+
+        Args:
+            symbols (Iterable[str] | None): The symbols whose indicator values
+                changed since the last call. Defaults to all symbols.
         """
         self.recorder["timestamp"] = pendulum.now()
-        self.recorder["positions"] = self.engine.get_positions_serialize()
+        if getattr(self.engine, "local_state", False):
+            self.recorder["positions"] = self.engine.get_positions_serialize()
+        else:
+            self.recorder.defer("positions", self.engine.get_positions_serialize)
         if self.indicator and self.indicator.attached_indicators:
-            self.recorder["indicators"] = self.indicator.attached_indicators
+            self.recorder["indicators"] = self._read_indicator_values(symbols)
+        if getattr(self.engine, "rate_limiter", None) is not None:
+            self.recorder["rate_limiter"] = self.engine.rate_limiter.metrics()
         self.recorder.save_to_disk()
 
+    def _read_indicator_values(
+        self, symbols: Iterable[str] | None
+    ) -> dict[str, dict[str, Any]]:
+        """Read the values of the indicators of the given symbols, and get a
+        copy of the values of all symbols."""
+        attached = self.indicator.attached_indicators
+        if symbols is None:
+            self._indicator_values = {}
+            symbols = attached.keys()
+        for symbol in symbols:
+            indicators = attached.get(symbol, None)
+            if indicators is not None:
+                self._indicator_values[symbol] = {
+                    name: _plain(indicator.value)
+                    for name, indicator in indicators.items()
+                }
+        return {k: v for k, v in self._indicator_values.items() if k in attached}
+
     async def handle_trade_update(self, data) -> None:
         """
         Handle trade updates.
@@ -124,13 +268,15 @@ class AlpacaTrader(BaseTrader):
         self.logger.info(
             f"{data.event} {data.order.side}`{data.order.symbol}` @{data.price} x {data.qty} | position_qty: {data.position_qty}"
         )
-        self.record_status()
+        self.record_status(symbols=())
 
     async def handle_minute_bars(self, bar) -> None:
         """
         Handle minute bars.
 
         This method will log the minute bar and record the status of the trader.
+        If the daily bars are built from the minute bars and this bar starts a
+        new day, the daily bar of the previous day is then handled.
         """
         if pendulum.now() >= self.minute_bar_heartbeat_timestamp:
             self.logger.debug(f"{bar.symbol} | minute bars | heartbeat")
@@ -138,9 +284,26 @@ class AlpacaTrader(BaseTrader):
                 self.minute_bar_heartbeat_timestamp.add(hours=1)
             )
 
+        self.engine.mark_price(bar.symbol, bar.close)
         if self.indicator and self.indicator.frequency == Frequency.MINUTE:
             self.indicator.update(bar)
-        self.record_status()
+            self.save_snapshot()
+        self.record_status(symbols=(bar.symbol,))
+
+        if self.daily_bar_resampler is not None:
+            # the daily bar so far would count as a new day for each minute
+            daily_bar = self.daily_bar_resampler.closed_bar(bar.symbol, bar.timestamp)
+            self.daily_bar_resampler.update(
+                bar.symbol,
+                bar.open,
+                bar.high,
+                bar.low,
+                bar.close,
+                bar.volume,
+                bar.timestamp,
+            )
+            if daily_bar is not None:
+                await self.handle_daily_bars(daily_bar)
 
         # for sym, ind in self.indicator.attached_indicators.items():
         #     self.logger.debug(sym)
@@ -151,7 +314,9 @@ class AlpacaTrader(BaseTrader):
         """
         Handle daily bars.
 
-        This method will log the daily bar and record the status of the trader.
+        This method will log the daily bar and pass it to the daily bar
+        barrier, which runs the pipeline once for the bars of all symbols of a
+        timestamp. Without a barrier, the pipeline runs for this bar.
         """
         if pendulum.now() >= self.daily_bar_heartbeat_timestamp:
             self.logger.debug(f"{bar.symbol} | daily bars | heartbeat")
@@ -159,26 +324,77 @@ class AlpacaTrader(BaseTrader):
                 hours=1
             )
 
-        self.framework.asset_selection(self.context)
+        if self.daily_bar_barrier is None:
+            return await self.handle_daily_bar_round([bar])
+        await self.daily_bar_barrier.put(bar)
+
+    async def handle_daily_bar_round(self, bars: list) -> None:
+        """
+        Handle the daily bars of a timestamp.
+
+        This method will select the assets, warm up and update the indicators
+        with the bars, and run the signal generation, portfolio building, risk
+        management and order execution once. The stages and the historical
+        data requests are awaited, so REST calls do not block the streams.
+
+        Args:
+            bars (list[Bar]): The daily bars.
+        """
+        self.logger.debug(f"{len(bars)} daily bars | running pipeline")
+        await self.framework.asset_selection.call_async(self.context)
         # self.manage_subscription(self.context.universe)
         if self.indicator:
             self.indicator.init_indicator(self.context.universe)
+            await self.catch_up_indicator()
         if not self.indicator.is_warmup:  # or self.indicator.is_stale(pendulum.now()):
             self.logger.debug("Warming up indicator")
-            data: pd.DataFrame = self.get_historical_data(
-                self.indicator.symbols,
+            data: pd.DataFrame = await self.engine.run_async(
+                self.get_historical_data,
+                sorted(self.indicator.not_ready_symbols),
                 self.indicator.warmup_length,
                 self.indicator.frequency,
             )
             self.indicator.warmup(data)
 
         if self.indicator and self.indicator.frequency == Frequency.DAY:
-            self.indicator.update(bar)
+            for bar in bars:
+                self.indicator.update(bar)
+        self.save_snapshot()
+        self.record_status()
 
-        self.framework.signal_generation(self.context, self.context.universe)
-        self.framework.portfolio_builder(self.context, self.context.signals)
-        self.framework.risk_management(self.context, self.context.allocations)
-        self.framework.order_execution(self.context, self.context.allocations)
+        await self.framework.signal_generation.call_async(
+            self.context, self.context.universe
+        )
+        await self.framework.portfolio_builder.call_async(
+            self.context, self.context.signals
+        )
+        await self.framework.risk_management.call_async(
+            self.context, self.context.allocations
+        )
+        await self.framework.order_execution.call_async(
+            self.context, self.context.allocations
+        )
+
+    async def handle_late_daily_bar(self, bar) -> None:
+        """
+        Handle a daily bar that arrives after the pipeline ran for its
+        timestamp, according to `late_bar_policy`.
+
+        Args:
+            bar (Bar): The late daily bar.
+        """
+        self.logger.debug(
+            f"{bar.symbol} | late daily bar @{bar.timestamp} | {self.late_bar_policy}"
+        )
+        match self.late_bar_policy:
+            case LateBarPolicy.DROP:
+                return
+            case LateBarPolicy.INDICATOR:
+                if self.indicator and self.indicator.frequency == Frequency.DAY:
+                    self.indicator.update(bar)
+                    self.save_snapshot()
+            case LateBarPolicy.RERUN:
+                await self.handle_daily_bar_round([bar])
 
     def get_n_trading_days_in_year(self, asset_class: AssetClass) -> int | float:
         """
@@ -226,6 +442,7 @@ class AlpacaTrader(BaseTrader):
         length: int,
         frequency: Frequency,
         delay: pendulum.Duration = pendulum.duration(minutes=0),
+        start: pendulum.DateTime | None = None,
     ) -> pd.DataFrame:
         """
         Get the historical data.
@@ -235,6 +452,8 @@ class AlpacaTrader(BaseTrader):
             length (int): The length of the historical data.
             frequency (Frequency): The frequency of the historical data.
             delay (bool): Whether to delay the request if it fails.
+            start (pendulum.DateTime | None): The start of the historical data.
+                If None, it is derived from length.
 
         Returns:
             pd.DataFrame: The historical data.
@@ -242,6 +461,7 @@ class AlpacaTrader(BaseTrader):
         end: pendulum.DateTime = pendulum.now()
         if delay:
             end -= delay
+        from_start = start
 
         match frequency:
             case Frequency.MINUTE:
@@ -260,6 +480,8 @@ class AlpacaTrader(BaseTrader):
                 timeframe: TimeFrame = TimeFrame.Day
             case _:
                 raise ValueError(f"Invalid frequency: {frequency}")
+        if from_start is not None:
+            start = from_start
 
         try:
             data = self.engine.get_historical_data(
@@ -281,8 +503,18 @@ class AlpacaTrader(BaseTrader):
                 self.logger.error(
                     f"{e.__class__.__name__}: {e._error} Try again with delay({delay})..."
                 )
-                return self.get_historical_data(symbols, length, frequency, delay)
+                return self.get_historical_data(
+                    symbols, length, frequency, delay, from_start
+                )
             else:
                 raise e
 
         return data
+
+
+def _plain(value: Any) -> Any:
+    """Convert an indicator value into a JSON-serializable value, e.g. the
+    fields of a STOCH value as a dict."""
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    return value
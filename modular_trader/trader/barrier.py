@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from alpaca.data.models.bars import Bar
+
+
+class BarBarrier:
+    """Collect the bars of all symbols for a timestamp before handling them.
+
+    Bars are gathered into a round per timestamp. The round is released, i.e.
+    its bars are passed to `on_release` at once, when every expected symbol has
+    a bar in it, when `timeout` seconds have passed since its first bar, or
+    when a bar of a newer timestamp arrives. A symbol that prints again for the
+    timestamp of the pending round replaces its bar; if it printed in the last
+    released round, it starts a new round of the same timestamp, as with the
+    daily bars, which are updated during the session.
+
+    A bar is late if its round was already released without it: its timestamp
+    is older than the last released one, or it is the timestamp of the last
+    released round, the symbol is not in it and no round of that timestamp is
+    pending. Late bars are passed to `on_late`.
+
+    Releases are serialized: a round is not released before `on_release` of
+    the previous one has returned. The errors raised by `on_release` on a
+    timeout release are logged, as no caller awaits it.
+
+    Attributes:
+        symbols (set[str] | None): The expected symbols. If None, rounds are
+            released by the timeout or a newer timestamp only.
+        timeout (float): The seconds to wait for the bars of a round.
+    """
+
+    def __init__(
+        self,
+        on_release: Callable[[list[Bar]], Awaitable[Any]],
+        on_late: Callable[[Bar], Awaitable[Any]],
+        symbols: Iterable[str] | None = None,
+        timeout: float = 10.0,
+    ):
+        """
+        Initialize the barrier.
+
+        Args:
+            on_release (Callable[[list[Bar]], Awaitable[Any]]): Called with the
+                bars of a released round.
+            on_late (Callable[[Bar], Awaitable[Any]]): Called with a late bar.
+            symbols (Iterable[str] | None): The expected symbols.
+            timeout (float): The seconds to wait for the bars of a round.
+        """
+        self.on_release = on_release
+        self.on_late = on_late
+        self.symbols = set(symbols) if symbols is not None else None
+        self.timeout = timeout
+        self._pending: dict[str, Bar] = {}
+        self._timestamp: Any = None
+        self._round = 0
+        self._timer: asyncio.TimerHandle | None = None
+        # the timeout releases running, kept until done
+        self._tasks: set[asyncio.Task] = set()
+        self._released_timestamp: Any = None
+        self._released_symbols: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    pending = property(fget=lambda self: list(self._pending.values()))
+
+    async def put(self, bar: Bar) -> None:
+        """
+        Add a bar to the round of its timestamp.
+
+        Args:
+            bar (Bar): The bar.
+        """
+        if self._is_late(bar):
+            return await self.on_late(bar)
+        if self._pending and bar.timestamp > self._timestamp:
+            await self.release()
+        if not self._pending:
+            self._timestamp = bar.timestamp
+            self._round += 1
+            self._schedule(self._round)
+        self._pending[bar.symbol] = bar
+        if self.symbols is not None and self.symbols.issubset(self._pending):
+            await self.release()
+
+    def _is_late(self, bar: Bar) -> bool:
+        """Check if the round of a bar was already released without it."""
+        released = self._released_timestamp
+        if released is None:
+            return False
+        if bar.timestamp < released:
+            return True
+        return (
+            bar.timestamp == released
+            and bar.symbol not in self._released_symbols
+            and not (self._pending and self._timestamp == released)
+        )
+
+    def _schedule(self, round: int) -> None:
+        """Release the given round after the timeout, if it is still pending."""
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(self.timeout, self._start_expire, round)
+
+    def _start_expire(self, round: int) -> None:
+        """Start the release of a round on timeout as a task."""
+        task = asyncio.get_running_loop().create_task(self._expire(round))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_expired)
+
+    def _on_expired(self, task: asyncio.Task) -> None:
+        """Forget a timeout release, and log its error."""
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.opt(exception=task.exception()).error(
+                "Cannot release the bars on timeout"
+            )
+
+    async def _expire(self, round: int) -> None:
+        """Release a round on timeout."""
+        if round == self._round and self._pending:
+            await self.release()
+
+    async def release(self) -> None:
+        """Release the pending round now."""
+        async with self._lock:
+            if not self._pending:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            bars = list(self._pending.values())
+            self._pending.clear()
+            if self._timestamp == self._released_timestamp:
+                self._released_symbols.update(x.symbol for x in bars)
+            else:
+                self._released_timestamp = self._timestamp
+                self._released_symbols = {x.symbol for x in bars}
+            await self.on_release(bars)